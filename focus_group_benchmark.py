@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the focus group simulation stages
+Times each stage and records peak memory across population sizes, compares
+against a baseline file (--baseline), and checks the optimized stages against the
+original row-wise reference implementations
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+import focus_group_simulation as fgs
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+
+# A stage is flagged when it is this much slower (or hungrier) than baseline
+DEFAULT_THRESHOLD = 0.25
+
+# Absolute slack below which a slowdown is treated as timer noise
+NOISE_FLOOR = {'seconds': 0.05, 'peak_mb': 1.0}
+
+STAGES = ['generate', 'wtp', 'bootstrap', 'elasticity', 'funnels']
+
+# ==================== REFERENCE IMPLEMENTATIONS ====================
+# The original row-wise code, kept verbatim in spirit so optimized stages can
+# be checked against it. Only used on small populations.
+
+def reference_generate(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Per-row respondent loop from the original generate_respondents"""
+    respondents = []
+    for segment_key, config in fgs.PERSONAS.items():
+        n_segment = int(n * fgs.SEGMENT_DISTRIBUTION[segment_key])
+        for i in range(n_segment):
+            respondents.append({
+                'segment': segment_key,
+                'age': rng.integers(config.age_range[0], config.age_range[1] + 1),
+                'income': max(15000, rng.normal(config.income_mean, config.income_std)),
+                'time_scarcity': np.clip(rng.normal(config.time_scarcity, 1.5), 0, 10),
+                'fashion_interest': np.clip(rng.normal(config.fashion_interest, 1.2), 0, 10),
+                'price_sensitivity': np.clip(rng.normal(config.price_sensitivity, 0.2), 0.3, 2.0)
+            })
+    return pd.DataFrame(respondents)
+
+def reference_wtp(df: pd.DataFrame) -> pd.DataFrame:
+    """The three df.apply passes from the original calculate_wtp"""
+    df = df.astype({col: np.float64 for col in ['income', 'time_scarcity', 'fashion_interest', 'price_sensitivity']})
+
+    def wtp_subscription(row):
+        base = 15 + (row['time_scarcity'] * 2) + (row['fashion_interest'] * 1.5)
+        income_adjusted = base * (1 + np.log10(row['income'] / 50000) * 0.3)
+        return max(5, income_adjusted / row['price_sensitivity'])
+
+    def wtp_per_outfit(row):
+        base = 3 + (row['fashion_interest'] * 0.5)
+        income_adjusted = base * (1 + np.log10(row['income'] / 50000) * 0.2)
+        return max(1, income_adjusted / row['price_sensitivity'])
+
+    def wtp_bundle_10(row):
+        return wtp_per_outfit(row) * 10 * 0.7
+
+    out = pd.DataFrame(index=df.index)
+    out['wtp_subscription'] = df.apply(wtp_subscription, axis=1)
+    out['wtp_per_outfit'] = df.apply(wtp_per_outfit, axis=1)
+    out['wtp_bundle_10'] = df.apply(wtp_bundle_10, axis=1)
+    return out
+
+def reference_bootstrap_ci(values: pd.Series, n_bootstrap: int = 1000) -> Tuple[float, float]:
+    """The pandas resample loop from the original main()"""
+    means = [values.sample(len(values), replace=True).mean() for _ in range(n_bootstrap)]
+    return np.percentile(means, 2.5), np.percentile(means, 97.5)
+
+def reference_elasticity(df: pd.DataFrame, segment: str) -> Dict:
+    """Per-price rescans from the original calculate_price_elasticity"""
+    seg_df = df[df['segment'] == segment]
+    prices_sub = np.arange(5, 60, 5)
+    demand_sub = [(seg_df['wtp_subscription'] >= price).sum() / len(seg_df) for price in prices_sub]
+
+    elasticities = []
+    for i in range(1, len(prices_sub)):
+        pct_change_demand = (demand_sub[i] - demand_sub[i-1]) / demand_sub[i-1] if demand_sub[i-1] > 0 else 0
+        pct_change_price = (prices_sub[i] - prices_sub[i-1]) / prices_sub[i-1]
+        elasticities.append(pct_change_demand / pct_change_price if pct_change_price != 0 else 0)
+
+    return {'price_elasticity': np.mean(elasticities), 'demand_curve': list(zip(prices_sub.tolist(), demand_sub))}
+
+def reference_funnel(segment: str, channel: str, rng: np.random.Generator, n_bootstrap: int = 1000) -> Dict:
+    """Independent per-rate normal draws from the original model_acquisition_funnel"""
+    params = fgs.FUNNEL_PARAMS.get((segment, channel), fgs.FUNNEL_PARAMS[fgs.DEFAULT_FUNNEL_PAIR])
+    results = {}
+    for metric in fgs.FUNNEL_RATES:
+        mean, std = params[metric]
+        results[metric] = float(np.mean(np.clip(rng.normal(mean, std, n_bootstrap), 0, 1)))
+    clicks = params['impressions'] * results['ctr']
+    results['signups'] = clicks * results['cvr_signup']
+    return results
+
+# ==================== STAGE TIMING ====================
+
+def _stage_runners(n: int, seed: int, n_bootstrap: int) -> List[Tuple[str, Callable]]:
+    """(stage, fn) pairs; each fn consumes the previous stage's state"""
+    state = {}
+
+    def generate():
+        state['df'] = fgs.generate_respondents(n, rng=fgs.stage_rng(seed, 'respondents'))
+
+    def wtp():
+        state['df'] = fgs.calculate_wtp(state['df'])
+
+    def bootstrap():
+        fgs.summarize_wtp(state['df'], n_bootstrap=n_bootstrap, rng=fgs.stage_rng(seed, 'bootstrap'))
+
+    def elasticity():
+        df = state['df']
+        index = fgs.sorted_wtp(df)
+        curves = fgs.demand_curves(df, index=index)
+        for segment in fgs.PERSONAS:
+            fgs.calculate_price_elasticity(df, segment, index=index, curves=curves)
+
+    def funnels():
+        fgs.simulate_funnels(rng=fgs.stage_rng(seed, 'funnels'))
+
+    runners = {'generate': generate, 'wtp': wtp, 'bootstrap': bootstrap,
+               'elasticity': elasticity, 'funnels': funnels}
+    return [(stage, runners[stage]) for stage in STAGES]
+
+def benchmark_size(n: int, seed: int = fgs.DEFAULT_SEED, n_bootstrap: int = 1000,
+                   repeat: int = 1, memory: bool = True) -> Dict[str, Dict[str, float]]:
+    """Best-of-repeat wall time per stage, plus peak traced memory from a separate pass
+
+    Peak memory comes from tracemalloc (which sees numpy buffers) in its own
+    pass, so tracing overhead never lands in the timings.
+    """
+    results = {stage: {'seconds': float('inf')} for stage in STAGES}
+    for _ in range(repeat):
+        for stage, run in _stage_runners(n, seed, n_bootstrap):
+            start = time.perf_counter()
+            run()
+            results[stage]['seconds'] = min(results[stage]['seconds'], time.perf_counter() - start)
+
+    if memory:
+        for stage, run in _stage_runners(n, seed, n_bootstrap):
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[stage]['peak_mb'] = peak / 1024 ** 2
+
+    for stage in STAGES:
+        results[stage]['rows_per_second'] = n / results[stage]['seconds'] if results[stage]['seconds'] else float('inf')
+    return results
+
+def compare_to_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict],
+                        threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Describe every stage/size whose time or peak memory regressed past threshold"""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in ['seconds', 'peak_mb']:
+            if metric in current and metric in previous and previous[metric] > 0:
+                ratio = current[metric] / previous[metric]
+                if ratio > 1 + threshold and current[metric] - previous[metric] > NOISE_FLOOR[metric]:
+                    regressions.append(f"{key} {metric}: {previous[metric]:.3f} → {current[metric]:.3f} ({ratio:.2f}x)")
+    return regressions
+
+# ==================== EQUIVALENCE CHECKS ====================
+
+def check_equivalence(n: int = 20_000, seed: int = fgs.DEFAULT_SEED, alpha: float = 0.001) -> List[Tuple[str, bool, str]]:
+    """Compare optimized stages with the reference implementations
+
+    Deterministic stages (WTP, elasticity) must match to float32 precision.
+    Stochastic stages must agree statistically: two-sample KS tests for
+    generated attributes, and tolerance checks for bootstrap CIs and funnel
+    means.
+    """
+    checks = []
+    rng = np.random.default_rng(seed)
+
+    optimized = fgs.generate_respondents(n, rng=rng)
+    reference = reference_generate(n, rng)
+    for segment in fgs.PERSONAS:
+        opt_seg = optimized[optimized['segment'] == segment]
+        ref_seg = reference[reference['segment'] == segment]
+        checks.append((f"generate/{segment}/size", len(opt_seg) == len(ref_seg), f"{len(opt_seg)} vs {len(ref_seg)}"))
+        for col in ['age', 'income', 'time_scarcity', 'fashion_interest', 'price_sensitivity']:
+            p = stats.ks_2samp(opt_seg[col].astype(np.float64), ref_seg[col].astype(np.float64)).pvalue
+            checks.append((f"generate/{segment}/{col}", p > alpha, f"KS p={p:.4f}"))
+
+    df = fgs.calculate_wtp(optimized)
+    ref_wtp = reference_wtp(optimized)
+    for model in fgs.WTP_MODELS:
+        err = np.max(np.abs(df[model].to_numpy(np.float64) - ref_wtp[model].to_numpy()) / ref_wtp[model].to_numpy())
+        checks.append((f"wtp/{model}", err < 1e-5, f"max rel err {err:.2e}"))
+
+    for segment in fgs.PERSONAS:
+        ref = reference_elasticity(df, segment)
+        opt = fgs.calculate_price_elasticity(df, segment)
+        same_curve = np.allclose([d for _, d in opt['demand_curve']], [d for _, d in ref['demand_curve']])
+        same_elasticity = np.isclose(opt['price_elasticity'], ref['price_elasticity'])
+        checks.append((f"elasticity/{segment}", same_curve and same_elasticity,
+                       f"{opt['price_elasticity']:.4f} vs {ref['price_elasticity']:.4f}"))
+
+    groups = fgs.segment_codes(df)
+    values = df[list(fgs.WTP_MODELS)].to_numpy(dtype=np.float64)
+    boot = fgs.bootstrap_means(values, groups, len(fgs.PERSONAS), 1000, rng=rng)
+    lower, upper = fgs.bootstrap_interval(boot, values, groups)
+    for g, segment in enumerate(fgs.PERSONAS):
+        seg_values = df.loc[groups == g, 'wtp_subscription'].astype(np.float64)
+        ref_lower, ref_upper = reference_bootstrap_ci(seg_values)
+        # Two independent 1000-replicate CIs differ by Monte Carlo noise only
+        width_ratio = (upper[g, 0] - lower[g, 0]) / (ref_upper - ref_lower)
+        checks.append((f"bootstrap/{segment}", abs(width_ratio - 1) < 0.15, f"CI width ratio {width_ratio:.3f}"))
+
+    funnels = fgs.simulate_funnels(n_replicates=20_000, rng=rng)
+    for result in funnels:
+        ref = reference_funnel(result['segment'], result['channel'], rng, n_bootstrap=20_000)
+        ok = all(abs(result[m]['mean'] - ref[m]) < 5 * result[m]['std'] / np.sqrt(20_000) + 1e-9 for m in fgs.FUNNEL_RATES)
+        rel = abs(result['absolute_numbers']['signups'] - ref['signups']) / ref['signups']
+        checks.append((f"funnels/{result['segment']}/{result['channel']}", ok and rel < 0.05,
+                       f"signups {result['absolute_numbers']['signups']} vs {ref['signups']:.0f}"))
+
+    return checks
+
+# ==================== CLI ====================
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the focus group simulation stages')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=1, help='timing runs per size (best is kept)')
+    parser.add_argument('--bootstrap-reps', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=fgs.DEFAULT_SEED)
+    parser.add_argument('--no-memory', action='store_true', help='skip the peak-memory pass')
+    # Timings are machine-specific, so there is no shared default baseline file
+    parser.add_argument('--baseline', help='results JSON to compare against (or write with --save-baseline)')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--skip-equivalence', action='store_true')
+    parser.add_argument('--equivalence-n', type=int, default=20_000)
+    args = parser.parse_args(argv)
+    if args.save_baseline and not args.baseline:
+        parser.error('--save-baseline needs --baseline PATH')
+    if args.baseline and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f'baseline not found: {args.baseline}')
+
+    failed = False
+
+    if not args.skip_equivalence:
+        print("="*60)
+        print("EQUIVALENCE WITH REFERENCE IMPLEMENTATIONS")
+        print("="*60)
+        for name, ok, detail in check_equivalence(args.equivalence_n, args.seed):
+            print(f"  {'✅' if ok else '❌'} {name}: {detail}")
+            failed |= not ok
+
+    print("\n" + "="*60)
+    print("STAGE TIMINGS")
+    print("="*60)
+    results = {}
+    for n in args.sizes:
+        size_results = benchmark_size(n, args.seed, args.bootstrap_reps, args.repeat, memory=not args.no_memory)
+        for stage, metrics in size_results.items():
+            results[f"{stage}@{n}"] = metrics
+            peak = f"{metrics['peak_mb']:10.1f} MB" if 'peak_mb' in metrics else ''
+            print(f"  {stage:<11} n={n:>11,}  {metrics['seconds']:9.3f} s  {metrics['rows_per_second']:14,.0f} rows/s {peak}")
+
+    if args.baseline and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        print("\n" + "="*60)
+        print(f"BASELINE COMPARISON (threshold +{args.threshold:.0%})")
+        print("="*60)
+        for line in regressions:
+            print(f"  ❌ {line}")
+        if not regressions:
+            print("  ✅ No regressions")
+        failed |= bool(regressions)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'sizes': args.sizes, 'bootstrap_reps': args.bootstrap_reps, 'results': results}, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
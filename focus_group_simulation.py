@@ -4,16 +4,123 @@
 Generates personas, WTP distributions, feature scores, and acquisition funnels
 """
 
-import numpy as np
-import pandas as pd
-from scipy import stats
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import functools
+import hashlib
+import importlib.util
+import inspect
+import itertools
 import json
-from dataclasses import dataclass, asdict
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+import types
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict, field, replace
 from typing import Dict, List, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
-np.random.seed(42)
+import numpy as np
+
+def _lazy_module(name: str):
+    """Module that is only executed on first attribute access
+
+    pandas and scipy.stats dominate startup, and stages such as the funnels
+    never touch them.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+pd = _lazy_module('pandas')
+stats = _lazy_module('scipy.stats')
+special = _lazy_module('scipy.special')
+sparse = _lazy_module('scipy.sparse')
+
+try:
+    import resource
+except ImportError:  # Windows has no getrusage; peak RSS is then left out
+    resource = None
+
+DEFAULT_SEED = 42
+
+# Every stochastic stage takes an optional np.random.Generator. When none is
+# passed they share this module-level stream, so a plain run is reproducible
+# the same way the old import-time np.random.seed(42) made it.
+_default_rng = np.random.default_rng(DEFAULT_SEED)
+
+def _rng(rng: np.random.Generator = None) -> np.random.Generator:
+    return rng if rng is not None else _default_rng
+
+def stage_rng(seed: int, stage: str) -> np.random.Generator:
+    """Independent Generator for one named pipeline stage
+
+    A stage's draws depend only on the seed and the stage name, not on which
+    stages ran before it, so skipping a cached stage leaves the others
+    unchanged.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(zlib.crc32(stage.encode()),)))
+
+# ==================== SAMPLING BACKENDS ====================
+
+# Uniform samplers behind the inverse-CDF draws of generation and funnels.
+# 'random' is plain pseudo-random; the others give up independence between
+# rows for more even coverage of [0, 1)^d, which shrinks the variance of
+# means taken over the draws. Each takes (n, d, rng) and returns (n, d).
+SAMPLERS = {}
+
+def register_sampler(name: str):
+    """Register a uniform sampler under a name"""
+    def decorator(sampler):
+        SAMPLERS[name] = sampler
+        return sampler
+    return decorator
+
+@register_sampler('random')
+def _random_uniforms(n: int, d: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.random((n, d))
+
+@register_sampler('antithetic')
+def _antithetic_uniforms(n: int, d: int, rng: np.random.Generator) -> np.ndarray:
+    """Pairs every draw u with 1 - u"""
+    half = rng.random(((n + 1) // 2, d))
+    return np.concatenate([half, 1 - half])[:n]
+
+@register_sampler('stratified')
+def _stratified_uniforms(n: int, d: int, rng: np.random.Generator) -> np.ndarray:
+    """Latin hypercube: exactly one draw in each of n equal strata of every dimension"""
+    return stats.qmc.LatinHypercube(d=d, seed=rng).random(n)
+
+@register_sampler('sobol')
+def _sobol_uniforms(n: int, d: int, rng: np.random.Generator) -> np.ndarray:
+    return stats.qmc.Sobol(d=d, scramble=True, seed=rng).random(n)
+
+@register_sampler('halton')
+def _halton_uniforms(n: int, d: int, rng: np.random.Generator) -> np.ndarray:
+    return stats.qmc.Halton(d=d, scramble=True, seed=rng).random(n)
+
+def uniform_draws(n: int, d: int, rng: np.random.Generator = None, sampler: str = 'random') -> np.ndarray:
+    """(n, d) uniforms strictly inside (0, 1), safe to push through an inverse CDF"""
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler: {sampler}")
+    eps = np.finfo(np.float64).eps
+    return np.clip(SAMPLERS[sampler](n, d, _rng(rng)), eps, 1 - eps)
 
 # ==================== PERSONA DEFINITIONS ====================
 
@@ -70,95 +177,1598 @@ SEGMENT_DISTRIBUTION = {
 
 # ==================== RESPONDENT GENERATION ====================
 
-def generate_respondents(n=10000):
-    """Generate synthetic respondents across segments"""
-
-    respondents = []
-
-    for segment_key, config in PERSONAS.items():
-        n_segment = int(n * SEGMENT_DISTRIBUTION[segment_key])
-
-        for i in range(n_segment):
-            age = np.random.randint(config.age_range[0], config.age_range[1] + 1)
-            income = max(15000, np.random.normal(config.income_mean, config.income_std))
-
-            # Add individual variation
-            time_scarcity = np.clip(np.random.normal(config.time_scarcity, 1.5), 0, 10)
-            fashion_interest = np.clip(np.random.normal(config.fashion_interest, 1.2), 0, 10)
-            price_sensitivity = np.clip(np.random.normal(config.price_sensitivity, 0.2), 0.3, 2.0)
-
-            respondents.append({
-                'id': f'{segment_key}_{i}',
-                'segment': segment_key,
-                'segment_name': config.name,
-                'age': age,
-                'income': income,
-                'time_scarcity': time_scarcity,
-                'fashion_interest': fashion_interest,
-                'price_sensitivity': price_sensitivity,
-                'platform_preference': config.platform_preference
-            })
+# Incomes below this floor are clipped up to it
+INCOME_FLOOR = 15000
 
-    return pd.DataFrame(respondents)
+# Individual variation around each persona score: (std, clip low, clip high)
+SCORE_SPREAD = {
+    'time_scarcity': (1.5, 0, 10),
+    'fashion_interest': (1.2, 0, 10),
+    'price_sensitivity': (0.2, 0.3, 2.0)
+}
 
-# ==================== WTP MODELING ====================
+def segment_sizes(n: int) -> Dict[str, int]:
+    """Respondent count per segment for a population of n"""
+    return {segment_key: int(n * SEGMENT_DISTRIBUTION[segment_key]) for segment_key in PERSONAS}
+
+def standard_draws(n_segment: int, rng: np.random.Generator = None, sampler: str = 'random') -> Dict[str, np.ndarray]:
+    """Persona-independent random draws behind n_segment respondents
+
+    age_u is uniform on [0, 1) and the rest are standard normals;
+    columns_from_draws rescales them to a PersonaConfig. Keeping the two
+    steps apart lets the same draws be reused under other persona parameters.
+    Any sampler other than 'random' fills the five columns from one
+    (n_segment, 5) point set, with normals by inverse CDF. Segments are
+    always drawn at their exact SEGMENT_DISTRIBUTION counts, so the
+    population is already stratified by segment.
+    """
+    rng = _rng(rng)
+    if sampler != 'random':
+        u = uniform_draws(n_segment, 5, rng, sampler)
+        z = special.ndtri(u[:, 1:])
+        return {'age_u': u[:, 0], 'income_z': z[:, 0], 'time_scarcity_z': z[:, 1],
+                'fashion_interest_z': z[:, 2], 'price_sensitivity_z': z[:, 3]}
+    return {
+        'age_u': rng.random(n_segment),
+        'income_z': rng.standard_normal(n_segment),
+        'time_scarcity_z': rng.standard_normal(n_segment),
+        'fashion_interest_z': rng.standard_normal(n_segment),
+        'price_sensitivity_z': rng.standard_normal(n_segment)
+    }
 
-def calculate_wtp(df: pd.DataFrame) -> pd.DataFrame:
-    """Calculate willingness-to-pay for different pricing models"""
+def columns_from_draws(segment_key: str, draws: Dict[str, np.ndarray], start: int = 0,
+                       config: PersonaConfig = None) -> Dict[str, np.ndarray]:
+    """Scale standard draws to one segment's attribute columns
+
+    Columns use the compact representation: the segment as a uint8 code into
+    PERSONAS, the id as the integer index within the segment (offset by
+    `start` so chunks stay unique), age as uint8 and the rest as float32.
+    Segment-level attributes are not repeated per row; see
+    with_segment_attributes. `config` overrides PERSONAS[segment_key].
+    """
+    config = config or PERSONAS[segment_key]
+    n_segment = len(draws['age_u'])
 
-    def wtp_subscription(row):
-        """Monthly subscription WTP based on time saved + fashion interest"""
-        base = 15 + (row['time_scarcity'] * 2) + (row['fashion_interest'] * 1.5)
-        income_adjusted = base * (1 + np.log10(row['income'] / 50000) * 0.3)
-        return max(5, income_adjusted / row['price_sensitivity'])
+    low, high = config.age_range
+    age = low + np.floor(draws['age_u'] * (high - low + 1))
+    income = np.maximum(INCOME_FLOOR, config.income_mean + config.income_std * draws['income_z'])
+
+    # Add individual variation
+    scores = {
+        name: np.clip(getattr(config, name) + std * draws[f'{name}_z'], low, high)
+        for name, (std, low, high) in SCORE_SPREAD.items()
+    }
 
-    def wtp_per_outfit(row):
-        """Pay-per-outfit WTP"""
-        base = 3 + (row['fashion_interest'] * 0.5)
-        income_adjusted = base * (1 + np.log10(row['income'] / 50000) * 0.2)
-        return max(1, income_adjusted / row['price_sensitivity'])
+    return {
+        'id': np.arange(start, start + n_segment, dtype=np.uint32),
+        'segment': np.full(n_segment, list(PERSONAS).index(segment_key), dtype=np.uint8),
+        'age': age.astype(np.uint8),
+        'income': income.astype(np.float32),
+        'time_scarcity': scores['time_scarcity'].astype(np.float32),
+        'fashion_interest': scores['fashion_interest'].astype(np.float32),
+        'price_sensitivity': scores['price_sensitivity'].astype(np.float32)
+    }
 
-    def wtp_bundle_10(row):
-        """10-pack bundle WTP (with discount expectation)"""
-        per_outfit = wtp_per_outfit(row)
-        return per_outfit * 10 * 0.7  # 30% bundle discount expectation
+def segment_columns(segment_key: str, n_segment: int, start: int = 0,
+                    rng: np.random.Generator = None, sampler: str = 'random') -> Dict[str, np.ndarray]:
+    """Draw every attribute for n_segment respondents of one segment as column arrays"""
+    return columns_from_draws(segment_key, standard_draws(n_segment, rng, sampler), start)
+
+def respondent_frame(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Wrap segment_columns output in a DataFrame with a categorical segment"""
+    data = dict(columns)
+    data['segment'] = pd.Categorical.from_codes(columns['segment'], categories=list(PERSONAS))
+    return pd.DataFrame(data, copy=False)
+
+def generate_respondents(n=10000, rng: np.random.Generator = None, sampler: str = 'random'):
+    """Generate synthetic respondents across segments
+
+    Each attribute is drawn for a whole segment in one array call and the
+    DataFrame is built straight from the column arrays, so cost grows
+    linearly with n and no per-row dicts are materialized.
+    """
+
+    parts = [segment_columns(segment_key, n_segment, rng=rng, sampler=sampler)
+             for segment_key, n_segment in segment_sizes(n).items()]
+    return respondent_frame({name: np.concatenate([part[name] for part in parts]) for name in parts[0]})
+
+def respondent_shards(n: int, chunk_size: int = 1_000_000, n_shards: int = None) -> List[Tuple[str, int, int]]:
+    """(segment, size, start) for every chunk of a population of n respondents
+
+    Chunks hold at most chunk_size rows. With n_shards, every segment is
+    instead cut into near-equal chunks of about n / n_shards rows (still at
+    most chunk_size), so the population splits into about n_shards
+    similar-sized pieces.
+    """
+    if not n_shards:
+        return [
+            (segment_key, min(chunk_size, n_segment - start), start)
+            for segment_key, n_segment in segment_sizes(n).items()
+            for start in range(0, n_segment, chunk_size)
+        ]
+    target = max(n / n_shards, 1)
+    shards = []
+    for segment_key, n_segment in segment_sizes(n).items():
+        pieces = max(round(n_segment / target), -(-n_segment // chunk_size))
+        if not pieces:
+            continue
+        bounds = [n_segment * i // pieces for i in range(pieces + 1)]
+        shards.extend((segment_key, stop - start, start) for start, stop in zip(bounds[:-1], bounds[1:]))
+    return shards
+
+def iter_respondent_chunks(n: int, chunk_size: int = 1_000_000, rng: np.random.Generator = None,
+                           sampler: str = 'random'):
+    """Yield the population of n respondents as DataFrames of at most chunk_size rows"""
+    for segment_key, size, start in respondent_shards(n, chunk_size):
+        yield respondent_frame(segment_columns(segment_key, size, start, rng=rng, sampler=sampler))
+
+def segment_codes(df: pd.DataFrame) -> np.ndarray:
+    """Integer segment code per respondent, in PERSONAS order"""
+    segment = df['segment']
+    if isinstance(segment.dtype, pd.CategoricalDtype) and list(segment.cat.categories) == list(PERSONAS):
+        return segment.cat.codes.to_numpy().astype(np.intp)
+    return pd.Categorical(segment, categories=list(PERSONAS)).codes.astype(np.intp)
+
+def group_offsets(groups: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Row order that groups rows by code, plus the [start, stop) offsets of every group
+
+    The order is None when rows are already grouped (generate_respondents and
+    RespondentIndex both emit segment-contiguous rows), so callers can take
+    zero-copy slices instead of gathering.
+    """
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(groups, minlength=n_groups))])
+    grouped = bool(np.all(groups[1:] >= groups[:-1]))
+    return (None if grouped else np.argsort(groups, kind='stable')), offsets
+
+def with_segment_attributes(df: pd.DataFrame) -> pd.DataFrame:
+    """Expand the compact frame to the original wide schema
+
+    Joins segment_name and platform_preference from PERSONAS and restores the
+    string id (e.g. busy_professional_123). Only needed for exports and
+    display; every analysis stage runs on the compact frame.
+    """
+    codes = segment_codes(df)
+    keys = np.array(list(PERSONAS), dtype=object)
+    names = np.array([config.name for config in PERSONAS.values()], dtype=object)
+    platforms = np.array([config.platform_preference for config in PERSONAS.values()], dtype=object)
+
+    wide = df.copy()
+    wide['id'] = keys[codes] + '_' + df['id'].astype(str).to_numpy(dtype=object)
+    wide['segment'] = keys[codes]
+    wide.insert(wide.columns.get_loc('segment') + 1, 'segment_name', names[codes])
+    wide.insert(wide.columns.get_loc('price_sensitivity') + 1, 'platform_preference', platforms[codes])
+    return wide
 
-    df['wtp_subscription'] = df.apply(wtp_subscription, axis=1)
-    df['wtp_per_outfit'] = df.apply(wtp_per_outfit, axis=1)
-    df['wtp_bundle_10'] = df.apply(wtp_bundle_10, axis=1)
+# ==================== WTP MODELING ====================
+
+# Pricing models are array formulas evaluated over whole columns. Each one
+# receives the shared terms (respondent columns, the income log-ratio and
+# every previously registered model's output) and returns a WTP array.
+WTP_MODELS = {}
+
+def register_wtp_model(name: str):
+    """Register an array formula as a pricing model column"""
+    def decorator(formula):
+        WTP_MODELS[name] = formula
+        return formula
+    return decorator
+
+@register_wtp_model('wtp_subscription')
+def wtp_subscription(terms: Dict[str, np.ndarray]) -> np.ndarray:
+    """Monthly subscription WTP based on time saved + fashion interest"""
+    base = 15 + (terms['time_scarcity'] * 2) + (terms['fashion_interest'] * 1.5)
+    income_adjusted = base * (1 + terms['income_log_ratio'] * 0.3)
+    return np.maximum(5, income_adjusted / terms['price_sensitivity'])
+
+@register_wtp_model('wtp_per_outfit')
+def wtp_per_outfit(terms: Dict[str, np.ndarray]) -> np.ndarray:
+    """Pay-per-outfit WTP"""
+    base = 3 + (terms['fashion_interest'] * 0.5)
+    income_adjusted = base * (1 + terms['income_log_ratio'] * 0.2)
+    return np.maximum(1, income_adjusted / terms['price_sensitivity'])
+
+@register_wtp_model('wtp_bundle_10')
+def wtp_bundle_10(terms: Dict[str, np.ndarray]) -> np.ndarray:
+    """10-pack bundle WTP (with discount expectation)"""
+    return terms['wtp_per_outfit'] * 10 * 0.7  # 30% bundle discount expectation
+
+def wtp_terms(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Shared column arrays and common sub-expressions for the WTP formulas"""
+    terms = {
+        col: df[col].to_numpy()
+        for col in ['age', 'income', 'time_scarcity', 'fashion_interest', 'price_sensitivity']
+    }
+    terms['income_log_ratio'] = np.log10(terms['income'] / 50000)
+    return terms
+
+def calculate_wtp(df: pd.DataFrame) -> pd.DataFrame:
+    """Calculate willingness-to-pay for different pricing models"""
+
+    terms = wtp_terms(df)
+    for name, formula in WTP_MODELS.items():
+        terms[name] = formula(terms)
+        df[name] = terms[name]
 
     return df
 
-def calculate_price_elasticity(df: pd.DataFrame, segment: str) -> Dict:
-    """Estimate price elasticity for segment"""
-    seg_df = df[df['segment'] == segment]
+# Coarse grid the headline elasticity is averaged over
+ELASTICITY_PRICES = np.arange(5, 60, 5)
+
+# Demand curves are evaluated on a 1-cent grid by default
+DEMAND_PRICE_STEP = 0.01
+
+def sorted_wtp(df: pd.DataFrame) -> Dict[str, Dict[str, np.ndarray]]:
+    """Sort every segment's WTP columns once, keyed by segment then pricing model"""
+    order, offsets = group_offsets(segment_codes(df), len(PERSONAS))
+    columns = {model: df[model].to_numpy() for model in WTP_MODELS}
+
+    index = {}
+    for g, segment in enumerate(PERSONAS):
+        rows = slice(offsets[g], offsets[g + 1]) if order is None else order[offsets[g]:offsets[g + 1]]
+        index[segment] = {model: np.sort(values[rows]) for model, values in columns.items()}
+    return index
+
+def demand_at(sorted_values: np.ndarray, prices) -> np.ndarray:
+    """Share of respondents with WTP >= price, by binary search on sorted WTP"""
+    n = len(sorted_values)
+    if n == 0:
+        return np.full(np.shape(prices), np.nan)
+    return (n - np.searchsorted(sorted_values, prices, side='left')) / n
+
+def arc_elasticities(prices: np.ndarray, demand: np.ndarray) -> np.ndarray:
+    """Arc elasticity (% change in demand / % change in price) between consecutive points"""
+    prices = np.asarray(prices, dtype=np.float64)
+    prev_demand = demand[:-1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pct_change_demand = np.where(prev_demand > 0, (demand[1:] - prev_demand) / prev_demand, 0.0)
+        pct_change_price = (prices[1:] - prices[:-1]) / prices[:-1]
+        return np.where(pct_change_price != 0, pct_change_demand / pct_change_price, 0.0)
+
+def demand_curves(df: pd.DataFrame, step: float = DEMAND_PRICE_STEP,
+                  index: Dict[str, Dict[str, np.ndarray]] = None) -> Dict[str, Dict[str, Dict]]:
+    """Dense demand, revenue and elasticity curves for every segment x pricing model
+
+    Each pricing model gets one price grid from `step` up to the highest WTP
+    seen in any segment, so curves are comparable across segments.
+    """
+    index = index if index is not None else sorted_wtp(df)
+
+    curves = {}
+    for model in WTP_MODELS:
+        max_wtp = max((seg[model][-1] for seg in index.values() if len(seg[model])), default=step)
+        prices = np.round(step * np.arange(1, int(np.ceil(max_wtp / step)) + 1), 6)
+
+        for segment, seg_index in index.items():
+            demand = demand_at(seg_index[model], prices)
+            revenue = prices * demand
+            best = int(np.nanargmax(revenue)) if len(seg_index[model]) else 0
+            curves.setdefault(segment, {})[model] = {
+                'prices': prices,
+                'demand': demand,
+                'revenue': revenue,
+                'elasticity': arc_elasticities(prices, demand),
+                'optimal_price': float(prices[best]),
+                'max_revenue': float(revenue[best])
+            }
+    return curves
+
+def calculate_price_elasticity(df: pd.DataFrame, segment: str,
+                               index: Dict[str, Dict[str, np.ndarray]] = None,
+                               curves: Dict[str, Dict[str, Dict]] = None) -> Dict:
+    """Estimate price elasticity for segment
+
+    The headline elasticity and demand_curve stay on the coarse $5 grid;
+    optimal prices come from the dense demand curves.
+    """
+    index = index if index is not None else sorted_wtp(df)
+    curves = curves if curves is not None else demand_curves(df, index=index)
 
     # Simulate demand at different price points
-    prices_sub = np.arange(5, 60, 5)
-    demand_sub = []
+    prices_sub = ELASTICITY_PRICES
+    demand_sub = demand_at(index[segment]['wtp_subscription'], prices_sub)
 
-    for price in prices_sub:
-        willing = (seg_df['wtp_subscription'] >= price).sum() / len(seg_df)
-        demand_sub.append(willing)
+    optimal_prices = {
+        model.replace('wtp_', ''): curve['optimal_price'] for model, curve in curves[segment].items()
+    }
 
-    # Calculate elasticity (% change in demand / % change in price)
-    # Using arc elasticity between points
-    elasticities = []
-    for i in range(1, len(prices_sub)):
-        pct_change_demand = (demand_sub[i] - demand_sub[i-1]) / demand_sub[i-1] if demand_sub[i-1] > 0 else 0
-        pct_change_price = (prices_sub[i] - prices_sub[i-1]) / prices_sub[i-1]
-        elasticity = pct_change_demand / pct_change_price if pct_change_price != 0 else 0
-        elasticities.append(elasticity)
+    return elasticity_result(segment, demand_sub, optimal_prices)
 
-    avg_elasticity = np.mean(elasticities)
+def elasticity_result(segment: str, demand_sub: np.ndarray, optimal_prices: Dict[str, float]) -> Dict:
+    """Elasticity output record from coarse-grid subscription demand and dense-grid optimal prices"""
+    prices_sub = ELASTICITY_PRICES
+    avg_elasticity = np.mean(arc_elasticities(prices_sub, demand_sub))
 
     return {
         'segment': segment,
         'price_elasticity': avg_elasticity,
-        'optimal_price_sub': prices_sub[np.argmax([p * d for p, d in zip(prices_sub, demand_sub)])],
-        'demand_curve': list(zip(prices_sub.tolist(), demand_sub))
+        'optimal_price_sub': optimal_prices['subscription'],
+        'optimal_prices': optimal_prices,
+        'demand_curve': list(zip(prices_sub.tolist(), demand_sub.tolist()))
+    }
+
+# ==================== BOOTSTRAP CONFIDENCE INTERVALS ====================
+
+# Upper bound on resample draws held in memory per block. Replicates and rows
+# are both chunked against it, so memory stays flat as n and n_bootstrap grow.
+BOOTSTRAP_CHUNK_ELEMENTS = 2 ** 22
+
+def bootstrap_means(values: np.ndarray, groups: np.ndarray, n_groups: int,
+                    n_bootstrap: int = 1000, method: str = 'index',
+                    chunk_elements: int = BOOTSTRAP_CHUNK_ELEMENTS,
+                    rng: np.random.Generator = None) -> np.ndarray:
+    """Bootstrap column means of an (n, k) array within each group
+
+    Returns an (n_groups, n_bootstrap, k) array of resample means.
+    'index' resamples every group with replacement (the classic bootstrap);
+    'poisson' weights each row by an independent Poisson(1) draw, so all
+    groups and columns come out of one streaming pass of matrix products.
+    """
+    rng = _rng(rng)
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n, k = values.shape
+    out = np.full((n_groups, n_bootstrap, k), np.nan)
+
+    if method == 'index':
+        order, offsets = group_offsets(groups, n_groups)
+        if order is not None:
+            values = values[order]
+
+        for g in range(n_groups):
+            seg = values[offsets[g]:offsets[g + 1]]
+            n_seg = len(seg)
+            if n_seg == 0:
+                continue
+            rows_per_block = min(n_seg, chunk_elements)
+            reps_per_block = max(1, chunk_elements // rows_per_block)
+
+            for b0 in range(0, n_bootstrap, reps_per_block):
+                b1 = min(b0 + reps_per_block, n_bootstrap)
+                sums = np.zeros((b1 - b0, k))
+                for r0 in range(0, n_seg, rows_per_block):
+                    r1 = min(r0 + rows_per_block, n_seg)
+                    idx = rng.integers(0, n_seg, size=(b1 - b0, r1 - r0))
+                    sums += seg[idx].sum(axis=1)
+                out[g, b0:b1] = sums / n_seg
+
+    elif method == 'poisson':
+        sums, weights = poisson_bootstrap_sums(values, groups, n_groups, n_bootstrap, chunk_elements, rng)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[:] = (sums / weights[:, :, None]).transpose(1, 0, 2)
+
+    else:
+        raise ValueError(f"Unknown bootstrap method: {method}")
+
+    return out
+
+def poisson_bootstrap_sums(values: np.ndarray, groups: np.ndarray, n_groups: int,
+                           n_bootstrap: int = 1000,
+                           chunk_elements: int = BOOTSTRAP_CHUNK_ELEMENTS,
+                           rng: np.random.Generator = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Poisson(1)-weighted sums per replicate, group and column
+
+    Returns (sums, weights) of shapes (n_bootstrap, n_groups, k) and
+    (n_bootstrap, n_groups). Both are additive across row chunks, so they can
+    be accumulated over a stream and divided at the end.
+    """
+    rng = _rng(rng)
+    n, k = values.shape
+    sums = np.zeros((n_bootstrap, n_groups * k))
+    weights = np.zeros((n_bootstrap, n_groups))
+    reps_per_block = min(n_bootstrap, chunk_elements)
+    rows_per_block = max(1, chunk_elements // reps_per_block)
+
+    for b0 in range(0, n_bootstrap, reps_per_block):
+        b1 = min(b0 + reps_per_block, n_bootstrap)
+        for r0 in range(0, n, rows_per_block):
+            r1 = min(r0 + rows_per_block, n)
+            onehot = np.zeros((r1 - r0, n_groups))
+            onehot[np.arange(r1 - r0), groups[r0:r1]] = 1.0
+            design = (onehot[:, :, None] * values[r0:r1, None, :]).reshape(r1 - r0, n_groups * k)
+            w = rng.poisson(1.0, size=(b1 - b0, r1 - r0)).astype(np.float64)
+            sums[b0:b1] += w @ design
+            weights[b0:b1] += w @ onehot
+
+    return sums.reshape(n_bootstrap, n_groups, k), weights
+
+def _quantile_sorted(sorted_boot: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Linear-interpolated quantile along axis 1 with a separate q per (group, column)"""
+    n_bootstrap = sorted_boot.shape[1]
+    pos = np.clip(q, 0, 1) * (n_bootstrap - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, n_bootstrap - 1)
+    frac = pos - lo
+    lower = np.take_along_axis(sorted_boot, lo[:, None, :], axis=1)[:, 0, :]
+    upper = np.take_along_axis(sorted_boot, hi[:, None, :], axis=1)[:, 0, :]
+    return lower + (upper - lower) * frac
+
+def bootstrap_interval(boot: np.ndarray, values: np.ndarray, groups: np.ndarray,
+                       ci: float = 0.95, interval: str = 'percentile') -> Tuple[np.ndarray, np.ndarray]:
+    """Percentile or BCa confidence bounds from bootstrap_means output
+
+    Returns (lower, upper) arrays of shape (n_groups, k).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_groups, _, k = boot.shape
+    alpha = (1 - ci) / 2
+    sorted_boot = np.sort(boot, axis=1)
+
+    if interval == 'percentile':
+        q_lower = np.full((n_groups, k), alpha)
+        q_upper = np.full((n_groups, k), 1 - alpha)
+
+    elif interval == 'bca':
+        counts = np.bincount(groups, minlength=n_groups).astype(np.float64)
+        theta = np.empty((n_groups, k))
+        accel = np.empty((n_groups, k))
+        for j in range(k):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                theta[:, j] = np.bincount(groups, weights=values[:, j], minlength=n_groups) / counts
+                dev = values[:, j] - theta[groups, j]
+                m2 = np.bincount(groups, weights=dev ** 2, minlength=n_groups)
+                m3 = np.bincount(groups, weights=dev ** 3, minlength=n_groups)
+                # Jackknife acceleration has a closed form for the mean
+                accel[:, j] = m3 / (6 * m2 ** 1.5)
+        accel = np.nan_to_num(accel)
+
+        below = (boot < theta[:, None, :]).mean(axis=1)
+        z0 = stats.norm.ppf(np.clip(below, 1 / boot.shape[1], 1 - 1 / boot.shape[1]))
+        z_lo, z_hi = stats.norm.ppf(alpha), stats.norm.ppf(1 - alpha)
+        q_lower = stats.norm.cdf(z0 + (z0 + z_lo) / (1 - accel * (z0 + z_lo)))
+        q_upper = stats.norm.cdf(z0 + (z0 + z_hi) / (1 - accel * (z0 + z_hi)))
+
+    else:
+        raise ValueError(f"Unknown interval type: {interval}")
+
+    return _quantile_sorted(sorted_boot, q_lower), _quantile_sorted(sorted_boot, q_upper)
+
+def summarize_wtp(df: pd.DataFrame, n_bootstrap: int = 1000, method: str = 'index',
+                  interval: str = 'percentile', rng: np.random.Generator = None) -> List[Dict]:
+    """WTP summary rows for every segment x pricing model in one bootstrap pass"""
+    models = list(WTP_MODELS)
+    groups = segment_codes(df)
+    values = df[models].to_numpy(dtype=np.float64)
+
+    boot = bootstrap_means(values, groups, len(PERSONAS), n_bootstrap, method=method, rng=rng)
+    ci_lower, ci_upper = bootstrap_interval(boot, values, groups, interval=interval)
+
+    stats_df = df[models].groupby(groups)
+    means = stats_df.mean()
+    quantiles = {q: stats_df.quantile(q) for q in (0.25, 0.5, 0.75)}
+
+    wtp_summary = []
+    for g, segment in enumerate(PERSONAS):
+        for j, pricing_model in enumerate(models):
+            wtp_summary.append(wtp_summary_row(
+                segment, pricing_model,
+                mean=means.loc[g, pricing_model],
+                median=quantiles[0.5].loc[g, pricing_model],
+                ci=(ci_lower[g, j], ci_upper[g, j]),
+                p25=quantiles[0.25].loc[g, pricing_model],
+                p75=quantiles[0.75].loc[g, pricing_model]
+            ))
+
+    return wtp_summary
+
+def wtp_summary_row(segment: str, pricing_model: str, mean: float, median: float,
+                    ci: Tuple[float, float], p25: float, p75: float) -> Dict[str, str]:
+    """Formatted wtp_summary record as written to focus_group_results.json"""
+    return {
+        'segment': PERSONAS[segment].name,
+        'pricing_model': pricing_model.replace('wtp_', ''),
+        'mean': f"${mean:.2f}",
+        'median': f"${median:.2f}",
+        'ci_95': f"[${ci[0]:.2f}, ${ci[1]:.2f}]",
+        'p25': f"${p25:.2f}",
+        'p75': f"${p75:.2f}"
     }
 
+# ==================== STREAMING PIPELINE ====================
+
+@dataclass
+class WTPAccumulator:
+    """Mergeable per-segment WTP state for populations streamed in chunks
+
+    Holds counts and running moments, a cent-resolution WTP histogram per
+    segment x pricing model, and Poisson bootstrap sums. The histogram is
+    the quantile sketch and the demand-curve counts at once: demand at
+    price p is the number of respondents in bins at or above p. Memory
+    depends on the number of segments, models, replicates and the highest
+    WTP seen, never on the number of respondents.
+
+    With n_bootstrap=0 the CI falls back to the normal approximation from
+    the running variance, which is effectively exact at streaming sizes.
+    Merging states with different n_bootstrap, or reweighting with scaled(),
+    drops the replicates and falls back the same way.
+    """
+    n_bootstrap: int = 1000
+    step: float = DEMAND_PRICE_STEP
+    models: List[str] = field(default_factory=lambda: list(WTP_MODELS))
+    count: np.ndarray = field(init=False)
+    mean: np.ndarray = field(init=False)
+    m2: np.ndarray = field(init=False)
+    hist: np.ndarray = field(init=False)
+    boot_sums: np.ndarray = field(init=False)
+    boot_weights: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        n_groups, k = len(PERSONAS), len(self.models)
+        self.count = np.zeros(n_groups, dtype=np.int64)
+        self.mean = np.zeros((n_groups, k))
+        self.m2 = np.zeros((n_groups, k))
+        self.hist = np.zeros((n_groups, k, 0), dtype=np.int64)
+        self.boot_sums = np.zeros((self.n_bootstrap, n_groups, k))
+        self.boot_weights = np.zeros((self.n_bootstrap, n_groups))
+
+    def _merge_moments(self, count: np.ndarray, mean: np.ndarray, m2: np.ndarray):
+        """Combine running moments with another partition's (Chan et al.)"""
+        total = self.count + count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean - self.mean
+            share = np.where(total > 0, count / total, 0.0)[:, None]
+            self.mean = self.mean + delta * share
+            self.m2 = self.m2 + m2 + delta ** 2 * (self.count * share[:, 0])[:, None]
+        self.count = total
+
+    def _add_hist(self, hist: np.ndarray):
+        width = max(self.hist.shape[2], hist.shape[2])
+        if self.hist.shape[2] < width:
+            self.hist = np.pad(self.hist, ((0, 0), (0, 0), (0, width - self.hist.shape[2])))
+        self.hist[:, :, :hist.shape[2]] += hist
+
+    def update(self, df: pd.DataFrame, rng: np.random.Generator = None) -> 'WTPAccumulator':
+        """Fold a chunk of respondents with WTP columns into the state"""
+        n_groups, k = self.mean.shape
+        groups = segment_codes(df)
+        values = df[self.models].to_numpy(dtype=np.float64)
+
+        count = np.bincount(groups, minlength=n_groups)
+        mean = np.zeros((n_groups, k))
+        m2 = np.zeros((n_groups, k))
+        for j in range(k):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean[:, j] = np.nan_to_num(np.bincount(groups, weights=values[:, j], minlength=n_groups) / count)
+            m2[:, j] = np.bincount(groups, weights=(values[:, j] - mean[groups, j]) ** 2, minlength=n_groups)
+        self._merge_moments(count, mean, m2)
+
+        bins = np.maximum(np.floor(values / self.step), 0).astype(np.int64)
+        width = int(bins.max()) + 1 if len(bins) else 0
+        keys = (groups[:, None] * k + np.arange(k)) * width + bins
+        self._add_hist(np.bincount(keys.ravel(), minlength=n_groups * k * width).reshape(n_groups, k, width))
+
+        if self.n_bootstrap:
+            sums, weights = poisson_bootstrap_sums(values, groups, n_groups, self.n_bootstrap, rng=rng)
+            self.boot_sums += sums
+            self.boot_weights += weights
+        return self
+
+    def merge(self, other: 'WTPAccumulator') -> 'WTPAccumulator':
+        """Fold another accumulator (e.g. from a different chunk range) into this one"""
+        self._merge_moments(other.count, other.mean, other.m2)
+        self._add_hist(other.hist)
+        if self.n_bootstrap and other.n_bootstrap == self.n_bootstrap:
+            self.boot_sums += other.boot_sums
+            self.boot_weights += other.boot_weights
+        elif self.n_bootstrap:
+            # Replicates covering only one side would understate the CI
+            self._drop_bootstrap()
+        return self
+
+    def _drop_bootstrap(self):
+        self.n_bootstrap = 0
+        self.boot_sums = self.boot_sums[:0]
+        self.boot_weights = self.boot_weights[:0]
+
+    def scaled(self, weights: np.ndarray) -> 'WTPAccumulator':
+        """Copy with each segment's respondents reweighted by weights[segment]
+
+        Replicates cannot be reweighted (their spread reflects the original
+        row count), so the copy's CI is the normal approximation on the
+        reweighted count.
+        """
+        out = replace(self, n_bootstrap=0)
+        out.count = self.count * weights
+        out.mean = self.mean.copy()
+        out.m2 = self.m2 * weights[:, None]
+        out.hist = self.hist * weights[:, None, None]
+        return out
+
+    def variance(self) -> np.ndarray:
+        """Sample variance per segment x pricing model"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.m2 / (self.count[:, None] - 1)
+
+    def quantile(self, q: float) -> np.ndarray:
+        """Quantile per segment x pricing model, interpolated within histogram bins"""
+        n_groups, k = self.mean.shape
+        out = np.full((n_groups, k), np.nan)
+        for g in range(n_groups):
+            if self.count[g] == 0:
+                continue
+            rank = q * (self.count[g] - 1)
+            for j in range(k):
+                cumulative = np.cumsum(self.hist[g, j])
+                b = int(np.searchsorted(cumulative, rank, side='right'))
+                before = cumulative[b - 1] if b > 0 else 0
+                out[g, j] = (b + (rank - before + 0.5) / self.hist[g, j, b]) * self.step
+        return out
+
+    def demand_counts(self) -> np.ndarray:
+        """Respondents with WTP >= i * step, for every histogram bin i"""
+        return np.cumsum(self.hist[:, :, ::-1], axis=2)[:, :, ::-1]
+
+    def confidence_interval(self, ci: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+        """Percentile bootstrap bounds on the mean (normal approximation without replicates)"""
+        alpha = (1 - ci) / 2
+        if self.n_bootstrap:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                boot = self.boot_sums / self.boot_weights[:, :, None]
+            return np.percentile(boot, 100 * alpha, axis=0), np.percentile(boot, 100 * (1 - alpha), axis=0)
+        half_width = stats.norm.ppf(1 - alpha) * np.sqrt(self.variance() / self.count[:, None])
+        return self.mean - half_width, self.mean + half_width
+
+    def wtp_summary(self) -> List[Dict]:
+        """Same records as summarize_wtp, from the streamed state"""
+        ci_lower, ci_upper = self.confidence_interval()
+        quantiles = {q: self.quantile(q) for q in (0.25, 0.5, 0.75)}
+
+        wtp_summary = []
+        for g, segment in enumerate(PERSONAS):
+            for j, pricing_model in enumerate(self.models):
+                wtp_summary.append(wtp_summary_row(
+                    segment, pricing_model,
+                    mean=self.mean[g, j],
+                    median=quantiles[0.5][g, j],
+                    ci=(ci_lower[g, j], ci_upper[g, j]),
+                    p25=quantiles[0.25][g, j],
+                    p75=quantiles[0.75][g, j]
+                ))
+        return wtp_summary
+
+    def elasticity(self) -> List[Dict]:
+        """Same records as calculate_price_elasticity, from the streamed demand counts"""
+        counts = self.demand_counts()
+        prices = np.round(self.step * np.arange(counts.shape[2]), 6)
+        coarse_bins = np.round(ELASTICITY_PRICES / self.step).astype(np.intp)
+        sub = self.models.index('wtp_subscription')
+
+        results = []
+        for g, segment in enumerate(PERSONAS):
+            n_seg = max(self.count[g], 1)
+            padded = np.concatenate([counts[g, sub], np.zeros(max(0, coarse_bins.max() + 1 - counts.shape[2]))])
+            demand_sub = padded[coarse_bins] / n_seg
+
+            optimal_prices = {}
+            for j, model in enumerate(self.models):
+                # Skip the $0 bin so the grid matches demand_curves
+                revenue = prices[1:] * counts[g, j, 1:] / n_seg
+                optimal_prices[model.replace('wtp_', '')] = float(prices[1:][np.argmax(revenue)]) if len(revenue) else 0.0
+            results.append(elasticity_result(segment, demand_sub, optimal_prices))
+        return results
+
+def stream_simulation(n: int, chunk_size: int = 1_000_000, n_bootstrap: int = 0,
+                      rng: np.random.Generator = None, sampler: str = 'random') -> WTPAccumulator:
+    """Generate and score n respondents chunk by chunk with constant peak memory
+
+    CIs default to the normal approximation; a Poisson bootstrap
+    (n_bootstrap > 0) costs a pass over every row per replicate block.
+    """
+    accumulator = WTPAccumulator(n_bootstrap=n_bootstrap)
+    for chunk in iter_respondent_chunks(n, chunk_size, rng=rng, sampler=sampler):
+        accumulator.update(calculate_wtp(chunk), rng=rng)
+    return accumulator
+
+# ==================== SURVEY AGGREGATION ====================
+
+SURVEY_STATE_FILE = 'survey_state.pkl'
+
+# Stated WTP above this is treated as a bad answer; it also bounds the cent histogram
+SURVEY_MAX_WTP = 1000.0
+
+def clean_responses(df: pd.DataFrame, max_wtp: float = SURVEY_MAX_WTP) -> pd.DataFrame:
+    """Observed responses with WTP columns, minus rows with unknown segments or invalid WTP
+
+    Stated WTP is used when the batch has every model column; otherwise WTP
+    is derived from the respondent attributes with calculate_wtp. Negative,
+    non-finite and above-max_wtp answers are invalid.
+    """
+    models = list(WTP_MODELS)
+    if not all(model in df for model in models):
+        df = calculate_wtp(df.copy())
+    values = df[models].to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        valid = (values >= 0) & (values <= max_wtp)
+    keep = (segment_codes(df) >= 0) & valid.all(axis=1)
+    return df[keep]
+
+@dataclass
+class SurveyAggregator:
+    """Persistent WTP state for real survey responses arriving in daily batches
+
+    Observed batches fold into a WTPAccumulator, so an ingest costs time
+    proportional to the batch and the state never grows with history:
+    answers above max_wtp are dropped, which bounds the histogram width.
+    Simulated respondents go into a second accumulator; blended() scales it
+    to prior_weight pseudo-respondents per segment and merges the observed
+    state on top, so the simulation acts as a prior that real data overrides.
+    """
+    n_bootstrap: int = 1000
+    seed: int = DEFAULT_SEED
+    observed: WTPAccumulator = None
+    simulated: WTPAccumulator = None
+    n_batches: int = 0
+    n_dropped: int = 0
+    max_wtp: float = SURVEY_MAX_WTP
+
+    def __post_init__(self):
+        if self.observed is None:
+            self.observed = WTPAccumulator(n_bootstrap=self.n_bootstrap)
+        if self.simulated is None:
+            self.simulated = WTPAccumulator(n_bootstrap=self.n_bootstrap)
+
+    def ingest(self, df: pd.DataFrame, source: str = 'observed') -> int:
+        """Fold one batch of responses into the observed or simulated state, returning rows kept"""
+        if source not in ('observed', 'simulated'):
+            raise ValueError(f"Unknown response source: {source}")
+        clean = clean_responses(df, self.max_wtp)
+        self.n_dropped += len(df) - len(clean)
+        # Each batch draws from its own stream, so replaying the batches reproduces the state
+        rng = stage_rng(self.seed, f'survey-{source}-{self.n_batches}')
+        getattr(self, source).update(clean, rng=rng)
+        self.n_batches += 1
+        return len(clean)
+
+    def blended(self, prior_weight: float = 0) -> WTPAccumulator:
+        """Observed state plus the simulated state counted as prior_weight respondents per segment
+
+        The CI is the normal approximation on that blended effective count.
+        """
+        if prior_weight <= 0 or not self.simulated.count.any():
+            return self.observed
+        weights = prior_weight / np.maximum(self.simulated.count, 1)
+        return self.simulated.scaled(weights).merge(self.observed)
+
+    def wtp_summary(self, prior_weight: float = 0) -> List[Dict]:
+        return self.blended(prior_weight).wtp_summary()
+
+    def elasticity(self, prior_weight: float = 0) -> List[Dict]:
+        return self.blended(prior_weight).elasticity()
+
+    def save(self, path: str) -> str:
+        """Write the state atomically so a crashed ingest never leaves it half-written"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'SurveyAggregator':
+        """Read saved state, or start fresh (with kwargs) if there is none yet"""
+        if not os.path.exists(path):
+            return cls(**kwargs)
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+def ingest_survey_file(path: str, state_path: str = None, chunk_size: int = 1_000_000,
+                       source: str = 'observed') -> SurveyAggregator:
+    """Fold a CSV of survey responses into the persisted aggregator, chunk by chunk"""
+    state_path = state_path or os.path.join(DEFAULT_OUTPUT_DIR, SURVEY_STATE_FILE)
+    aggregator = SurveyAggregator.load(state_path)
+    for chunk in pd.read_csv(path, chunksize=chunk_size):
+        aggregator.ingest(chunk, source=source)
+    aggregator.save(state_path)
+    return aggregator
+
+# ==================== PRICING OPTIMIZER ====================
+
+# Monthly value of each subscription tier as a multiple of the respondent's
+# subscription WTP. Tier 2 (unlimited looks) is the reference plan.
+TIER_VALUE = {'tier_1': 0.6, 'tier_2': 1.0, 'tier_3': 1.3}
+
+# Change in each tier's multiple per point of (fashion_interest, time_scarcity)
+# above 5, so respondents disagree on how much more the higher tiers are worth.
+# Without it every respondent ranks the tiers alike and one tier takes everyone.
+TIER_VALUE_LOADINGS = {'tier_1': (-0.05, -0.02), 'tier_2': (0.0, 0.0), 'tier_3': (0.1, 0.05)}
+
+# Smallest share of respondents every tier must sell to for a ladder to count
+# as a three-tier offer in optimize_pricing
+MIN_TIER_SHARE = 0.05
+
+# Outfits a pay-per-outfit customer buys in a month, so single purchases
+# can be compared with monthly plans
+OUTFITS_PER_MONTH = 2
+
+PRICING_OPTIONS = list(TIER_VALUE) + ['per_outfit']
+
+# Full-resolution search grid per option (per_outfit is the single-outfit price)
+PRICE_GRID = {
+    'tier_1': np.arange(5, 31, 1.0),
+    'tier_2': np.arange(15, 61, 1.0),
+    'tier_3': np.arange(25, 101, 1.0),
+    'per_outfit': np.arange(0.99, 9.0, 0.25)
+}
+
+# The hand-written ladder from the recommendations at the end of main()
+RECOMMENDED_PRICES = {'tier_1': 12, 'tier_2': 29, 'tier_3': 49, 'per_outfit': 3.99}
+
+# Upper bound on (combinations x respondents x options) surplus cells per block
+PRICING_CHUNK_ELEMENTS = 2 ** 24
+
+def option_values(df: pd.DataFrame) -> np.ndarray:
+    """(n, options) monthly value of every pricing option to every respondent
+
+    Tier multiples shift with the respondent's attributes (TIER_VALUE_LOADINGS)
+    and are kept non-decreasing across tiers, since a higher tier includes
+    everything below it.
+    """
+    sub = df['wtp_subscription'].to_numpy(dtype=np.float32)
+    attributes = np.column_stack([df['fashion_interest'].to_numpy(), df['time_scarcity'].to_numpy()]).astype(np.float32) - 5
+    loadings = np.array([TIER_VALUE_LOADINGS[tier] for tier in TIER_VALUE], dtype=np.float32).T
+    multiples = np.array(list(TIER_VALUE.values()), dtype=np.float32) + attributes @ loadings
+    multiples = np.maximum.accumulate(np.maximum(multiples, 0), axis=1)
+    per_outfit = df['wtp_per_outfit'].to_numpy(dtype=np.float32) * OUTFITS_PER_MONTH
+    return np.column_stack([sub[:, None] * multiples, per_outfit])
+
+def _monthly_prices(combos: np.ndarray) -> np.ndarray:
+    prices = combos.astype(np.float32, copy=True)
+    prices[:, -1] *= OUTFITS_PER_MONTH
+    return prices
+
+def evaluate_price_combos(values: np.ndarray, groups: np.ndarray, n_groups: int, combos: np.ndarray,
+                          chunk_elements: int = PRICING_CHUNK_ELEMENTS) -> Dict[str, np.ndarray]:
+    """Max-surplus choice for every respondent under every price combination
+
+    combos is (c, options) in PRICING_OPTIONS order. Each respondent buys the
+    option with the largest non-negative surplus, or nothing. Returns per
+    combination the revenue per respondent, the take rate, the share of
+    respondents on each option and the take rate within each segment.
+    """
+    n, n_options = values.shape
+    prices = _monthly_prices(combos)
+    onehot = np.zeros((n, n_groups), dtype=np.float32)
+    onehot[np.arange(n), groups] = 1.0
+    seg_sizes = np.maximum(onehot.sum(axis=0), 1)
+
+    out = {
+        'revenue': np.empty(len(combos)),
+        'take_rate': np.empty(len(combos)),
+        'option_share': np.empty((len(combos), n_options)),
+        'segment_take_rate': np.empty((len(combos), n_groups))
+    }
+    per_block = max(1, chunk_elements // max(n * n_options, 1))
+
+    for c0 in range(0, len(combos), per_block):
+        c1 = min(c0 + per_block, len(combos))
+        surplus = values[None, :, :] - prices[c0:c1, None, :]
+        choice = surplus.argmax(axis=2)
+        buys = np.take_along_axis(surplus, choice[:, :, None], axis=2)[:, :, 0] >= 0
+        paid = np.where(buys, np.take_along_axis(prices[c0:c1], choice, axis=1), 0)
+
+        out['revenue'][c0:c1] = paid.sum(axis=1) / n
+        out['take_rate'][c0:c1] = buys.mean(axis=1)
+        for o in range(n_options):
+            out['option_share'][c0:c1, o] = (buys & (choice == o)).mean(axis=1)
+        out['segment_take_rate'][c0:c1] = (buys.astype(np.float32) @ onehot) / seg_sizes
+
+    return out
+
+def _evaluate_chunk(task) -> Dict[str, np.ndarray]:
+    """Worker: evaluate one slice of the combination grid"""
+    return evaluate_price_combos(*task)
+
+def _evaluate_grid(values, groups, n_groups, combos, workers) -> Dict[str, np.ndarray]:
+    if workers <= 1 or len(combos) < 2 * workers:
+        return evaluate_price_combos(values, groups, n_groups, combos)
+    slices = np.array_split(combos, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_evaluate_chunk, [(values, groups, n_groups, part) for part in slices]))
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+def optimize_pricing(df: pd.DataFrame, grid: Dict[str, np.ndarray] = None, strides: Tuple[int, ...] = (8, 4, 2, 1),
+                     top_k: int = 20, max_respondents: int = 20_000, workers: int = 1,
+                     min_tier_share: float = MIN_TIER_SHARE, rng: np.random.Generator = None) -> Dict:
+    """Search tier + pay-per-outfit prices for maximum revenue per respondent
+
+    Coarse-to-fine over the grid: the first pass evaluates every
+    strides[0]-th price on each axis. Each later pass takes the top_k
+    combinations so far and evaluates their neighbours one stride away on
+    every axis, with the stride shrinking to the full grid resolution.
+    Ladders whose tier prices are not strictly increasing are pruned
+    before evaluation. Ladders on which every tier sells to at least
+    min_tier_share of respondents rank ahead of the rest, so the best is a
+    real three-tier offer whenever the grid has one. Populations above
+    max_respondents are evaluated on a uniform sample. Returns the best combination, the hand-written
+    RECOMMENDED_PRICES for comparison, and the table of every evaluated one.
+    """
+    grid = grid or PRICE_GRID
+    if len(df) > max_respondents:
+        df = df.iloc[np.sort(_rng(rng).choice(len(df), max_respondents, replace=False))]
+    values = option_values(df)
+    groups = segment_codes(df)
+    n_groups = len(PERSONAS)
+    axes = [np.asarray(grid[o], dtype=np.float64) for o in PRICING_OPTIONS]
+    sizes = np.array([len(axis) for axis in axes])
+    n_tiers = len(TIER_VALUE)
+
+    def to_prices(idx: np.ndarray) -> np.ndarray:
+        return np.stack([axis[idx[:, o]] for o, axis in enumerate(axes)], axis=1)
+
+    def ladder(idx: np.ndarray) -> np.ndarray:
+        return idx[np.all(np.diff(to_prices(idx)[:, :n_tiers], axis=1) > 0, axis=1)]
+
+    def ranked(evaluated: Dict[str, np.ndarray]) -> np.ndarray:
+        sells_every_tier = evaluated['option_share'][:, :n_tiers].min(axis=1) >= min_tier_share
+        return np.lexsort((-evaluated['revenue'], ~sells_every_tier))
+
+    idx = np.stack(np.meshgrid(*[np.arange(0, size, strides[0]) for size in sizes], indexing='ij'),
+                   axis=-1).reshape(-1, len(axes))
+    evaluated_idx = ladder(idx)
+    evaluated = _evaluate_grid(values, groups, n_groups, to_prices(evaluated_idx), workers)
+
+    for stride in strides[1:]:
+        top = evaluated_idx[ranked(evaluated)[:top_k]]
+        offsets = np.stack(np.meshgrid(*[[-stride, 0, stride]] * len(axes), indexing='ij'),
+                           axis=-1).reshape(-1, len(axes))
+        candidates = np.clip((top[:, None, :] + offsets[None, :, :]).reshape(-1, len(axes)), 0, sizes - 1)
+        candidates = ladder(np.unique(candidates, axis=0))
+
+        # Skip combinations an earlier pass already scored
+        seen = {tuple(row) for row in evaluated_idx}
+        candidates = candidates[[tuple(row) not in seen for row in candidates]] if len(candidates) else candidates
+        if not len(candidates):
+            continue
+        fresh = _evaluate_grid(values, groups, n_groups, to_prices(candidates), workers)
+        evaluated_idx = np.concatenate([evaluated_idx, candidates])
+        evaluated = {key: np.concatenate([evaluated[key], fresh[key]]) for key in evaluated}
+
+    table = pricing_table(to_prices(evaluated_idx), evaluated).iloc[ranked(evaluated)]
+
+    return {
+        'best': pricing_report(table.iloc[0]),
+        'recommended': evaluate_prices(df, RECOMMENDED_PRICES),
+        'n_evaluated': len(table),
+        'table': table.reset_index(drop=True)
+    }
+
+def pricing_table(combos: np.ndarray, evaluated: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """One row per evaluated combination: prices, revenue, take rate, option shares, segment take rates"""
+    table = pd.DataFrame(combos, columns=PRICING_OPTIONS)
+    table['revenue_per_respondent'] = evaluated['revenue']
+    table['take_rate'] = evaluated['take_rate']
+    for o, option in enumerate(PRICING_OPTIONS):
+        table[f'share_{option}'] = evaluated['option_share'][:, o]
+    for g, segment in enumerate(PERSONAS):
+        table[f'take_rate_{segment}'] = evaluated['segment_take_rate'][:, g]
+    return table
+
+def pricing_report(row: pd.Series) -> Dict:
+    """Prices, revenue, take rate and mix for one evaluated combination"""
+    return {
+        'prices': {option: float(row[option]) for option in PRICING_OPTIONS},
+        'revenue_per_respondent': float(row['revenue_per_respondent']),
+        'take_rate': float(row['take_rate']),
+        'option_share': {option: float(row[f'share_{option}']) for option in PRICING_OPTIONS},
+        'segment_take_rate': {segment: float(row[f'take_rate_{segment}']) for segment in PERSONAS}
+    }
+
+def evaluate_prices(df: pd.DataFrame, prices: Dict[str, float]) -> Dict:
+    """Report for a single tier ladder, e.g. RECOMMENDED_PRICES"""
+    combo = np.array([[prices[o] for o in PRICING_OPTIONS]], dtype=np.float64)
+    evaluated = evaluate_price_combos(option_values(df), segment_codes(df), len(PERSONAS), combo)
+    return pricing_report(pricing_table(combo, evaluated).iloc[0])
+
+# ==================== VAN WESTENDORP ====================
+
+# Each respondent's four price answers as multiples of their WTP, before
+# noise. Answers are sorted per respondent, so every answer set is
+# consistent (too cheap < cheap < expensive < too expensive).
+VW_THRESHOLDS = {'too_cheap': 0.4, 'cheap': 0.65, 'expensive': 1.0, 'too_expensive': 1.5}
+
+# Lognormal sigma of the noise on each answer
+VW_NOISE = 0.15
+
+# Curves as (threshold column, share of respondents whose answer is ... p)
+VW_CURVES = {
+    'too_cheap': ('too_cheap', 'at_least'),
+    'cheap': ('cheap', 'at_least'),
+    'not_cheap': ('cheap', 'below'),
+    'expensive': ('expensive', 'at_most'),
+    'not_expensive': ('expensive', 'above'),
+    'too_expensive': ('too_expensive', 'at_most')
+}
+
+# Price points as the crossing of a falling and a rising curve
+VW_INTERSECTIONS = {
+    'PMC': ('too_cheap', 'not_cheap'),       # point of marginal cheapness
+    'OPP': ('too_cheap', 'too_expensive'),   # optimal price point
+    'IPP': ('cheap', 'expensive'),           # indifference price point
+    'PME': ('not_expensive', 'too_expensive')  # point of marginal expensiveness
+}
+
+# Bootstrap replicates run on at most this many respondents per segment
+VW_BOOTSTRAP_RESPONDENTS = 50_000
+
+def van_westendorp_answers(wtp: np.ndarray, rng: np.random.Generator = None) -> np.ndarray:
+    """(n, 4) answers in VW_THRESHOLDS order for respondents with the given WTP"""
+    rng = _rng(rng)
+    ratios = np.array(list(VW_THRESHOLDS.values()))
+    answers = np.asarray(wtp, dtype=np.float64)[:, None] * ratios
+    answers *= np.exp(VW_NOISE * rng.standard_normal(answers.shape))
+    answers.sort(axis=1)
+    return answers
+
+def van_westendorp_matrix(df: pd.DataFrame, rng: np.random.Generator = None) -> np.ndarray:
+    """(n, 4) answers in VW_THRESHOLDS order: df's answer columns, or derived from subscription WTP"""
+    if all(name in df for name in VW_THRESHOLDS):
+        return df[list(VW_THRESHOLDS)].to_numpy(dtype=np.float64)
+    if 'wtp_subscription' not in df:
+        raise ValueError(f"Need the Van Westendorp answer columns {list(VW_THRESHOLDS)} or 'wtp_subscription'")
+    return van_westendorp_answers(df['wtp_subscription'].to_numpy(), rng)
+
+def van_westendorp_responses(df: pd.DataFrame, model: str = 'wtp_subscription',
+                             rng: np.random.Generator = None) -> pd.DataFrame:
+    """Add the four Van Westendorp answers (float32 columns) derived from a WTP column"""
+    answers = van_westendorp_answers(df[model].to_numpy(), rng)
+    for i, name in enumerate(VW_THRESHOLDS):
+        df[name] = answers[:, i].astype(np.float32)
+    return df
+
+def _vw_share(sorted_values: np.ndarray, cum_weight: np.ndarray, prices: np.ndarray, kind: str) -> np.ndarray:
+    """Weighted share of answers relative to each price
+
+    cum_weight holds cumulative respondent weights in sorted order with a
+    leading zero: (n + 1,) shared by every price, or (rows, n + 1) with one
+    price per row.
+    """
+    side = 'left' if kind in ('at_least', 'below') else 'right'
+    idx = np.searchsorted(sorted_values, prices, side=side)
+    if cum_weight.ndim == 1:
+        below = cum_weight[idx] / cum_weight[-1]
+    else:
+        below = np.take_along_axis(cum_weight, idx[:, None], axis=1)[:, 0] / cum_weight[:, -1]
+    return below if kind in ('below', 'at_most') else 1 - below
+
+def _vw_points(sorted_answers: Dict[str, np.ndarray], cum_weights: Dict[str, np.ndarray],
+               n_steps: int = 60) -> Dict[str, np.ndarray]:
+    """Every intersection price by bisection, one per weight row
+
+    The falling curve minus the rising one is monotone in price, so each
+    step only evaluates both curves at one price per row: O(log n) each.
+    """
+    cum_weight = next(iter(cum_weights.values()))
+    rows = cum_weight.shape[0] if cum_weight.ndim == 2 else 1
+    lo_bound = min(values[0] for values in sorted_answers.values())
+    hi_bound = max(values[-1] for values in sorted_answers.values())
+
+    def share(curve: str, prices: np.ndarray) -> np.ndarray:
+        column, kind = VW_CURVES[curve]
+        return _vw_share(sorted_answers[column], cum_weights[column], prices, kind)
+
+    points = {}
+    for point, (falling, rising) in VW_INTERSECTIONS.items():
+        lo, hi = np.full(rows, lo_bound, dtype=np.float64), np.full(rows, hi_bound, dtype=np.float64)
+        for _ in range(n_steps):
+            mid = (lo + hi) / 2
+            above = share(falling, mid) > share(rising, mid)
+            lo, hi = np.where(above, mid, lo), np.where(above, hi, mid)
+        points[point] = hi
+    return points
+
+def _vw_sorted(answers: np.ndarray, ranks: bool = False) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """Each answer column sorted, plus every respondent's rank within it if requested"""
+    sorted_answers, answer_ranks = {}, {}
+    for i, name in enumerate(VW_THRESHOLDS):
+        if not ranks:
+            sorted_answers[name] = np.sort(answers[:, i])
+            continue
+        order = np.argsort(answers[:, i], kind='stable')
+        sorted_answers[name] = answers[order, i]
+        answer_ranks[name] = np.empty(len(order), dtype=np.intp)
+        answer_ranks[name][order] = np.arange(len(order))
+    return sorted_answers, answer_ranks
+
+def _vw_estimate(sorted_answers: Dict[str, np.ndarray], ranks: Dict[str, np.ndarray] = None,
+                 resamples: np.ndarray = None) -> Dict[str, np.ndarray]:
+    """Intersections once unweighted, or once per row of (rows, n) resampled respondent indices
+
+    A resample becomes per-respondent counts in each column's sorted order
+    by bincounting the ranks of the drawn respondents, so nothing is
+    re-sorted per replicate.
+    """
+    n = len(next(iter(sorted_answers.values())))
+    if resamples is None:
+        return _vw_points(sorted_answers, {name: np.arange(n + 1, dtype=np.float64) for name in sorted_answers})
+
+    rows = resamples.shape[0]
+    offsets = n * np.arange(rows)[:, None]
+    cum_weights = {}
+    for name, rank in ranks.items():
+        counts = np.bincount((rank[resamples] + offsets).ravel(), minlength=rows * n).reshape(rows, n)
+        cum_weights[name] = np.zeros((rows, n + 1))
+        np.cumsum(counts, axis=1, out=cum_weights[name][:, 1:])
+    return _vw_points(sorted_answers, cum_weights)
+
+def van_westendorp(df: pd.DataFrame, n_bootstrap: int = 1000, ci: float = 0.95,
+                   max_bootstrap_respondents: int = VW_BOOTSTRAP_RESPONDENTS,
+                   chunk_elements: int = BOOTSTRAP_CHUNK_ELEMENTS,
+                   rng: np.random.Generator = None) -> List[Dict]:
+    """OPP, IPP, PMC and PME per segment with bootstrap confidence intervals
+
+    Point estimates use every respondent: each answer column is sorted once
+    (O(n log n)) and the curve crossings are found by bisection. CIs come
+    from index bootstrap replicates evaluated in blocks as cumulative counts
+    over the sorted answers. Segments larger than max_bootstrap_respondents
+    are bootstrapped on a subsample of m and the replicate spread is
+    rescaled by sqrt(m / n) (m-out-of-n bootstrap). Answers are derived
+    from subscription WTP if df has none (without modifying df).
+    """
+    rng = _rng(rng)
+    answers = van_westendorp_matrix(df, rng)
+    order, offsets = group_offsets(segment_codes(df), len(PERSONAS))
+    alpha = (1 - ci) / 2
+
+    results = []
+    for g, segment in enumerate(PERSONAS):
+        rows = slice(offsets[g], offsets[g + 1]) if order is None else order[offsets[g]:offsets[g + 1]]
+        seg_answers = answers[rows]
+        n_seg = len(seg_answers)
+        if n_seg == 0:
+            continue
+        m = min(n_seg, max_bootstrap_respondents)
+        if m == n_seg:
+            sorted_sample, ranks = _vw_sorted(seg_answers, ranks=True)
+            estimate = sample_estimate = _vw_estimate(sorted_sample)
+        else:
+            estimate = _vw_estimate(_vw_sorted(seg_answers)[0])
+            sorted_sample, ranks = _vw_sorted(seg_answers[rng.choice(n_seg, m, replace=False)], ranks=True)
+            sample_estimate = _vw_estimate(sorted_sample)
+
+        reps_per_block = max(1, chunk_elements // m)
+        boot = {point: [sample_estimate[point]] if not n_bootstrap else [] for point in VW_INTERSECTIONS}
+        for b0 in range(0, n_bootstrap, reps_per_block):
+            resamples = rng.integers(0, m, size=(min(reps_per_block, n_bootstrap - b0), m))
+            for point, values in _vw_estimate(sorted_sample, ranks, resamples).items():
+                boot[point].append(values)
+
+        scale = float(np.sqrt(m / n_seg))
+        result = {'segment': segment}
+        for point in VW_INTERSECTIONS:
+            price, centre = float(estimate[point][0]), float(sample_estimate[point][0])
+            lower, upper = np.percentile(np.concatenate(boot[point]), [100 * alpha, 100 * (1 - alpha)])
+            result[point] = {
+                'price': price,
+                'ci_lower': price + float(lower - centre) * scale,
+                'ci_upper': price + float(upper - centre) * scale
+            }
+        result['acceptable_range'] = (result['PMC']['price'], result['PME']['price'])
+        results.append(result)
+    return results
+
+def van_westendorp_curves(df: pd.DataFrame, segment: str, prices: np.ndarray = None,
+                          rng: np.random.Generator = None) -> Dict[str, np.ndarray]:
+    """The six cumulative curves for one segment on a price grid (for plotting)
+
+    Answers are derived from subscription WTP if df has none, as in van_westendorp.
+    """
+    answers = van_westendorp_matrix(df, _rng(rng))
+    order, offsets = group_offsets(segment_codes(df), len(PERSONAS))
+    g = list(PERSONAS).index(segment)
+    seg = answers[slice(offsets[g], offsets[g + 1]) if order is None else order[offsets[g]:offsets[g + 1]]]
+    columns = list(VW_THRESHOLDS)
+    if prices is None:
+        prices = np.arange(1, np.ceil(seg[:, columns.index('too_expensive')].max()) + 1)
+    prices = np.asarray(prices)
+    curves = {'prices': prices}
+    for curve, (column, kind) in VW_CURVES.items():
+        values = np.sort(seg[:, columns.index(column)])
+        curves[curve] = _vw_share(values, np.arange(len(values) + 1, dtype=np.float64), prices, kind)
+    return curves
+
+# ==================== SCENARIO SWEEP ====================
+
+# Sweep parameters are named '<segment>.<field>' for numeric PersonaConfig
+# fields and 'weight.<segment>' for SEGMENT_DISTRIBUTION weights (weights are
+# renormalized to sum to 1 per scenario).
+SWEEPABLE_FIELDS = ['income_mean', 'income_std', 'time_scarcity', 'fashion_interest', 'price_sensitivity']
+
+DEFAULT_SWEEP_RANGES = {
+    'busy_professional.price_sensitivity': (0.5, 0.9),
+    'genz_social.price_sensitivity': (1.1, 1.7),
+    'fashion_anxious_men.price_sensitivity': (0.8, 1.2),
+    'genz_social.income_mean': (25000, 45000),
+    'weight.genz_social': (0.25, 0.55)
+}
+
+def scenario_design(ranges: Dict[str, Tuple[float, float]], n_scenarios: int, method: str = 'lhs',
+                    seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Latin hypercube or scrambled Sobol design over parameter ranges, one row per scenario"""
+    names = list(ranges)
+    for name in names:
+        scope, _, key = name.partition('.')
+        if scope == 'weight':
+            valid = key in PERSONAS
+        else:
+            valid = scope in PERSONAS and key in SWEEPABLE_FIELDS
+        if not valid:
+            raise ValueError(f"Unknown sweep parameter: {name}")
+
+    if method == 'lhs':
+        sampler = stats.qmc.LatinHypercube(d=len(names), seed=seed)
+    elif method == 'sobol':
+        sampler = stats.qmc.Sobol(d=len(names), scramble=True, seed=seed)
+    else:
+        raise ValueError(f"Unknown design method: {method}")
+
+    low = [ranges[name][0] for name in names]
+    high = [ranges[name][1] for name in names]
+    design = pd.DataFrame(stats.qmc.scale(sampler.random(n_scenarios), low, high), columns=names)
+    design.index.name = 'scenario'
+    return design
+
+def scenario_personas(params: Dict[str, float]) -> Tuple[Dict[str, PersonaConfig], Dict[str, float]]:
+    """PERSONAS and SEGMENT_DISTRIBUTION with one scenario's overrides applied"""
+    personas = dict(PERSONAS)
+    weights = dict(SEGMENT_DISTRIBUTION)
+    overrides = {}
+    for name, value in params.items():
+        scope, key = name.split('.', 1)
+        if scope == 'weight':
+            weights[key] = value
+        else:
+            overrides.setdefault(scope, {})[key] = value
+
+    for segment, fields in overrides.items():
+        personas[segment] = replace(personas[segment], **fields)
+    total = sum(weights.values())
+    return personas, {segment: weight / total for segment, weight in weights.items()}
+
+def run_scenario(base_draws: Dict[str, Dict[str, np.ndarray]], params: Dict[str, float]) -> List[Dict]:
+    """Optimal prices and elasticities for one scenario
+
+    The population is rebuilt by rescaling the shared base draws, not by
+    sampling again. Every scenario therefore sees the same underlying
+    respondents (common random numbers), and differences between scenarios
+    come from the parameters alone. The largest segment uses all of its
+    base draws and the others are truncated to match the scenario weights.
+    Rows cover each segment plus the blended population ('all').
+    """
+    personas, weights = scenario_personas(params)
+    scale = min(len(draws['age_u']) / weights[segment] for segment, draws in base_draws.items())
+
+    parts = []
+    for segment, draws in base_draws.items():
+        n_segment = int(scale * weights[segment])
+        parts.append(columns_from_draws(segment, {k: v[:n_segment] for k, v in draws.items()},
+                                        config=personas[segment]))
+    df = calculate_wtp(respondent_frame({name: np.concatenate([part[name] for part in parts]) for name in parts[0]}))
+
+    index = sorted_wtp(df)
+    curves = demand_curves(df, index=index)
+    index['all'] = {model: np.sort(df[model].to_numpy()) for model in WTP_MODELS}
+
+    rows = []
+    for segment, seg_index in index.items():
+        demand_sub = demand_at(seg_index['wtp_subscription'], ELASTICITY_PRICES)
+        elasticity = float(np.mean(arc_elasticities(ELASTICITY_PRICES, demand_sub)))
+        for model in WTP_MODELS:
+            if segment == 'all':
+                prices = curves[next(iter(PERSONAS))][model]['prices']
+                revenue = prices * demand_at(seg_index[model], prices)
+                best = int(np.argmax(revenue))
+                optimal_price, max_revenue = float(prices[best]), float(revenue[best])
+            else:
+                optimal_price = curves[segment][model]['optimal_price']
+                max_revenue = curves[segment][model]['max_revenue']
+            rows.append({
+                'segment': segment,
+                'pricing_model': model.replace('wtp_', ''),
+                'optimal_price': optimal_price,
+                'revenue_per_respondent': max_revenue,
+                'price_elasticity': elasticity if model == 'wtp_subscription' else np.nan
+            })
+    return rows
+
+_sweep_base_draws = None
+
+def _init_sweep_worker(base_draws: Dict[str, Dict[str, np.ndarray]]):
+    """Worker initializer: receive the shared base draws once per process"""
+    global _sweep_base_draws
+    _sweep_base_draws = base_draws
+
+def _sweep_task(item: Tuple[int, Dict[str, float]]) -> List[Dict]:
+    scenario, params = item
+    return [dict(scenario=scenario, **params, **row) for row in run_scenario(_sweep_base_draws, params)]
+
+def sweep_scenarios(ranges: Dict[str, Tuple[float, float]] = None, n_scenarios: int = 200,
+                    method: str = 'lhs', n_per_segment: int = 20_000, seed: int = DEFAULT_SEED,
+                    workers: int = 1) -> pd.DataFrame:
+    """Run a sensitivity sweep and return a tidy table
+
+    The table has one row per scenario x segment x pricing model, holding
+    the design parameters, the revenue-maximizing price, revenue per
+    respondent and the subscription price elasticity.
+    """
+    design = scenario_design(ranges or DEFAULT_SWEEP_RANGES, n_scenarios, method, seed)
+    rng = np.random.default_rng(seed)
+    base_draws = {segment: standard_draws(n_per_segment, rng) for segment in PERSONAS}
+    items = list(enumerate(design.to_dict('records')))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                                 initargs=(base_draws,)) as pool:
+            chunks = list(pool.map(_sweep_task, items, chunksize=max(1, len(items) // (workers * 4))))
+    else:
+        chunks = [
+            [dict(scenario=scenario, **params, **row) for row in run_scenario(base_draws, params)]
+            for scenario, params in items
+        ]
+
+    return pd.DataFrame([row for chunk in chunks for row in chunk])
+
+# ==================== PERSONA CALIBRATION ====================
+
+# Fitted parameters per segment, in PERSONAS order. Score spreads and clip
+# ranges stay fixed at SCORE_SPREAD; income std is fitted.
+CALIBRATION_PARAMS = ['income_mean', 'income_std', 'time_scarcity', 'fashion_interest', 'price_sensitivity']
+
+MAX_AGE = 120
+
+# Share of a segment's weight allowed below/above its fitted age range
+AGE_RANGE_TAIL = 0.001
+
+# Likelihood of an age outside a segment's range in the mixture E-step, so
+# ranges can still grow between iterations
+AGE_OUTSIDE_RANGE = 1e-6
+
+def persona_arrays(personas: Dict[str, PersonaConfig], distribution: Dict[str, float]) -> Dict[str, np.ndarray]:
+    """Per-segment parameter arrays (PERSONAS order) for the calibration passes"""
+    configs = [personas[segment] for segment in PERSONAS]
+    params = {name: np.array([getattr(c, name) for c in configs], dtype=np.float64) for name in CALIBRATION_PARAMS}
+    params['age_low'] = np.array([c.age_range[0] for c in configs], dtype=np.float64)
+    params['age_high'] = np.array([c.age_range[1] for c in configs], dtype=np.float64)
+    params['weight'] = np.array([distribution[segment] for segment in PERSONAS], dtype=np.float64)
+    return params
+
+def _censored_normal(x: np.ndarray, mean: np.ndarray, std: np.ndarray, low: float, high: float):
+    """Log-likelihood and latent E[x], E[x^2] of clip(N(mean, std), low, high) observations
+
+    x has one entry per respondent and mean/std one per segment; results are
+    (respondents x segments). Values at a clip bound are censored, so their
+    likelihood is the tail mass and their moments are truncated-normal ones.
+    """
+    at_low = x <= low + 1e-6 * max(1.0, abs(low))
+    at_high = x >= high - 1e-6 * max(1.0, abs(high))
+    with np.errstate(all='ignore'):
+        alpha, beta = (low - mean) / std, (high - mean) / std
+        log_below, log_above = stats.norm.logcdf(alpha), stats.norm.logsf(beta)
+        lam_low = np.exp(stats.norm.logpdf(alpha) - log_below)
+        lam_high = np.exp(stats.norm.logpdf(beta) - log_above)
+
+    z = (x[:, None] - mean) / std
+    loglik = -0.5 * z * z - np.log(std * np.sqrt(2 * np.pi))
+    ex = np.repeat(x[:, None], len(mean), axis=1)
+    ex2 = ex * ex
+    for rows, log_tail, tail_mean, tail_var in [
+        (at_low, log_below, mean - std * lam_low, std ** 2 * (1 - alpha * lam_low - lam_low ** 2)),
+        (at_high, log_above, mean + std * lam_high, std ** 2 * (1 + beta * lam_high - lam_high ** 2))
+    ]:
+        if rows.any():
+            loglik[rows] = log_tail
+            ex[rows] = tail_mean
+            ex2[rows] = tail_var + tail_mean ** 2
+    return loglik, ex, ex2
+
+def _attribute_models(params: Dict[str, np.ndarray]) -> Dict[str, Tuple[np.ndarray, np.ndarray, float, float]]:
+    """(mean, std, low, high) of the censored normal behind each attribute"""
+    models = {'income': (params['income_mean'], params['income_std'], INCOME_FLOOR, np.inf)}
+    for name, (std, low, high) in SCORE_SPREAD.items():
+        models[name] = (params[name], np.full_like(params[name], std), low, high)
+    return models
+
+def _read_calibration_chunk(source: Tuple) -> Dict[str, np.ndarray]:
+    """Columns of one chunk: ('npz', path) or ('npy', store_dir, start, stop)"""
+    if source[0] == 'npz':
+        with np.load(source[1]) as data:
+            return {name: data[name] for name in data.files}
+    _, store_dir, start, stop = source
+    df = load_respondents(store_dir, 'npy', mmap=True).iloc[start:stop]
+    columns = {name: df[name].to_numpy(dtype=np.float64) for name in ['age', 'income'] + list(SCORE_SPREAD)}
+    if 'segment' in df:
+        columns['segment'] = segment_codes(df)
+    return _usable_rows(columns)
+
+def _usable_rows(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Drop rows with a non-finite attribute or an unknown segment (code -1)"""
+    keep = np.isfinite(np.column_stack([values for name, values in columns.items() if name != 'segment'])).all(axis=1)
+    if 'segment' in columns:
+        keep &= columns['segment'] >= 0
+    return {name: values[keep] for name, values in columns.items()}
+
+def calibration_stats(columns: Dict[str, np.ndarray], params: Dict[str, np.ndarray],
+                      labeled: bool) -> Dict[str, np.ndarray]:
+    """E-step on one chunk: responsibility-weighted sufficient statistics and log-likelihood
+
+    Every statistic is a sum over respondents, so chunks (and workers) merge
+    by adding them.
+    """
+    n_groups = len(params['weight'])
+    age = np.clip(columns['age'], 0, MAX_AGE).astype(np.intp)
+    in_range = (age[:, None] >= params['age_low']) & (age[:, None] <= params['age_high'])
+    log_joint = np.log(params['weight']) + np.where(
+        in_range, -np.log(params['age_high'] - params['age_low'] + 1), np.log(AGE_OUTSIDE_RANGE)
+    )
+
+    moments = {}
+    for name, (mean, std, low, high) in _attribute_models(params).items():
+        loglik, ex, ex2 = _censored_normal(columns[name].astype(np.float64), mean, std, low, high)
+        log_joint += loglik
+        moments[name] = (ex, ex2)
+
+    if labeled:
+        codes = columns['segment']
+        resp = np.zeros_like(log_joint)
+        resp[np.arange(len(codes)), codes] = 1.0
+        loglik = float(log_joint[np.arange(len(codes)), codes].sum())
+    else:
+        top = log_joint.max(axis=1, keepdims=True)
+        log_total = top + np.log(np.exp(log_joint - top).sum(axis=1, keepdims=True))
+        resp = np.exp(log_joint - log_total)
+        loglik = float(log_total.sum())
+
+    out = {
+        'rows': len(age),
+        'loglik': loglik,
+        'weight': resp.sum(axis=0),
+        'age_hist': np.stack([np.bincount(age, weights=resp[:, g], minlength=MAX_AGE + 1) for g in range(n_groups)])
+    }
+    for name, (ex, ex2) in moments.items():
+        out[f'{name}_sum'] = (resp * ex).sum(axis=0)
+        out[f'{name}_sumsq'] = (resp * ex2).sum(axis=0)
+    return out
+
+def _calibration_task(task: Tuple[Tuple, Dict[str, np.ndarray], bool]) -> Dict[str, np.ndarray]:
+    source, params, labeled = task
+    return calibration_stats(_read_calibration_chunk(source), params, labeled)
+
+def _maximize(totals: Dict[str, np.ndarray], params: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """M-step: parameters from merged sufficient statistics"""
+    weight = np.maximum(totals['weight'], 1e-12)
+    new = dict(params)
+    new['weight'] = weight / weight.sum()
+    new['income_mean'] = totals['income_sum'] / weight
+    new['income_std'] = np.sqrt(np.maximum(totals['income_sumsq'] / weight - new['income_mean'] ** 2, 1.0))
+    for name in SCORE_SPREAD:
+        new[name] = totals[f'{name}_sum'] / weight
+
+    share = np.cumsum(totals['age_hist'], axis=1) / weight[:, None]
+    new['age_low'] = np.argmax(share > AGE_RANGE_TAIL, axis=1).astype(np.float64)
+    new['age_high'] = np.argmax(share >= 1 - AGE_RANGE_TAIL, axis=1).astype(np.float64)
+    return new
+
+def _check_support(totals: Dict[str, np.ndarray], path: str):
+    """Refuse to fit when there are no usable rows or a segment has less than one respondent's weight"""
+    if totals is None or totals['rows'] == 0:
+        raise ValueError(f"No usable respondent rows in {path}")
+    empty = [segment for segment, weight in zip(PERSONAS, totals['weight']) if weight < 1]
+    if empty:
+        raise ValueError(f"No observed support for segments {empty} in {path}")
+
+def calibration_sources(path: str, chunk_size: int = 1_000_000, work_dir: str = None) -> Tuple[List[Tuple], bool]:
+    """Chunk sources for an observed file, and whether it carries segment labels
+
+    An output directory holding an npy respondent store (see
+    save_respondents) is split into row ranges that workers memory-map. A CSV is read once in chunks and each chunk is
+    cached as an .npz under work_dir (default a new temporary directory,
+    which the caller removes), so later EM passes never re-parse text. Rows with a non-finite attribute or an
+    unknown segment are dropped from either source.
+    """
+    if os.path.isdir(path):
+        df = load_respondents(path, 'npy', mmap=True)
+        sources = [('npy', path, start, min(start + chunk_size, len(df))) for start in range(0, len(df), chunk_size)]
+        return sources, 'segment' in df
+
+    work_dir = work_dir or tempfile.mkdtemp(prefix='calibration_chunks.')
+    os.makedirs(work_dir, exist_ok=True)
+    sources, labeled = [], False
+    for i, chunk in enumerate(pd.read_csv(path, chunksize=chunk_size)):
+        columns = {name: chunk[name].to_numpy(dtype=np.float64) for name in ['age', 'income'] + list(SCORE_SPREAD)}
+        labeled = 'segment' in chunk
+        if labeled:
+            columns['segment'] = segment_codes(chunk)
+        chunk_path = os.path.join(work_dir, f'chunk_{i:05d}.npz')
+        np.savez(chunk_path, **_usable_rows(columns))
+        sources.append(('npz', chunk_path))
+    return sources, labeled
+
+def calibrate_personas(path: str, personas: Dict[str, PersonaConfig] = None,
+                       distribution: Dict[str, float] = None, labeled: bool = None,
+                       chunk_size: int = 1_000_000, max_iter: int = 200, tol: float = 1e-8,
+                       workers: int = 1) -> Dict:
+    """Fit PersonaConfig parameters and segment weights to an observed respondent file
+
+    Maximum likelihood under the generator's own model: uniform integer age
+    ranges, income as N(income_mean, income_std) floored at INCOME_FLOOR,
+    and scores as normals with SCORE_SPREAD spreads clipped to their ranges.
+    Clipped values are treated as censored. With segment labels the E-step
+    is exact; without them it is a mixture EM over the segments, started
+    from the current personas so each component keeps its segment identity.
+    Each pass maps calibration_stats over the chunks (on a process pool when
+    workers > 1) and sums the results.
+    """
+    personas = personas or PERSONAS
+    params = persona_arrays(personas, distribution or SEGMENT_DISTRIBUTION)
+    # CSV chunks spill to the temp dir, never next to the (possibly read-only) input
+    work_dir = None if os.path.isdir(path) else tempfile.mkdtemp(prefix='calibration_chunks.')
+
+    pool = None
+    previous, converged = -np.inf, False
+    try:
+        sources, has_labels = calibration_sources(path, chunk_size, work_dir)
+        labeled = has_labels if labeled is None else labeled
+        if labeled and not has_labels:
+            raise ValueError("Observed data has no segment column")
+
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        for iteration in range(1, max_iter + 1):
+            tasks = [(source, params, labeled) for source in sources]
+            results = pool.map(_calibration_task, tasks) if pool else map(_calibration_task, tasks)
+            totals = None
+            for result in results:
+                totals = result if totals is None else {key: totals[key] + value for key, value in result.items()}
+            _check_support(totals, path)
+            params = _maximize(totals, params)
+            if abs(totals['loglik'] - previous) <= tol * abs(totals['loglik']):
+                converged = True
+                break
+            previous = totals['loglik']
+    finally:
+        if pool:
+            pool.shutdown()
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    fitted = {}
+    for g, segment in enumerate(PERSONAS):
+        fitted[segment] = replace(
+            personas[segment],
+            age_range=(int(params['age_low'][g]), int(params['age_high'][g])),
+            income_mean=int(round(params['income_mean'][g])),
+            income_std=int(round(params['income_std'][g])),
+            **{name: round(float(params[name][g]), 3) for name in SCORE_SPREAD}
+        )
+    return {
+        'personas': fitted,
+        'segment_distribution': {segment: float(w) for segment, w in zip(PERSONAS, params['weight'])},
+        'loglik': totals['loglik'],
+        'n_rows': int(totals['rows']),
+        'n_iter': iteration,
+        'converged': converged
+    }
+
+def save_calibration(calibration: Dict, path: str) -> str:
+    """Write fitted personas and weights as JSON (PersonaConfig fields as-is)"""
+    with open(path, 'w') as f:
+        json.dump({
+            'personas': {segment: asdict(config) for segment, config in calibration['personas'].items()},
+            'segment_distribution': calibration['segment_distribution']
+        }, f, indent=2)
+    return path
+
+def load_calibration(path: str) -> Tuple[Dict[str, PersonaConfig], Dict[str, float]]:
+    """Read personas and weights written by save_calibration"""
+    with open(path) as f:
+        data = json.load(f)
+    personas = {
+        segment: PersonaConfig(**dict(fields, age_range=tuple(fields['age_range'])))
+        for segment, fields in data['personas'].items()
+    }
+    return personas, data['segment_distribution']
+
 # ==================== FEATURE PRIORITIZATION ====================
 
 FEATURES = [
@@ -210,6 +1820,148 @@ def score_features(segment: str) -> Dict[str, float]:
 
     return scores[segment]
 
+# Utility points each feature gains per point of fashion_interest and
+# time_scarcity above the respondent's segment average
+FEATURE_LOADINGS = {
+    'upload_photo_body_scan': (0.2, 0.0),
+    'combine_full_outfits': (0.0, 0.3),
+    'direct_store_links': (0.1, 0.3),
+    'save_share_looks': (0.5, -0.1),
+    'outfit_dupes_finder': (0.4, 0.0),
+    'occasion_packs': (0.1, 0.4),
+    'confidence_mode': (-0.5, 0.2),
+    'creator_sets_marketplace': (0.4, 0.0)
+}
+
+# Std of each respondent's idiosyncratic (normal) taste per feature, in
+# utility points. Choice noise is separate: simulate_maxdiff adds Gumbel errors.
+FEATURE_UTILITY_NOISE = 1.0
+
+def feature_utilities(df: pd.DataFrame, rng: np.random.Generator = None) -> np.ndarray:
+    """(n, len(FEATURES)) float32 utilities around each respondent's segment scores
+
+    Respondents more fashion-interested or time-scarce than their segment
+    average shift along FEATURE_LOADINGS, so utilities correlate with those
+    attributes; the rest is independent normal taste noise (not Gumbel: the
+    logit choice error is drawn per task in simulate_maxdiff).
+    """
+    rng = _rng(rng)
+    groups = segment_codes(df)
+    base = np.array([[score_features(segment)[f] for f in FEATURES] for segment in PERSONAS], dtype=np.float32)
+    loadings = np.array([FEATURE_LOADINGS[f] for f in FEATURES], dtype=np.float32).T
+    centres = np.array([[PERSONAS[s].fashion_interest, PERSONAS[s].time_scarcity] for s in PERSONAS], dtype=np.float32)
+
+    attributes = np.column_stack([df['fashion_interest'].to_numpy(), df['time_scarcity'].to_numpy()]).astype(np.float32)
+    utilities = base[groups] + (attributes - centres[groups]) @ loadings
+    utilities += FEATURE_UTILITY_NOISE * rng.standard_normal(utilities.shape, dtype=np.float32)
+    return utilities
+
+def feature_ranks(utilities: np.ndarray) -> np.ndarray:
+    """0-based rank of every feature per respondent (0 = most preferred), without sorting
+
+    A feature's rank is how many features beat it; ties go to the lower index.
+    """
+    beats = utilities[:, None, :] > utilities[:, :, None]
+    n_features = utilities.shape[1]
+    # ties[r, i, j]: feature j ties feature i and has the lower index, so it counts as beating i
+    ties = (utilities[:, None, :] == utilities[:, :, None]) & np.tri(n_features, k=-1, dtype=bool)[None]
+    return (beats | ties).sum(axis=2).astype(np.int8)
+
+def top_k_features(utilities: np.ndarray, k: int = 5) -> np.ndarray:
+    """(n, k) indices of each respondent's k highest-utility features, in no particular order"""
+    return np.argpartition(-utilities, k - 1, axis=1)[:, :k]
+
+def simulate_maxdiff(utilities: np.ndarray, n_tasks: int = 6, items_per_task: int = 4,
+                     rng: np.random.Generator = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Best-worst choices for every respondent and task under a logit model
+
+    Each task shows a random subset of items_per_task features. The best
+    pick maximizes utility plus Gumbel noise and the worst pick minimizes it
+    among the remaining items (sequential best-worst logit). Returns the
+    shown feature indices (n, n_tasks, items_per_task) and the best and
+    worst feature indices (n, n_tasks).
+    """
+    rng = _rng(rng)
+    n, n_features = utilities.shape
+    subsets = np.array(list(itertools.combinations(range(n_features), items_per_task)), dtype=np.intp)
+    shown = subsets[rng.integers(0, len(subsets), size=(n, n_tasks))]
+    shown_utility = np.take_along_axis(utilities[:, None, :], shown, axis=2)
+
+    def gumbel() -> np.ndarray:
+        u = np.maximum(rng.random(shown.shape, dtype=np.float32), np.finfo(np.float32).tiny)
+        return -np.log(-np.log(u))
+
+    best = np.argmax(shown_utility + gumbel(), axis=2)
+    worst_score = gumbel() - shown_utility
+    np.put_along_axis(worst_score, best[:, :, None], -np.inf, axis=2)
+    worst = np.argmax(worst_score, axis=2)
+
+    pick = lambda position: np.take_along_axis(shown, position[:, :, None], axis=2)[:, :, 0]
+    return shown, pick(best), pick(worst)
+
+def feature_preferences(df: pd.DataFrame, k: int = 5, n_tasks: int = 6, items_per_task: int = 4,
+                        chunk_size: int = 1_000_000, rng: np.random.Generator = None) -> Dict[str, Dict]:
+    """Simulated feature preference summary per segment
+
+    For each feature: mean utility, share of respondents with it in their
+    top k, mean rank (1 = best), the distribution over ranks, and the
+    MaxDiff best-minus-worst score (best picks minus worst picks over times
+    shown). Respondents are processed in chunks and only per-segment counts
+    are kept, so memory does not grow with the population.
+    """
+    rng = _rng(rng)
+    n_groups, n_features = len(PERSONAS), len(FEATURES)
+    counts = np.zeros(n_groups)
+    utility_sum = np.zeros((n_groups, n_features))
+    top_k = np.zeros((n_groups, n_features))
+    rank_counts = np.zeros((n_groups, n_features, n_features))
+    shown_counts = np.zeros((n_groups, n_features))
+    best_counts = np.zeros((n_groups, n_features))
+    worst_counts = np.zeros((n_groups, n_features))
+
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        groups = segment_codes(chunk)
+        utilities = feature_utilities(chunk, rng)
+
+        def tally(features: np.ndarray, size: int) -> np.ndarray:
+            keys = (groups[:, None] * size + features.reshape(len(groups), -1)).ravel()
+            return np.bincount(keys, minlength=n_groups * size)
+
+        counts += np.bincount(groups, minlength=n_groups)
+        for j in range(n_features):
+            utility_sum[:, j] += np.bincount(groups, weights=utilities[:, j], minlength=n_groups)
+        top_k += tally(top_k_features(utilities, k), n_features).reshape(n_groups, n_features)
+        ranks = feature_ranks(utilities).astype(np.intp) + np.arange(n_features) * n_features
+        rank_counts += tally(ranks, n_features ** 2).reshape(n_groups, n_features, n_features)
+
+        if not n_tasks:
+            continue
+        shown, best, worst = simulate_maxdiff(utilities, n_tasks, items_per_task, rng)
+        shown_counts += tally(shown, n_features).reshape(n_groups, n_features)
+        best_counts += tally(best, n_features).reshape(n_groups, n_features)
+        worst_counts += tally(worst, n_features).reshape(n_groups, n_features)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        per_respondent = 1 / counts[:, None]
+        rank_share = rank_counts * per_respondent[:, :, None]
+        maxdiff = (best_counts - worst_counts) / shown_counts
+
+    results = {}
+    for g, segment in enumerate(PERSONAS):
+        results[segment] = {
+            feature: {
+                'mean_utility': float(utility_sum[g, j] * per_respondent[g, 0]),
+                'top_k_share': float(top_k[g, j] * per_respondent[g, 0]),
+                'mean_rank': float(rank_share[g, j] @ np.arange(1, n_features + 1)),
+                'rank_distribution': rank_share[g, j].tolist(),
+                'maxdiff_score': float(maxdiff[g, j])
+            }
+            for j, feature in enumerate(FEATURES)
+        }
+    return results
+
+
 # ==================== JTBD FORCES DIAGRAM ====================
 
 JTBD_FORCES = {
@@ -238,111 +1990,555 @@ JTBD_FORCES = {
 
 # ==================== ACQUISITION FUNNEL ====================
 
-def model_acquisition_funnel(segment: str, channel: str) -> Dict:
-    """Model 4-week funnel with confidence intervals via bootstrapping"""
-
-    # Base metrics by segment x channel
-    funnel_params = {
-        ('busy_professional', 'LinkedIn'): {
-            'impressions': 100000,
-            'ctr': (0.025, 0.005),  # (mean, std)
-            'cvr_signup': (0.12, 0.02),
-            'try_first_look': (0.65, 0.08),
-            'share_rate': (0.15, 0.05),
-            'day7_retention': (0.45, 0.08),
-            'cac_range': (25, 45)
-        },
-        ('busy_professional', 'TikTok'): {
-            'impressions': 80000,
-            'ctr': (0.015, 0.004),
-            'cvr_signup': (0.08, 0.015),
-            'try_first_look': (0.55, 0.08),
-            'share_rate': (0.25, 0.06),
-            'day7_retention': (0.35, 0.07),
-            'cac_range': (35, 60)
-        },
-        ('genz_social', 'TikTok'): {
-            'impressions': 250000,
-            'ctr': (0.045, 0.008),
-            'cvr_signup': (0.18, 0.03),
-            'try_first_look': (0.75, 0.06),
-            'share_rate': (0.55, 0.08),
-            'day7_retention': (0.50, 0.09),
-            'cac_range': (8, 18)
-        },
-        ('genz_social', 'LinkedIn'): {
-            'impressions': 30000,
-            'ctr': (0.008, 0.003),
-            'cvr_signup': (0.05, 0.012),
-            'try_first_look': (0.50, 0.10),
-            'share_rate': (0.30, 0.08),
-            'day7_retention': (0.25, 0.08),
-            'cac_range': (45, 80)
-        },
-        ('fashion_anxious_men', 'LinkedIn'): {
-            'impressions': 75000,
-            'ctr': (0.020, 0.005),
-            'cvr_signup': (0.15, 0.025),
-            'try_first_look': (0.70, 0.07),
-            'share_rate': (0.10, 0.04),
-            'day7_retention': (0.55, 0.08),
-            'cac_range': (18, 35)
-        },
-        ('fashion_anxious_men', 'TikTok'): {
-            'impressions': 120000,
-            'ctr': (0.028, 0.006),
-            'cvr_signup': (0.10, 0.02),
-            'try_first_look': (0.65, 0.08),
-            'share_rate': (0.20, 0.06),
-            'day7_retention': (0.48, 0.08),
-            'cac_range': (22, 40)
-        }
+FUNNEL_CHANNELS = ['TikTok', 'LinkedIn']
+
+# Base metrics by segment x channel
+FUNNEL_PARAMS = {
+    ('busy_professional', 'LinkedIn'): {
+        'impressions': 100000,
+        'ctr': (0.025, 0.005),  # (mean, std)
+        'cvr_signup': (0.12, 0.02),
+        'try_first_look': (0.65, 0.08),
+        'share_rate': (0.15, 0.05),
+        'day7_retention': (0.45, 0.08),
+        'cac_range': (25, 45)
+    },
+    ('busy_professional', 'TikTok'): {
+        'impressions': 80000,
+        'ctr': (0.015, 0.004),
+        'cvr_signup': (0.08, 0.015),
+        'try_first_look': (0.55, 0.08),
+        'share_rate': (0.25, 0.06),
+        'day7_retention': (0.35, 0.07),
+        'cac_range': (35, 60)
+    },
+    ('genz_social', 'TikTok'): {
+        'impressions': 250000,
+        'ctr': (0.045, 0.008),
+        'cvr_signup': (0.18, 0.03),
+        'try_first_look': (0.75, 0.06),
+        'share_rate': (0.55, 0.08),
+        'day7_retention': (0.50, 0.09),
+        'cac_range': (8, 18)
+    },
+    ('genz_social', 'LinkedIn'): {
+        'impressions': 30000,
+        'ctr': (0.008, 0.003),
+        'cvr_signup': (0.05, 0.012),
+        'try_first_look': (0.50, 0.10),
+        'share_rate': (0.30, 0.08),
+        'day7_retention': (0.25, 0.08),
+        'cac_range': (45, 80)
+    },
+    ('fashion_anxious_men', 'LinkedIn'): {
+        'impressions': 75000,
+        'ctr': (0.020, 0.005),
+        'cvr_signup': (0.15, 0.025),
+        'try_first_look': (0.70, 0.07),
+        'share_rate': (0.10, 0.04),
+        'day7_retention': (0.55, 0.08),
+        'cac_range': (18, 35)
+    },
+    ('fashion_anxious_men', 'TikTok'): {
+        'impressions': 120000,
+        'ctr': (0.028, 0.006),
+        'cvr_signup': (0.10, 0.02),
+        'try_first_look': (0.65, 0.08),
+        'share_rate': (0.20, 0.06),
+        'day7_retention': (0.48, 0.08),
+        'cac_range': (22, 40)
     }
+}
 
-    params = funnel_params.get((segment, channel), funnel_params[('busy_professional', 'LinkedIn')])
+# Pairs without their own parameters fall back to this one
+DEFAULT_FUNNEL_PAIR = ('busy_professional', 'LinkedIn')
 
-    # Bootstrap for confidence intervals
-    n_bootstrap = 1000
-    impressions = params['impressions']
+FUNNEL_RATES = ['ctr', 'cvr_signup', 'try_first_look', 'share_rate', 'day7_retention']
 
-    results = {
-        'segment': segment,
-        'channel': channel,
-        'impressions': impressions
+def _interval_summary(samples: np.ndarray) -> Dict[str, np.ndarray]:
+    """Mean, 95% percentile interval and std along the replicate axis"""
+    return {
+        'mean': samples.mean(axis=0),
+        'ci_lower': np.percentile(samples, 2.5, axis=0),
+        'ci_upper': np.percentile(samples, 97.5, axis=0),
+        'std': samples.std(axis=0)
     }
 
-    # Simulate funnel
-    for metric in ['ctr', 'cvr_signup', 'try_first_look', 'share_rate', 'day7_retention']:
-        mean, std = params[metric]
-        samples = np.random.normal(mean, std, n_bootstrap)
-        samples = np.clip(samples, 0, 1)
-
-        results[metric] = {
-            'mean': float(np.mean(samples)),
-            'ci_lower': float(np.percentile(samples, 2.5)),
-            'ci_upper': float(np.percentile(samples, 97.5)),
-            'std': float(np.std(samples))
+def simulate_funnels(pairs: List[Tuple[str, str]] = None, n_replicates: int = 1000,
+                     rng: np.random.Generator = None, impressions: List[int] = None,
+                     sampler: str = 'random') -> List[Dict]:
+    """Monte Carlo 4-week funnels for many segment x channel pairs at once
+
+    Every replicate draws the stage rates and then binomial counts down the
+    funnel (impressions -> clicks -> signups -> tried -> shared, and
+    signups -> day-7 retained), so rate uncertainty and sampling noise both
+    reach the absolute numbers. All pairs and replicates are one
+    (n_replicates, n_pairs) array computation; binomial draws take the
+    impression budget directly, with no per-impression work.
+
+    CAC assumes a fixed spend per pair: the midpoint of cac_range times the
+    expected signups at mean rates. Its interval therefore reflects how many
+    signups that spend actually buys. `impressions` overrides each pair's
+    impression budget, and the spend scales with it. With a sampler other
+    than 'random', every replicate is one point of a (n_replicates,
+    10 x pairs) set: rates use the inverse normal CDF and counts the inverse
+    binomial CDF.
+    """
+    rng = _rng(rng)
+    pairs = pairs or [(segment, channel) for segment in PERSONAS for channel in FUNNEL_CHANNELS]
+    params = [FUNNEL_PARAMS.get(pair, FUNNEL_PARAMS[DEFAULT_FUNNEL_PAIR]) for pair in pairs]
+    shape = (n_replicates, len(pairs))
+
+    if impressions is None:
+        impressions = [p['impressions'] for p in params]
+    impressions = np.array(impressions, dtype=np.int64)
+    if sampler == 'random':
+        def normal(j, mean, std):
+            return rng.normal(mean, std, shape)
+
+        def binomial(j, trials, p):
+            return rng.binomial(trials, p)
+    else:
+        u = uniform_draws(n_replicates, 2 * len(FUNNEL_RATES) * len(pairs), rng, sampler)
+        u = u.reshape(n_replicates, 2 * len(FUNNEL_RATES), len(pairs))
+
+        def normal(j, mean, std):
+            return mean + std * special.ndtri(u[:, j])
+
+        def binomial(j, trials, p):
+            return stats.binom.ppf(u[:, len(FUNNEL_RATES) + j], trials, p).astype(np.int64)
+
+    rates = {}
+    for j, metric in enumerate(FUNNEL_RATES):
+        mean = np.array([p[metric][0] for p in params])
+        std = np.array([p[metric][1] for p in params])
+        rates[metric] = np.clip(normal(j, mean, std), 0, 1)
+
+    counts = {}
+    counts['clicks'] = binomial(0, impressions, rates['ctr'])
+    counts['signups'] = binomial(1, counts['clicks'], rates['cvr_signup'])
+    counts['tried_first_look'] = binomial(2, counts['signups'], rates['try_first_look'])
+    counts['shared'] = binomial(3, counts['tried_first_look'], rates['share_rate'])
+    counts['day7_retained'] = binomial(4, counts['signups'], rates['day7_retention'])
+
+    expected_signups = impressions * np.array([p['ctr'][0] * p['cvr_signup'][0] for p in params])
+    spend = np.array([sum(p['cac_range']) / 2 for p in params]) * expected_signups
+    cac = spend / np.maximum(counts['signups'], 1)
+
+    rate_stats = {metric: _interval_summary(samples) for metric, samples in rates.items()}
+    count_stats = {stage: _interval_summary(samples) for stage, samples in counts.items()}
+    cac_stats = _interval_summary(cac)
+
+    results = []
+    for i, (segment, channel) in enumerate(pairs):
+        result = {
+            'segment': segment,
+            'channel': channel,
+            'impressions': int(impressions[i])
         }
+        for metric in FUNNEL_RATES:
+            result[metric] = {key: float(value[i]) for key, value in rate_stats[metric].items()}
 
-    # Calculate absolute numbers
-    clicks = impressions * results['ctr']['mean']
-    signups = clicks * results['cvr_signup']['mean']
-    tried = signups * results['try_first_look']['mean']
-    shared = tried * results['share_rate']['mean']
-    retained = signups * results['day7_retention']['mean']
-
-    results['absolute_numbers'] = {
-        'clicks': int(clicks),
-        'signups': int(signups),
-        'tried_first_look': int(tried),
-        'shared': int(shared),
-        'day7_retained': int(retained)
-    }
+        result['absolute_numbers'] = {stage: int(count_stats[stage]['mean'][i]) for stage in counts}
+        result['absolute_numbers_ci'] = {
+            stage: [float(count_stats[stage]['ci_lower'][i]), float(count_stats[stage]['ci_upper'][i])]
+            for stage in counts
+        }
+        result['cac'] = {key: float(value[i]) for key, value in cac_stats.items()}
+        result['cac_range'] = params[i]['cac_range']
+        results.append(result)
+
+    return results
+
+def model_acquisition_funnel(segment: str, channel: str, rng: np.random.Generator = None,
+                             n_replicates: int = 1000, sampler: str = 'random') -> Dict:
+    """Model 4-week funnel with Monte Carlo confidence intervals"""
+    return simulate_funnels([(segment, channel)], n_replicates, rng=rng, sampler=sampler)[0]
+
+# ==================== VIRAL DIFFUSION ====================
+
+# Audience size (followers who see a user's shares) per segment x platform:
+# lognormal (mean, sigma). The heavy right tail is the creators that carry
+# cascades.
+VIRAL_AUDIENCE = {
+    ('busy_professional', 'LinkedIn'): (30, 0.8),
+    ('busy_professional', 'TikTok'): (12, 1.0),
+    ('genz_social', 'TikTok'): (40, 1.2),
+    ('genz_social', 'LinkedIn'): (8, 0.8),
+    ('fashion_anxious_men', 'LinkedIn'): (20, 0.8),
+    ('fashion_anxious_men', 'TikTok'): (15, 1.0)
+}
+
+# Share of each audience drawn from the sharer's own segment; the rest is uniform
+VIRAL_HOMOPHILY = 0.6
+
+# A look shared by someone you follow converts this many times better than a paid impression
+SHARE_EXPOSURE_LIFT = 3.0
 
-    results['cac_range'] = params['cac_range']
+VIRAL_GRAPH_NODES = 1_000_000
+VIRAL_MAX_GENERATIONS = 20
 
+# Upper bound on edges drawn per block while building a graph
+GRAPH_CHUNK_EDGES = 2 ** 24
+
+@dataclass
+class SocialGraph:
+    """Follower graph of one platform as a sparse sharer -> audience adjacency
+
+    Nodes are grouped by segment (node_offsets), like the respondent frame.
+    Row i of `audience` lists the nodes that see node i's shares, with int32
+    indices and bool data: about five bytes per edge.
+    """
+    platform: str
+    audience: object
+    node_offsets: np.ndarray
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.node_offsets[-1])
+
+    def node_segments(self) -> np.ndarray:
+        """Segment code per node"""
+        return np.repeat(np.arange(len(PERSONAS), dtype=np.uint8), np.diff(self.node_offsets))
+
+def build_social_graph(platform: str, n_nodes: int = VIRAL_GRAPH_NODES, rng: np.random.Generator = None,
+                       chunk_edges: int = GRAPH_CHUNK_EDGES) -> SocialGraph:
+    """Synthetic follower graph with per-segment audience size distributions
+
+    Audience sizes come from VIRAL_AUDIENCE and audience members are drawn
+    with VIRAL_HOMOPHILY. The CSR arrays are written directly in node order
+    and in blocks of chunk_edges, so nothing is sorted and temporaries stay
+    bounded at 10M+ nodes.
+    """
+    rng = _rng(rng)
+    sizes = np.array(list(segment_sizes(n_nodes).values()))
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    n_nodes = int(offsets[-1])
+
+    degree = np.empty(n_nodes, dtype=np.int64)
+    for g, segment in enumerate(PERSONAS):
+        mean, sigma = VIRAL_AUDIENCE.get((segment, platform), VIRAL_AUDIENCE[DEFAULT_FUNNEL_PAIR])
+        draws = rng.lognormal(np.log(mean) - sigma ** 2 / 2, sigma, sizes[g])
+        degree[offsets[g]:offsets[g + 1]] = np.minimum(np.rint(draws), n_nodes - 1)
+
+    indptr = np.concatenate([[0], np.cumsum(degree)])
+    n_edges = int(indptr[-1])
+    index_dtype = np.int32 if max(n_edges, n_nodes) < 2 ** 31 else np.int64
+    indices = np.empty(n_edges, dtype=index_dtype)
+    segments = np.repeat(np.arange(len(PERSONAS), dtype=np.uint8), sizes)
+
+    # Blocks of whole rows holding roughly chunk_edges edges each
+    bounds = np.unique(np.searchsorted(indptr, np.arange(0, n_edges, chunk_edges), side='right') - 1)
+    for r0, r1 in zip(bounds, np.append(bounds[1:], n_nodes)):
+        e0, e1 = indptr[r0], indptr[r1]
+        sharer_segment = np.repeat(segments[r0:r1], degree[r0:r1])
+        members = rng.integers(0, n_nodes, e1 - e0)
+        same = rng.random(e1 - e0) < VIRAL_HOMOPHILY
+        local = offsets[sharer_segment[same]] + (rng.random(int(same.sum())) * sizes[sharer_segment[same]])
+        members[same] = local.astype(np.int64)
+        indices[e0:e1] = members
+
+    audience = sparse.csr_matrix((np.ones(n_edges, dtype=bool), indices, indptr.astype(index_dtype)),
+                                 shape=(n_nodes, n_nodes), copy=False)
+    return SocialGraph(platform, audience, offsets)
+
+def _viral_rates(platform: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per segment: signup probability per exposure, share probability of seeds and of organic signups"""
+    params = [FUNNEL_PARAMS.get((segment, platform), FUNNEL_PARAMS[DEFAULT_FUNNEL_PAIR]) for segment in PERSONAS]
+    convert = np.array([min(1.0, p['ctr'][0] * p['cvr_signup'][0] * SHARE_EXPOSURE_LIFT) for p in params])
+    share = np.array([p['share_rate'][0] for p in params])
+    spread = np.array([p['try_first_look'][0] for p in params]) * share
+    return convert, share, spread
+
+def simulate_diffusion(graph: SocialGraph, seeds: Dict[str, float], n_replicates: int = 200,
+                       max_generations: int = VIRAL_MAX_GENERATIONS,
+                       rng: np.random.Generator = None) -> Dict[str, np.ndarray]:
+    """Independent-cascade spread on a SocialGraph for many replicates at once
+
+    Each replicate seeds Poisson(seeds[segment]) random nodes of every segment
+    (the users who tried a first look). A seed shares with its segment's
+    share_rate. Every exposed node signs up with probability
+    1 - (1 - p) ** k after k exposures, where p is the paid click-to-signup
+    rate times SHARE_EXPOSURE_LIFT, and then shares with probability
+    try_first_look x share_rate. One generation for all replicates is a
+    single sparse product, frontier (replicates x nodes) @ audience.
+    Activated replicate * n + node codes are one bit each in a packed
+    bitmap, e.g. 125MB for 100 replicates of 10M nodes.
+
+    Returns per-replicate seed counts and organic signups by segment, plus
+    the generations each replicate ran.
+    """
+    rng = _rng(rng)
+    n, n_segments = graph.n_nodes, len(PERSONAS)
+    offsets = graph.node_offsets
+    node_segment = graph.node_segments()
+    convert, share, spread = _viral_rates(graph.platform)
+
+    seed_codes = []
+    for g, segment in enumerate(PERSONAS):
+        counts = np.minimum(rng.poisson(seeds.get(segment, 0.0), n_replicates), offsets[g + 1] - offsets[g])
+        replicate = np.repeat(np.arange(n_replicates, dtype=np.int64), counts)
+        seed_codes.append(replicate * n + rng.integers(offsets[g], offsets[g + 1], counts.sum()))
+    seeded = np.unique(np.concatenate(seed_codes))
+    activated = np.zeros((n_replicates * n + 7) // 8, dtype=np.uint8)
+    np.bitwise_or.at(activated, seeded >> 3, (1 << (seeded & 7)).astype(np.uint8))
+    seed_counts = np.stack([
+        np.bincount(seeded // n, weights=node_segment[seeded % n] == g, minlength=n_replicates)
+        for g in range(n_segments)
+    ], axis=1).astype(np.int64)
+    spreaders = seeded[rng.random(len(seeded)) < share[node_segment[seeded % n]]]
+
+    organic = np.zeros((n_replicates, n_segments), dtype=np.int64)
+    generations = np.zeros(n_replicates, dtype=np.int64)
+    for generation in range(max_generations):
+        if not len(spreaders):
+            break
+        generations[spreaders // n] = generation + 1
+        frontier = sparse.csr_matrix(
+            (np.ones(len(spreaders), dtype=np.float32), (spreaders // n, spreaders % n)), shape=(n_replicates, n)
+        )
+        exposed = (frontier @ graph.audience).tocoo()
+        codes = exposed.row.astype(np.int64) * n + exposed.col
+
+        fresh = (activated[codes >> 3] >> (codes & 7).astype(np.uint8)) & 1 == 0
+        codes, exposures = codes[fresh], exposed.data[fresh]
+        segment = node_segment[codes % n]
+        signed_up = rng.random(len(codes)) < 1 - (1 - convert[segment]) ** exposures
+
+        new, segment = codes[signed_up], segment[signed_up]
+        organic += np.bincount((new // n) * n_segments + segment,
+                               minlength=n_replicates * n_segments).reshape(n_replicates, n_segments)
+        np.bitwise_or.at(activated, new >> 3, (1 << (new & 7)).astype(np.uint8))
+        spreaders = new[rng.random(len(new)) < spread[segment]]
+
+    return {'seeds': seed_counts, 'organic': organic, 'generations': generations}
+
+def simulate_viral_funnels(funnel_results: List[Dict] = None, n_nodes: int = VIRAL_GRAPH_NODES,
+                           n_replicates: int = 200, rng: np.random.Generator = None) -> List[Dict]:
+    """Viral loop on top of the paid funnels, one synthetic graph per platform
+
+    Seeds are each pair's mean simulated tried_first_look users. Effective
+    CAC spreads the paid spend (mean CAC x mean signups) over paid plus
+    organic signups.
+    """
+    rng = _rng(rng)
+    funnel_results = funnel_results or simulate_funnels(rng=rng)
+    by_pair = {(result['segment'], result['channel']): result for result in funnel_results}
+
+    results = []
+    for platform in dict.fromkeys(channel for _, channel in by_pair):
+        pairs = {segment: by_pair[(segment, platform)] for segment in PERSONAS if (segment, platform) in by_pair}
+        graph = build_social_graph(platform, n_nodes, rng=rng)
+        spread = simulate_diffusion(
+            graph, {segment: result['absolute_numbers']['tried_first_look'] for segment, result in pairs.items()},
+            n_replicates, rng=rng
+        )
+
+        paid = np.array([pairs[s]['absolute_numbers']['signups'] if s in pairs else 0 for s in PERSONAS])
+        spend = np.array([pairs[s]['cac']['mean'] * pairs[s]['absolute_numbers']['signups'] if s in pairs else 0.0
+                          for s in PERSONAS])
+        seeds, organic = spread['seeds'].sum(axis=1), spread['organic']
+
+        def summary(samples):
+            return {key: float(value) for key, value in _interval_summary(samples).items()}
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            results.append({
+                'platform': platform,
+                'n_nodes': graph.n_nodes,
+                'n_edges': int(graph.audience.nnz),
+                'n_replicates': n_replicates,
+                'seeds': summary(seeds),
+                'organic_signups': summary(organic.sum(axis=1)),
+                'viral_k_factor': summary(organic.sum(axis=1) / np.maximum(seeds, 1)),
+                'generations': summary(spread['generations']),
+                'effective_cac': summary(spend.sum() / (paid.sum() + organic.sum(axis=1))),
+                'paid_cac': float(spend.sum() / max(paid.sum(), 1)),
+                'segments': {
+                    segment: {
+                        'organic_signups': summary(organic[:, g]),
+                        'effective_cac': (summary(spend[g] / (paid[g] + organic[:, g]))
+                                          if segment in pairs else None)
+                    }
+                    for g, segment in enumerate(PERSONAS)
+                }
+            })
+    return results
+
+# ==================== COHORT RETENTION & LTV ====================
+
+# Subscription churn follows a Weibull survival curve with shape < 1 (the
+# hazard falls with tenure). Day-7 retention from FUNNEL_PARAMS anchors the
+# first renewal: S(m) = r7 ** (m ** CHURN_SHAPE) for month m.
+CHURN_SHAPE = 0.5
+
+# Proportional-hazard multipliers per subscription tier (deeper plans churn less)
+TIER_CHURN = {'tier_1': 1.15, 'tier_2': 1.0, 'tier_3': 0.85}
+
+COHORT_MONTHS = 24
+COHORT_SIZE = 1_000_000
+GROSS_MARGIN = 0.8
+MONTHLY_DISCOUNT = 0.01
+
+def cohort_scenarios(pairs: List[Tuple[str, str]] = None, prices: Dict[str, float] = None) -> List[Dict]:
+    """One scenario per segment x channel x subscription tier at the given monthly prices"""
+    pairs = pairs or [(segment, channel) for segment in PERSONAS for channel in FUNNEL_CHANNELS]
+    prices = prices or RECOMMENDED_PRICES
+    return [
+        {'segment': segment, 'channel': channel, 'tier': tier, 'price': float(prices[tier])}
+        for segment, channel in pairs for tier in TIER_CHURN
+    ]
+
+def survival_curve(day7_retention, months: int = COHORT_MONTHS, churn_multiplier=1.0) -> np.ndarray:
+    """Share of a cohort still subscribed at the start of months 0..months (broadcasts over leading axes)"""
+    log_r7 = np.log(np.asarray(day7_retention, dtype=np.float64))[..., None]
+    tenure = np.arange(months + 1) ** CHURN_SHAPE
+    return np.exp(log_r7 * np.asarray(churn_multiplier, dtype=np.float64)[..., None] * tenure)
+
+def simulate_cohorts(scenarios: List[Dict] = None, n_subscribers: int = COHORT_SIZE,
+                     months: int = COHORT_MONTHS, n_replicates: int = 1000,
+                     rng: np.random.Generator = None) -> List[Dict]:
+    """Monte Carlo subscriber cohorts: retention, LTV, LTV:CAC and payback per scenario
+
+    Every replicate draws the segment x channel day-7 retention and CAC
+    (uniform over cac_range). Survivors then churn month by month as
+    binomial draws on the Weibull hazards, so each step is one
+    (n_replicates, n_scenarios) array operation whatever the cohort size.
+    LTV is the discounted gross margin per starting subscriber over
+    `months`, where each survivor pays at the start of a month. Payback is
+    the first month whose cumulative margin covers CAC; it is inf if that
+    never happens within the horizon.
+    """
+    rng = _rng(rng)
+    scenarios = scenarios or cohort_scenarios()
+    params = [FUNNEL_PARAMS.get((s['segment'], s['channel']), FUNNEL_PARAMS[DEFAULT_FUNNEL_PAIR]) for s in scenarios]
+    shape = (n_replicates, len(scenarios))
+
+    r7_mean = np.array([p['day7_retention'][0] for p in params])
+    r7_std = np.array([p['day7_retention'][1] for p in params])
+    r7 = np.clip(rng.normal(r7_mean, r7_std, shape), 0.01, 0.99)
+    cac_low, cac_high = np.array([p['cac_range'] for p in params], dtype=np.float64).T
+    cac = rng.uniform(cac_low, cac_high, shape)
+
+    survival = survival_curve(r7, months, np.array([TIER_CHURN[s['tier']] for s in scenarios]))
+    renewal = survival[..., 1:] / survival[..., :-1]
+    margin = np.array([s['price'] for s in scenarios]) * GROSS_MARGIN
+    discount = (1 + MONTHLY_DISCOUNT) ** -np.arange(months)
+
+    alive = np.full(shape, n_subscribers, dtype=np.int64)
+    value = np.zeros(shape)
+    payback = np.full(shape, np.inf)
+    retained = np.empty((months + 1,) + shape)
+    lifetime_share = np.zeros((len(scenarios), months + 1))
+    for m in range(months):
+        retained[m] = alive / n_subscribers
+        value += margin * discount[m] * retained[m]
+        payback[(value >= cac) & np.isinf(payback)] = m + 1
+        survivors = rng.binomial(alive, renewal[..., m])
+        lifetime_share[:, m + 1] = ((alive - survivors) / n_subscribers).mean(axis=0)
+        alive = survivors
+    retained[months] = alive / n_subscribers
+    lifetime_share[:, months] += retained[months].mean(axis=0)
+
+    # Per-subscriber LTV distribution: churning after k payments is worth the first k discounted margins
+    lifetime_value = margin[:, None] * np.concatenate([[0], np.cumsum(discount)])[None, :]
+    cum_share = np.cumsum(lifetime_share, axis=1)
+
+    ltv_stats = _interval_summary(value)
+    ratio_stats = _interval_summary(value / cac)
+    cac_stats = _interval_summary(cac)
+    checkpoints = [m for m in (1, 3, 6, 12, months) if m <= months]
+    retention_stats = {m: _interval_summary(retained[m]) for m in dict.fromkeys(checkpoints)}
+    payback_levels = np.percentile(payback, [2.5, 50, 97.5], axis=0, method='nearest')
+
+    def months_or_none(value):
+        return None if np.isinf(value) else float(value)
+
+    results = []
+    for i, scenario in enumerate(scenarios):
+        result = dict(scenario, n_subscribers=n_subscribers, months=months)
+        result['retention'] = {
+            f'month_{m}': {key: float(value[i]) for key, value in stats_row.items()}
+            for m, stats_row in retention_stats.items()
+        }
+        result['ltv'] = {key: float(value[i]) for key, value in ltv_stats.items()}
+        result['ltv_percentiles'] = {
+            f'p{q}': float(lifetime_value[i, np.searchsorted(cum_share[i], q / 100 - 1e-12)])
+            for q in (10, 50, 90)
+        }
+        result['cac'] = {key: float(value[i]) for key, value in cac_stats.items()}
+        result['ltv_cac'] = {key: float(value[i]) for key, value in ratio_stats.items()}
+        result['payback_months'] = {
+            key: months_or_none(level[i]) for key, level in zip(['ci_lower', 'median', 'ci_upper'], payback_levels)
+        }
+        result['paid_back_share'] = float(np.isfinite(payback[:, i]).mean())
+        results.append(result)
     return results
 
+def best_tiers(cohorts: List[Dict]) -> Dict[str, Dict[str, Dict]]:
+    """Cohort scenario with the highest mean LTV:CAC per segment and channel"""
+    best = {}
+    for result in cohorts:
+        current = best.setdefault(result['segment'], {}).get(result['channel'])
+        if current is None or result['ltv_cac']['mean'] > current['ltv_cac']['mean']:
+            best[result['segment']][result['channel']] = result
+    return best
+
+# ==================== SAMPLING DIAGNOSTICS ====================
+
+def _generation_estimates(n: int, rng: np.random.Generator, sampler: str) -> np.ndarray:
+    """Mean subscription WTP per segment"""
+    df = calculate_wtp(generate_respondents(n, rng=rng, sampler=sampler))
+    groups = segment_codes(df)
+    sums = np.bincount(groups, weights=df['wtp_subscription'].to_numpy(), minlength=len(PERSONAS))
+    return sums / np.maximum(np.bincount(groups, minlength=len(PERSONAS)), 1)
+
+def _funnel_estimates(n: int, rng: np.random.Generator, sampler: str) -> np.ndarray:
+    """Mean simulated CAC per segment x channel over n replicates"""
+    return np.array([result['cac']['mean'] for result in simulate_funnels(n_replicates=n, rng=rng, sampler=sampler)])
+
+# Stage -> estimator(n, rng, sampler) returning the stage's headline estimates
+SAMPLING_ESTIMATORS = {'generation': _generation_estimates, 'funnels': _funnel_estimates}
+
+def sampling_diagnostics(samplers: Tuple[str, ...] = None, sizes: Tuple[int, ...] = (1_000, 10_000),
+                         n_repeats: int = 30, stages: Tuple[str, ...] = None,
+                         seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Achieved 95% CI width of each stage's estimates by sampler and sample size
+
+    Every (stage, sampler, n) is rerun n_repeats times on independent streams
+    (fresh scrambles for the QMC samplers). The spread across reruns is the
+    achieved standard error whatever the sampler's dependence between rows,
+    unlike an iid bootstrap within one run. ci_width is 2 x 1.96 x that error,
+    averaged over the stage's estimates; efficiency is the variance ratio
+    against 'random' at the same n, i.e. how many times more plain samples
+    the same width would take.
+    """
+    samplers = samplers or tuple(SAMPLERS)
+    stages = stages or tuple(SAMPLING_ESTIMATORS)
+    rows = []
+    for stage in stages:
+        for n in sizes:
+            for sampler in samplers:
+                streams = np.random.SeedSequence(seed, spawn_key=(zlib.crc32(f'{stage}/{sampler}/{n}'.encode()),))
+                start = time.perf_counter()
+                estimates = np.array([
+                    SAMPLING_ESTIMATORS[stage](n, np.random.default_rng(child), sampler)
+                    for child in streams.spawn(n_repeats)
+                ])
+                rows.append({
+                    'stage': stage,
+                    'sampler': sampler,
+                    'n': n,
+                    'ci_width': float(np.mean(2 * 1.96 * estimates.std(axis=0, ddof=1))),
+                    'seconds_per_run': (time.perf_counter() - start) / n_repeats
+                })
+
+    table = pd.DataFrame(rows)
+    baseline = table[table['sampler'] == 'random'].set_index(['stage', 'n'])['ci_width']
+    reference = pd.MultiIndex.from_frame(table[['stage', 'n']]).map(baseline.get)
+    table['efficiency'] = (np.asarray(reference, dtype=np.float64) / table['ci_width']) ** 2
+    return table
+
 # ==================== VALIDATION EXPERIMENTS ====================
 
 VALIDATION_EXPERIMENTS = {
@@ -417,168 +2613,1223 @@ VALIDATION_EXPERIMENTS = {
     }
 }
 
-# ==================== MAIN ANALYSIS ====================
+# ==================== PARALLEL RUNNER ====================
+
+# Shards queued per worker, so a slow shard does not leave the other workers idle
+PARALLEL_SHARDS_PER_WORKER = 4
+
+def parallel_shard_count(n: int, workers: int, chunk_size: int = 1_000_000) -> int:
+    """Enough shards to keep every worker busy, and enough to keep each within chunk_size"""
+    return max(workers * PARALLEL_SHARDS_PER_WORKER, -(-n // chunk_size))
+
+def _simulate_shard(task: Tuple[str, int, int, int, np.random.SeedSequence, str]) -> WTPAccumulator:
+    """Worker: generate, score and bootstrap one respondent shard with its own stream"""
+    segment_key, size, start, n_bootstrap, seed_seq, sampler = task
+    rng = np.random.default_rng(seed_seq)
+    chunk = calculate_wtp(respondent_frame(segment_columns(segment_key, size, start, rng=rng, sampler=sampler)))
+    return WTPAccumulator(n_bootstrap=n_bootstrap).update(chunk, rng=rng)
+
+def _funnel_shard(task: Tuple[str, str, np.random.SeedSequence, str]) -> Dict:
+    """Worker: simulate one segment x channel funnel with its own stream"""
+    segment, channel, seed_seq, sampler = task
+    return model_acquisition_funnel(segment, channel, rng=np.random.default_rng(seed_seq), sampler=sampler)
+
+def parallel_simulation(n: int, seed: int = DEFAULT_SEED, workers: int = None,
+                        chunk_size: int = 1_000_000, n_bootstrap: int = 0,
+                        sampler: str = 'random', n_shards: int = None) -> Tuple[WTPAccumulator, List[Dict]]:
+    """Shard generation, WTP, bootstrap and funnels across a process pool
+
+    Every shard draws from its own Generator spawned from SeedSequence(seed),
+    and shard results are merged in the parent in a fixed order, so output is
+    bit-reproducible for a given seed and shard layout. n_shards defaults to
+    parallel_shard_count, which grows with workers; pass it explicitly to get
+    identical output from any number of workers. Returns the merged WTPAccumulator and the funnel results.
+    CIs use the normal approximation unless n_bootstrap > 0, as in
+    stream_simulation.
+    """
+    workers = workers or os.cpu_count()
+    shards = respondent_shards(n, chunk_size, n_shards or parallel_shard_count(n, workers, chunk_size))
+    pairs = [(segment, channel) for segment in PERSONAS for channel in FUNNEL_CHANNELS]
+    shard_seeds, funnel_seeds = np.random.SeedSequence(seed).spawn(2)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = pool.map(_simulate_shard, [
+            (segment_key, size, start, n_bootstrap, seed_seq, sampler)
+            for (segment_key, size, start), seed_seq in zip(shards, shard_seeds.spawn(len(shards)))
+        ])
+        funnels = pool.map(_funnel_shard, [
+            (segment, channel, seed_seq, sampler)
+            for (segment, channel), seed_seq in zip(pairs, funnel_seeds.spawn(len(pairs)))
+        ])
+
+        accumulator = WTPAccumulator(n_bootstrap=n_bootstrap)
+        for partial in partials:
+            accumulator.merge(partial)
+        funnel_results = list(funnels)
+
+    return accumulator, funnel_results
+
+# ==================== OUTPUT STORE ====================
+
+# Results and respondents land next to this script unless overridden
+DEFAULT_OUTPUT_DIR = os.environ.get('FOCUS_GROUP_OUTPUT_DIR', os.path.dirname(os.path.abspath(__file__)))
+
+RESULTS_FILE = 'focus_group_results.json'
+
+# Respondent writers/loaders by format. Each writer takes (df, output_dir)
+# and returns the path it wrote; each loader takes (output_dir, mmap).
+RESPONDENT_WRITERS = {}
+RESPONDENT_LOADERS = {}
+
+def register_respondent_format(name: str, writer, loader):
+    """Register a respondent writer/loader pair under a format name"""
+    RESPONDENT_WRITERS[name] = writer
+    RESPONDENT_LOADERS[name] = loader
+
+def _write_npy(df: pd.DataFrame, output_dir: str) -> str:
+    """One .npy per column plus a manifest; string columns become categorical codes"""
+    path = os.path.join(output_dir, 'respondents')
+    os.makedirs(path, exist_ok=True)
+
+    columns = []
+    for name in df.columns:
+        col = df[name]
+        entry = {'name': name, 'file': f'{name}.npy'}
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            codes, categories = col.cat.codes.to_numpy(), col.cat.categories
+            np.save(os.path.join(path, entry['file']), codes)
+            entry['categories'] = [str(c) for c in categories]
+        elif not pd.api.types.is_numeric_dtype(col):
+            codes, categories = pd.factorize(col)
+            if len(categories) <= len(col) // 2:
+                # Low-cardinality strings: narrow integer codes + category table
+                codes = codes.astype(np.min_scalar_type(max(len(categories) - 1, 0)))
+                np.save(os.path.join(path, entry['file']), codes)
+                entry['categories'] = [str(c) for c in categories]
+            else:
+                np.save(os.path.join(path, entry['file']), col.to_numpy(dtype=str))
+        else:
+            np.save(os.path.join(path, entry['file']), col.to_numpy())
+        columns.append(entry)
+
+    with open(os.path.join(path, 'manifest.json'), 'w') as f:
+        json.dump({'n_rows': len(df), 'columns': columns}, f, separators=(',', ':'))
+    return path
+
+def _load_npy(output_dir: str, mmap: bool = True) -> pd.DataFrame:
+    """Rebuild the respondent frame on top of (memory-mapped) column files"""
+    path = os.path.join(output_dir, 'respondents')
+    with open(os.path.join(path, 'manifest.json')) as f:
+        manifest = json.load(f)
+
+    data = {}
+    for entry in manifest['columns']:
+        values = np.load(os.path.join(path, entry['file']), mmap_mode='r' if mmap else None)
+        if 'categories' in entry:
+            data[entry['name']] = pd.Categorical.from_codes(values, categories=entry['categories'])
+        else:
+            data[entry['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+def _write_parquet(df: pd.DataFrame, output_dir: str) -> str:
+    path = os.path.join(output_dir, 'respondents.parquet')
+    df.to_parquet(path, index=False)  # needs pyarrow or fastparquet
+    return path
+
+def _load_parquet(output_dir: str, mmap: bool = True) -> pd.DataFrame:
+    return pd.read_parquet(os.path.join(output_dir, 'respondents.parquet'), memory_map=mmap)
+
+def _write_csv(df: pd.DataFrame, output_dir: str) -> str:
+    path = os.path.join(output_dir, 'respondents.csv')
+    with_segment_attributes(df).to_csv(path, index=False)
+    return path
+
+def _load_csv(output_dir: str, mmap: bool = True) -> pd.DataFrame:
+    return pd.read_csv(os.path.join(output_dir, 'respondents.csv'))
+
+register_respondent_format('npy', _write_npy, _load_npy)
+register_respondent_format('parquet', _write_parquet, _load_parquet)
+register_respondent_format('csv', _write_csv, _load_csv)
+
+def save_respondents(df: pd.DataFrame, output_dir: str = DEFAULT_OUTPUT_DIR, fmt: str = 'npy') -> str:
+    """Write the respondent frame in a registered format, returning the path"""
+    if fmt not in RESPONDENT_WRITERS:
+        raise ValueError(f"Unknown respondent format: {fmt}")
+    os.makedirs(output_dir, exist_ok=True)
+    return RESPONDENT_WRITERS[fmt](df, output_dir)
+
+def load_respondents(output_dir: str = DEFAULT_OUTPUT_DIR, fmt: str = 'npy', mmap: bool = True) -> pd.DataFrame:
+    """Load respondents written by save_respondents; npy columns are memory-mapped, not copied"""
+    if fmt not in RESPONDENT_LOADERS:
+        raise ValueError(f"Unknown respondent format: {fmt}")
+    return RESPONDENT_LOADERS[fmt](output_dir, mmap)
+
+def save_results(output: Dict, output_dir: str = DEFAULT_OUTPUT_DIR, indent: int = None) -> str:
+    """Write the results dict as compact JSON (numpy scalars converted to float)"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, RESULTS_FILE)
+    separators = (',', ':') if indent is None else (',', ': ')
+    with open(path, 'w') as f:
+        json.dump(output, f, indent=indent, separators=separators, default=float)
+    return path
+
+def load_results(output_dir: str = DEFAULT_OUTPUT_DIR) -> Dict:
+    """Read results written by save_results"""
+    with open(os.path.join(output_dir, RESULTS_FILE)) as f:
+        return json.load(f)
+
+# ==================== RESPONDENT INDEX ====================
+
+# Secondary index bins: value v falls in bin i when edges[i] <= v < edges[i + 1]
+INDEX_BINS = {
+    'income': (0, 30_000, 50_000, 75_000, 100_000, 150_000, np.inf),
+    'age': (0, 25, 30, 35, 40, 45, np.inf),
+    'time_scarcity': (0, 2, 4, 6, 8, np.inf),
+    'fashion_interest': (0, 2, 4, 6, 8, np.inf)
+}
 
-def main():
-    print("🎯 Generating 10,000 synthetic respondents...")
-    df = generate_respondents(10000)
+RESPONDENT_INDEX_DIR = 'respondent_index'
 
-    print("💰 Calculating WTP distributions...")
-    df = calculate_wtp(df)
+def attribute_cells(columns: Dict[str, np.ndarray], bins: Dict[str, Tuple[float, ...]] = None) -> np.ndarray:
+    """Flat cell number per row over every combination of attribute bins"""
+    bins = bins or INDEX_BINS
+    codes = [np.searchsorted(np.asarray(edges[1:-1]), columns[name], side='right') for name, edges in bins.items()]
+    return np.ravel_multi_index(codes, tuple(len(edges) - 1 for edges in bins.values())).astype(np.intp)
 
-    # WTP Summary Stats
-    print("\n" + "="*60)
-    print("WILLINGNESS-TO-PAY ANALYSIS")
-    print("="*60)
+def bin_labels(attribute: str, bins: Dict[str, Tuple[float, ...]] = None) -> List[str]:
+    """Readable label per bin of an indexed attribute (e.g. '30000-50000', '150000+')"""
+    edges = (bins or INDEX_BINS)[attribute]
+    return [f"{low:g}+" if np.isinf(high) else f"{low:g}-{high:g}" for low, high in zip(edges[:-1], edges[1:])]
 
-    wtp_summary = []
-    for segment in PERSONAS.keys():
-        seg_df = df[df['segment'] == segment]
-        seg_name = PERSONAS[segment].name
-
-        for pricing_model in ['wtp_subscription', 'wtp_per_outfit', 'wtp_bundle_10']:
-            values = seg_df[pricing_model]
-
-            # Bootstrap for CI
-            bootstrap_means = [values.sample(len(values), replace=True).mean() for _ in range(1000)]
-            ci_lower = np.percentile(bootstrap_means, 2.5)
-            ci_upper = np.percentile(bootstrap_means, 97.5)
-
-            wtp_summary.append({
-                'segment': seg_name,
-                'pricing_model': pricing_model.replace('wtp_', ''),
-                'mean': f"${values.mean():.2f}",
-                'median': f"${values.median():.2f}",
-                'ci_95': f"[${ci_lower:.2f}, ${ci_upper:.2f}]",
-                'p25': f"${values.quantile(0.25):.2f}",
-                'p75': f"${values.quantile(0.75):.2f}"
-            })
+@dataclass
+class RespondentIndex:
+    """Respondent columns grouped by segment and then by attribute-bin cell
+
+    Rows are reordered once so every segment, and every combination of
+    INDEX_BINS within it, is one contiguous range: key g * n_cells + cell
+    spans offsets[key]:offsets[key + 1]. Segment subsets are zero-copy
+    slices, counts and WTP moments for any combination of bins come from
+    the per-key tables alone, and quantiles and demand read only the
+    matching ranges.
+    """
+    columns: Dict[str, np.ndarray]
+    offsets: np.ndarray
+    moments: Dict[str, np.ndarray]
+    bins: Dict[str, Tuple[float, ...]]
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, bins: Dict[str, Tuple[float, ...]] = None) -> 'RespondentIndex':
+        """Index a compact respondent frame with WTP columns"""
+        bins = {name: tuple(float(edge) for edge in edges) for name, edges in (bins or INDEX_BINS).items()}
+        columns = {name: df[name].to_numpy() for name in df.columns if name != 'segment'}
+        columns['segment'] = segment_codes(df).astype(np.uint8)
+
+        n_cells = int(np.prod([len(edges) - 1 for edges in bins.values()]))
+        keys = columns['segment'].astype(np.intp) * n_cells + attribute_cells(columns, bins)
+        order, offsets = group_offsets(keys, len(PERSONAS) * n_cells)
+        if order is not None:
+            columns = {name: values[order] for name, values in columns.items()}
+            keys = keys[order]
+
+        moments = {}
+        for model in WTP_MODELS:
+            values = columns[model].astype(np.float64)
+            moments[model] = np.stack([
+                np.bincount(keys, weights=values, minlength=len(offsets) - 1),
+                np.bincount(keys, weights=values ** 2, minlength=len(offsets) - 1)
+            ], axis=1)
+        return cls(columns, offsets, moments, bins)
+
+    @property
+    def n_cells(self) -> int:
+        return int(np.prod([len(edges) - 1 for edges in self.bins.values()]))
+
+    @property
+    def counts(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def segment_range(self, segment: str) -> slice:
+        """Row range of one segment"""
+        g = list(PERSONAS).index(segment)
+        return slice(int(self.offsets[g * self.n_cells]), int(self.offsets[(g + 1) * self.n_cells]))
+
+    def segment(self, segment: str) -> pd.DataFrame:
+        """One segment's respondents as a frame over views of the index columns"""
+        rows = self.segment_range(segment)
+        return respondent_frame({name: values[rows] for name, values in self.columns.items()})
+
+    def frame(self) -> pd.DataFrame:
+        """The whole population, segment-grouped, as a compact respondent frame"""
+        return respondent_frame(self.columns)
+
+    def keys(self, segment=None, platform: str = None, **bins) -> np.ndarray:
+        """Index keys matching the filters
+
+        `segment` takes a key or a list of keys and `platform` a
+        platform_preference; each INDEX_BINS attribute takes a bin number or
+        a list of them (see bin_labels). Omitted filters match everything.
+        """
+        unknown = set(bins) - set(self.bins)
+        if unknown:
+            raise ValueError(f"Unknown index attributes: {sorted(unknown)}")
+
+        segments = np.ones(len(PERSONAS), dtype=bool)
+        if segment is not None:
+            wanted = [segment] if isinstance(segment, str) else list(segment)
+            segments &= np.isin(list(PERSONAS), wanted)
+        if platform is not None:
+            segments &= np.array([config.platform_preference == platform for config in PERSONAS.values()])
+
+        mask = segments.reshape((-1,) + (1,) * len(self.bins))
+        for axis, (name, edges) in enumerate(self.bins.items(), start=1):
+            selected = np.ones(len(edges) - 1, dtype=bool)
+            if name in bins:
+                selected = np.isin(np.arange(len(edges) - 1), np.atleast_1d(bins[name]))
+            shape = [1] * (len(self.bins) + 1)
+            shape[axis] = -1
+            mask = mask & selected.reshape(shape)
+        return np.flatnonzero(mask)
+
+    def values(self, keys: np.ndarray, column: str) -> np.ndarray:
+        """A column's values over the given keys; adjacent keys are read as one slice"""
+        starts, stops = self.offsets[keys], self.offsets[keys + 1]
+        breaks = np.flatnonzero(starts[1:] != stops[:-1]) + 1
+        runs = zip(starts[np.r_[0, breaks]], stops[np.r_[breaks - 1, len(keys) - 1]]) if len(keys) else []
+        parts = [self.columns[column][start:stop] for start, stop in runs]
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts) if parts else self.columns[column][:0]
+
+    def query(self, segment=None, platform: str = None, quantiles: Tuple[float, ...] = (0.1, 0.5, 0.9),
+              prices: Dict[str, np.ndarray] = None, **bins) -> Dict:
+        """WTP statistics for respondents matching the filters (see keys)
+
+        Counts, means and standard deviations of every pricing model come from
+        the per-key moments. Quantiles and demand at `prices` (keyed by
+        pricing model) read only the matching rows; pass quantiles=() to skip.
+        """
+        keys = self.keys(segment, platform, **bins)
+        n = int(self.counts[keys].sum())
+        result = {'n': n, 'share': n / max(int(self.offsets[-1]), 1)}
+
+        for model in WTP_MODELS:
+            total, total_sq = self.moments[model][keys].sum(axis=0)
+            stats_row = {'mean': np.nan, 'std': np.nan}
+            if n:
+                mean = total / n
+                stats_row['mean'] = float(mean)
+                stats_row['std'] = float(np.sqrt(max(total_sq / n - mean ** 2, 0.0) * n / max(n - 1, 1)))
+            if quantiles:
+                values = self.values(keys, model)
+                levels = np.quantile(values, quantiles) if n else np.full(len(quantiles), np.nan)
+                stats_row.update({f'p{q * 100:g}': float(level) for q, level in zip(quantiles, levels)})
+            if prices and model in prices:
+                stats_row['demand'] = demand_at(np.sort(self.values(keys, model)), prices[model])
+            result[model] = stats_row
+        return result
+
+    def save(self, output_dir: str = DEFAULT_OUTPUT_DIR) -> str:
+        """Write the grouped columns (npy store) plus offsets, moments and bins"""
+        path = os.path.join(output_dir, RESPONDENT_INDEX_DIR)
+        save_respondents(self.frame(), path, 'npy')
+        np.savez(os.path.join(path, 'index.npz'), offsets=self.offsets,
+                 **{f'moments_{model}': moments for model, moments in self.moments.items()})
+        with open(os.path.join(path, 'bins.json'), 'w') as f:
+            json.dump({name: [str(edge) for edge in edges] for name, edges in self.bins.items()}, f)
+        return path
+
+    @classmethod
+    def load(cls, output_dir: str = DEFAULT_OUTPUT_DIR, mmap: bool = True) -> 'RespondentIndex':
+        """Read an index written by save; columns are memory-mapped"""
+        path = os.path.join(output_dir, RESPONDENT_INDEX_DIR)
+        df = load_respondents(path, 'npy', mmap)
+        columns = {name: df[name].to_numpy() for name in df.columns if name != 'segment'}
+        columns['segment'] = segment_codes(df).astype(np.uint8)
+        with np.load(os.path.join(path, 'index.npz')) as stored:
+            offsets = stored['offsets']
+            moments = {model: stored[f'moments_{model}'] for model in WTP_MODELS}
+        with open(os.path.join(path, 'bins.json')) as f:
+            bins = {name: tuple(float(edge) for edge in edges) for name, edges in json.load(f).items()}
+        return cls(columns, offsets, moments, bins)
+
+# ==================== STAGE CACHE ====================
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'FOCUS_GROUP_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'focus_group_simulation')
+)
+
+# Least recently used entries are evicted once the cache grows past this
+CACHE_MAX_BYTES = 4 * 1024 ** 3
+
+def _canonical(obj, seen: set = None):
+    """JSON-serializable, order-independent form of a stage input"""
+    seen = set() if seen is None else seen
+    if isinstance(obj, dict):
+        return sorted([_canonical(k, seen), _canonical(v, seen)] for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v, seen) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return ['ndarray', obj.dtype.str, list(obj.shape), hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest()]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if hasattr(obj, '__dataclass_fields__') and not isinstance(obj, type):
+        return _canonical(asdict(obj), seen)
+    if callable(obj):
+        return _canonical_code(obj, seen)
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    return repr(obj)
+
+@functools.lru_cache(maxsize=None)
+def _source(obj) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return obj.__code__.co_code.hex()
+
+def _global_reads(obj) -> List[str]:
+    """Module-level names read by a function (nested functions and lambdas included) or by a class's methods"""
+    if hasattr(obj, '__code__'):
+        codes = [obj.__code__]
+    else:
+        members = [getattr(member, '__func__', member) for member in vars(obj).values()]
+        codes = [member.__code__ for member in members if hasattr(member, '__code__')]
+    names = set()
+    while codes:
+        code = codes.pop()
+        names.update(code.co_names)
+        codes.extend(const for const in code.co_consts if hasattr(const, 'co_names'))
+    return sorted(names & set(globals()))
+
+def _is_stage_input(value) -> bool:
+    """Module globals that can change a stage's output: data, and code defined in this module"""
+    if issubclass(type(value), types.ModuleType):  # type() does not trigger lazy module loading
+        return False
+    if callable(value):
+        return getattr(value, '__module__', None) == __name__
+    return isinstance(value, (dict, list, tuple, np.ndarray, np.generic, str, int, float, bool)) or (
+        hasattr(value, '__dataclass_fields__') and not isinstance(value, type)
+    )
+
+def _canonical_code(obj, seen: set):
+    """Source of a function or class plus everything it reads from this module, transitively
+
+    Editing a stage function, a helper it calls, a module constant any of
+    them reads or a default argument therefore changes the key. Code that is
+    already part of the key is referenced by name only.
+    """
+    name = getattr(obj, '__qualname__', repr(obj))
+    if getattr(obj, '__module__', None) != __name__:
+        return ['code', name]
+    if id(obj) in seen:
+        return ['code-ref', name]
+    seen.add(id(obj))
+    defaults = [getattr(obj, '__defaults__', None), getattr(obj, '__kwdefaults__', None)]
+    reads = [
+        [global_name, _canonical(globals()[global_name], seen)]
+        for global_name in _global_reads(obj) if _is_stage_input(globals()[global_name])
+    ]
+    return ['code', _source(obj), _canonical(defaults, seen), reads]
+
+def cache_key(stage: str, *inputs) -> str:
+    """Content hash of a stage name and everything its output depends on"""
+    payload = json.dumps([stage, _canonical(list(inputs))], separators=(',', ':'))
+    return f"{stage}-{hashlib.sha256(payload.encode()).hexdigest()[:32]}"
+
+@dataclass
+class StageCache:
+    """Content-addressed on-disk store of stage results with size-based LRU eviction
+
+    Entries are pickles named by cache_key. A hit refreshes the entry's mtime,
+    which is the recency used for eviction.
+    """
+    cache_dir: str = DEFAULT_CACHE_DIR
+    max_bytes: int = CACHE_MAX_BYTES
+    hits: List[str] = field(default_factory=list)
+    misses: List[str] = field(default_factory=list)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def get(self, key: str) -> Tuple[bool, object]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False, None
+        os.utime(path)
+        return True, value
+
+    def put(self, key: str, value):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f'{self._path(key)}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pkl'):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    def run(self, key: str, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        hit, value = self.get(key)
+        if hit:
+            self.hits.append(key)
+            return value
+        value = compute()
+        self.misses.append(key)
+        self.put(key, value)
+        return value
+
+# ==================== STAGE METRICS ====================
+
+# numpy's PCG64 uses the 128-bit LCG multiplier from the PCG reference code
+PCG64_MULTIPLIER = (2549297995355413924 << 64) + 4865540595714422341
+
+def rng_draws(before: Dict, after: Dict) -> int:
+    """Number of 64-bit outputs a PCG64 Generator produced between two states
+
+    Solves for the LCG jump distance one bit at a time, as in the PCG
+    reference implementation, so counting costs nothing during the stage.
+    """
+    if before['bit_generator'] != 'PCG64':
+        return None
+    cur, new = before['state']['state'], after['state']['state']
+    mult, plus = PCG64_MULTIPLIER, before['state']['inc']
+    mask, bit, distance = (1 << 128) - 1, 1, 0
+    while cur != new:
+        if (cur & bit) != (new & bit):
+            cur = (cur * mult + plus) & mask
+            distance |= bit
+        bit <<= 1
+        plus = ((mult + 1) * plus) & mask
+        mult = (mult * mult) & mask
+    return distance
+
+def peak_rss_mb() -> float:
+    """Process peak resident set size so far, in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+@dataclass
+class StageMetrics:
+    """Per-stage wall/CPU time, peak RSS, throughput and RNG draws for one run
+
+    When disabled, measure() hands back a nullcontext around a throwaway
+    record, so instrumented code pays almost nothing per stage. Stages may nest (WTP computes
+    the population it needs); self_seconds excludes nested stages. Stages named
+    in profile are run under cProfile and dumped as <stage>.prof (pstats format).
+    """
+    enabled: bool = False
+    profile: Tuple[str, ...] = ()
+    profile_dir: str = '.'
+    records: List[Dict] = field(default_factory=list)
+    _active: List[Dict] = field(default_factory=list, repr=False)
+
+    def measure(self, stage: str, rows: int = None, rng: np.random.Generator = None):
+        if not self.enabled and stage not in self.profile:
+            # A fresh record per call, so flags set on it cannot leak into the next stage
+            return nullcontext({})
+        return self._measure(stage, rows, rng)
+
+    @contextmanager
+    def _measure(self, stage: str, rows: int, rng: np.random.Generator):
+        record = {'stage': stage, 'rows': rows, 'nested_seconds': 0.0, 'nested_cpu': 0.0}
+        self._active.append(record)
+        rng_before = rng.bit_generator.state if rng is not None else None
+        rss_before = peak_rss_mb()
+        profiler = cProfile.Profile() if stage in self.profile else None
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            record['wall_seconds'] = time.perf_counter() - wall
+            record['cpu_seconds'] = time.process_time() - cpu
+            record['self_seconds'] = record['wall_seconds'] - record.pop('nested_seconds')
+            record['self_cpu_seconds'] = record['cpu_seconds'] - record.pop('nested_cpu')
+            self._active.pop()
+            if self._active:
+                self._active[-1]['nested_seconds'] += record['wall_seconds']
+                self._active[-1]['nested_cpu'] += record['cpu_seconds']
+            record['peak_rss_mb'] = peak_rss_mb()
+            if rss_before is not None:
+                # ru_maxrss is a process-wide high-water mark: this is how far the stage
+                # raised it, not what the stage allocated (0 if it stayed under an earlier peak)
+                record['peak_rss_high_water_growth_mb'] = record['peak_rss_mb'] - rss_before
+            if rows and record['self_seconds'] > 0:
+                record['rows_per_second'] = rows / record['self_seconds']
+            if rng is not None:
+                record['rng_draws'] = rng_draws(rng_before, rng.bit_generator.state)
+            if profiler:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                record['profile'] = os.path.join(self.profile_dir, f'{stage}.prof')
+                profiler.dump_stats(record['profile'])
+            self.records.append(record)
+
+    def save(self, path: str, **run_info) -> str:
+        """Write run parameters and stage records as JSON"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        totals = {key: sum(r[f'self_{key}'] for r in self.records) for key in ['seconds', 'cpu_seconds']}
+        with open(path, 'w') as f:
+            json.dump({'run': run_info, 'stages': self.records, 'totals': totals}, f, indent=2, default=float)
+        return path
+
+# ==================== SIMULATION SERVICE ====================
+
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8765
+
+# How long a batch stays open for concurrent requests before it is evaluated
+SERVICE_BATCH_WINDOW = 0.002
+
+SERVICE_MAX_BODY = 1 << 20
+
+# Per-request bounds, so one request cannot make a batch overflow or run away
+SERVICE_MAX_PRICES = 10_000
+SERVICE_MAX_IMPRESSIONS = 10 ** 9
+SERVICE_MAX_REPLICATES = 100_000
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+                500: 'Internal Server Error'}
+
+class ServiceError(ValueError):
+    """A request the service rejects with 400"""
+
+class RequestBatcher:
+    """Collects concurrent requests of one kind and answers them with one evaluation
+
+    `evaluate` maps a list of validated payloads to a list of results. It runs
+    on the service's worker thread, so the event loop keeps accepting (and
+    queueing) requests while a batch is computed.
+    """
+    def __init__(self, evaluate, executor, window: float = SERVICE_BATCH_WINDOW):
+        self.evaluate = evaluate
+        self.executor = executor
+        self.window = window
+        self.pending = []
+        self.flush_task = None
+        self.batch_sizes = []
+
+    async def submit(self, payload: Dict) -> Dict:
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((payload, future))
+        if self.flush_task is None:
+            self.flush_task = asyncio.ensure_future(self._flush())
+        return await future
+
+    async def _flush(self):
+        await asyncio.sleep(self.window)
+        batch, self.pending, self.flush_task = self.pending, [], None
+        self.batch_sizes.append(len(batch))
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.evaluate, [payload for payload, _ in batch])
+        except Exception:
+            # Re-run item by item so only the request that broke the batch fails
+            results = []
+            for payload, _ in batch:
+                try:
+                    results.append((await loop.run_in_executor(self.executor, self.evaluate, [payload]))[0])
+                except Exception as exc:
+                    results.append(exc)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+def service_population(n: int = 10000, seed: int = DEFAULT_SEED, respondents_dir: str = None,
+                       respondents_format: str = 'npy') -> pd.DataFrame:
+    """Respondents with WTP columns: loaded from a save_respondents directory, or generated as main() does"""
+    if respondents_dir:
+        df = load_respondents(respondents_dir, respondents_format)
+        if any(model not in df.columns for model in WTP_MODELS):
+            df = calculate_wtp(df)
+        return df
+    return calculate_wtp(generate_respondents(n, rng=stage_rng(seed, 'respondents')))
+
+class SimulationService:
+    """Warm population and demand state behind the local HTTP service
+
+    Everything a query needs (sorted WTP per segment and model, pricing option
+    values, segment codes) is computed once at startup. Requests of the same
+    kind that arrive within SERVICE_BATCH_WINDOW of each other are evaluated
+    together: demand prices are concatenated into one binary search per
+    segment and model, tier ladders into one evaluate_price_combos call and
+    funnels into one simulate_funnels call.
+    """
+    def __init__(self, df: pd.DataFrame, seed: int = DEFAULT_SEED, window: float = SERVICE_BATCH_WINDOW):
+        self.n = len(df)
+        self.sorted = sorted_wtp(df)
+        self.sorted_all = {model: np.sort(df[model].to_numpy()) for model in WTP_MODELS}
+        self.values = option_values(df)
+        self.groups = segment_codes(df)
+        self.rng = stage_rng(seed, 'service')
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batchers = {
+            'demand': RequestBatcher(self.demand, self.executor, window),
+            'tiers': RequestBatcher(self.tiers, self.executor, window),
+            'funnels': RequestBatcher(self.funnels, self.executor, window)
+        }
+        self.validators = {
+            'demand': self.validate_demand,
+            'tiers': self.validate_tiers,
+            'funnels': self.validate_funnels
+        }
+
+    # Validation runs per request, before batching, so one bad request cannot fail a batch
+
+    @staticmethod
+    def _finite(values: np.ndarray, what: str) -> np.ndarray:
+        if not np.isfinite(values).all():
+            raise ServiceError(f"{what} must be finite numbers")
+        return values
+
+    def validate_demand(self, body: Dict) -> Dict:
+        model = body.get('model', 'wtp_subscription')
+        segment = body.get('segment')
+        if not isinstance(model, str) or model not in WTP_MODELS:
+            raise ServiceError(f"Unknown model: {model}")
+        if segment is not None and (not isinstance(segment, str) or segment not in PERSONAS):
+            raise ServiceError(f"Unknown segment: {segment}")
+        try:
+            prices = np.asarray(body['prices'], dtype=np.float64).ravel()
+        except (KeyError, TypeError, ValueError):
+            raise ServiceError("'prices' must be a list of numbers")
+        if len(prices) > SERVICE_MAX_PRICES:
+            raise ServiceError(f"At most {SERVICE_MAX_PRICES} prices per request")
+        return {'model': model, 'segment': segment, 'prices': self._finite(prices, "'prices'")}
+
+    def validate_tiers(self, body: Dict) -> Dict:
+        overrides = body.get('prices', {})
+        if not isinstance(overrides, dict):
+            raise ServiceError("'prices' must be an object of option -> price")
+        prices = {**RECOMMENDED_PRICES, **overrides}
+        unknown = set(prices) - set(PRICING_OPTIONS)
+        if unknown:
+            raise ServiceError(f"Unknown pricing options: {sorted(unknown)}")
+        try:
+            combo = np.array([float(prices[option]) for option in PRICING_OPTIONS])
+        except (TypeError, ValueError):
+            raise ServiceError("tier prices must be numbers")
+        return {'combo': self._finite(combo, "tier prices").tolist()}
+
+    def validate_funnels(self, body: Dict) -> Dict:
+        pair = (body.get('segment'), body.get('channel'))
+        if not all(isinstance(key, str) for key in pair) or pair[0] not in PERSONAS or pair[1] not in FUNNEL_CHANNELS:
+            raise ServiceError(f"Unknown segment/channel: {pair}")
+        params = FUNNEL_PARAMS.get(pair, FUNNEL_PARAMS[DEFAULT_FUNNEL_PAIR])
+        try:
+            impressions = int(body.get('impressions', params['impressions']))
+            n_replicates = int(body.get('n_replicates', 1000))
+        except (TypeError, ValueError, OverflowError):
+            raise ServiceError("'impressions' and 'n_replicates' must be integers")
+        if not 0 <= impressions <= SERVICE_MAX_IMPRESSIONS or not 1 <= n_replicates <= SERVICE_MAX_REPLICATES:
+            raise ServiceError(f"'impressions' must be in 0..{SERVICE_MAX_IMPRESSIONS} and "
+                               f"'n_replicates' in 1..{SERVICE_MAX_REPLICATES}")
+        return {'pair': pair, 'impressions': impressions, 'n_replicates': n_replicates}
+
+    # Batch evaluators: a list of validated payloads in, one result per payload out
+
+    def demand(self, payloads: List[Dict]) -> List[Dict]:
+        results = [None] * len(payloads)
+        groups = {}
+        for i, payload in enumerate(payloads):
+            groups.setdefault((payload['segment'], payload['model']), []).append(i)
+
+        for (segment, model), members in groups.items():
+            prices = np.concatenate([payloads[i]['prices'] for i in members])
+            sorted_values = self.sorted_all[model] if segment is None else self.sorted[segment][model]
+            demand = demand_at(sorted_values, prices)
+            bounds = np.cumsum([0] + [len(payloads[i]['prices']) for i in members])
+            for i, start, stop in zip(members, bounds[:-1], bounds[1:]):
+                results[i] = {
+                    'segment': segment,
+                    'model': model,
+                    'prices': prices[start:stop].tolist(),
+                    'demand': demand[start:stop].tolist(),
+                    'revenue_per_respondent': (prices[start:stop] * demand[start:stop]).tolist()
+                }
+        return results
+
+    def tiers(self, payloads: List[Dict]) -> List[Dict]:
+        combos = np.array([payload['combo'] for payload in payloads], dtype=np.float64)
+        evaluated = evaluate_price_combos(self.values, self.groups, len(PERSONAS), combos)
+        table = pricing_table(combos, evaluated)
+        return [pricing_report(row) for _, row in table.iterrows()]
+
+    def funnels(self, payloads: List[Dict]) -> List[Dict]:
+        results = [None] * len(payloads)
+        groups = {}
+        for i, payload in enumerate(payloads):
+            groups.setdefault(payload['n_replicates'], []).append(i)
+
+        for n_replicates, members in groups.items():
+            projections = simulate_funnels([payloads[i]['pair'] for i in members], n_replicates, rng=self.rng,
+                                           impressions=[payloads[i]['impressions'] for i in members])
+            for i, projection in zip(members, projections):
+                results[i] = projection
+        return results
+
+    def health(self) -> Dict:
+        return {
+            'status': 'ok',
+            'n': self.n,
+            'batches': {kind: len(batcher.batch_sizes) for kind, batcher in self.batchers.items()},
+            'requests': {kind: sum(batcher.batch_sizes) for kind, batcher in self.batchers.items()}
+        }
+
+    async def respond(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        """(status, JSON body) for one request"""
+        route = path.split('?', 1)[0].strip('/')
+        if method == 'GET' and route == 'health':
+            return 200, self.health()
+        if method != 'POST' or route not in self.batchers:
+            return 404, {'error': f"No route for {method} /{route}"}
+        try:
+            request = json.loads(body or b'{}')
+            if not isinstance(request, dict):
+                raise ServiceError("Request body must be a JSON object")
+            payload = self.validators[route](request)
+        except (ServiceError, json.JSONDecodeError, UnicodeDecodeError) as exc:
+            return 400, {'error': str(exc)}
+        return 200, await self.batchers[route].submit(payload)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Minimal HTTP/1.1 connection handler with keep-alive"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > SERVICE_MAX_BODY:
+                    status, result = 413, {'error': 'Request body too large'}
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, result = await self.respond(method, path, body)
+                    except Exception as exc:
+                        status, result = 500, {'error': f"{type(exc).__name__}: {exc}"}
+
+                keep_alive = (headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                              and status != 413)
+                payload = json.dumps(result, separators=(',', ':'), default=float).encode()
+                writer.write(
+                    f"{version} {status} {HTTP_REASONS.get(status, 'OK')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(service: SimulationService, host: str = SERVICE_HOST, port: int = SERVICE_PORT, ready=None):
+    """Serve `service` over HTTP until cancelled; `ready(port)` is called once listening"""
+    server = await asyncio.start_server(service.handle, host, port)
+    if ready:
+        ready(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+# ==================== MAIN ANALYSIS ====================
 
-    wtp_df = pd.DataFrame(wtp_summary)
-    print("\n" + wtp_df.to_string(index=False))
+# Report sections main() can run, in report order
+STAGES = ('wtp', 'elasticity', 'pricing', 'van_westendorp', 'features', 'jtbd', 'funnels', 'viral', 'cohorts',
+          'validation', 'tiers')
+
+# Sections that need the simulated respondent population
+POPULATION_STAGES = ('wtp', 'elasticity', 'pricing', 'van_westendorp', 'features')
+
+def main(n: int = 10000, stream: bool = False, chunk_size: int = 1_000_000,
+         seed: int = DEFAULT_SEED, workers: int = 1,
+         output_dir: str = DEFAULT_OUTPUT_DIR, respondents_format: str = 'npy', index: bool = False,
+         cache: bool = False, cache_dir: str = DEFAULT_CACHE_DIR,
+         metrics_file: str = None, profile: Tuple[str, ...] = (),
+         stages: Tuple[str, ...] = STAGES, quiet: bool = False, sampler: str = 'random') -> Dict:
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {sorted(unknown)}")
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler: {sampler}")
+
+    def say(*args):
+        if not quiet:
+            print(*args)
+
+    stage_cache = StageCache(cache_dir) if cache else None
+    metrics = StageMetrics(enabled=metrics_file is not None, profile=tuple(profile),
+                           profile_dir=os.path.dirname(os.path.abspath(metrics_file)) if metrics_file else output_dir)
+
+    def stage(name: str, key: str, compute, rows: int = None, rng: np.random.Generator = None):
+        with metrics.measure(name, rows, rng) as record:
+            if not stage_cache:
+                return compute()
+            value = stage_cache.run(key, compute)
+            record['cached'] = stage_cache.hits[-1:] == [key]
+            return value
+
+    # Keys chain on upstream keys rather than data, so a hit never has to
+    # load or hash the population. Functions are hashed with every helper and
+    # module constant they read (see _canonical_code).
+    population_key = cache_key('respondents', n, seed, PERSONAS, SEGMENT_DISTRIBUTION, INCOME_FLOOR, SCORE_SPREAD,
+                               generate_respondents, iter_respondent_chunks, standard_draws, columns_from_draws,
+                               sampler, SAMPLERS[sampler])
+    wtp_key = cache_key('wtp', population_key, WTP_MODELS, wtp_terms, calculate_wtp)
+    funnel_key = cache_key('funnels', seed, FUNNEL_PARAMS, FUNNEL_CHANNELS, simulate_funnels, sampler, SAMPLERS[sampler])
+    # Key of whichever stage produced funnel_results, for the stages that consume them
+    funnel_results_key = funnel_key
+    df = accumulator = wtp_summary = elasticity_results = pricing = van_westendorp_results = None
+    feature_scores = feature_prefs = funnel_results = viral = cohorts = None
+
+    if not any(name in stages for name in POPULATION_STAGES):
+        pass
+    elif workers > 1:
+        say(f"🎯 Simulating {n:,} synthetic respondents on {workers} workers...")
+        df = None
+        n_shards = parallel_shard_count(n, workers, chunk_size)
+        funnel_results_key = cache_key('parallel', population_key, WTP_MODELS, chunk_size, n_shards,
+                                       parallel_simulation, WTPAccumulator, funnel_key)
+        accumulator, funnel_results = stage(
+            'parallel', funnel_results_key,
+            lambda: parallel_simulation(n, seed, workers, chunk_size, sampler=sampler, n_shards=n_shards), rows=n
+        )
+        stream = True
+    elif stream:
+        # Populations larger than memory: never materialize the respondent frame
+        say(f"🎯 Streaming {n:,} synthetic respondents in chunks of {chunk_size:,}...")
+        df = None
+        respondents_rng = stage_rng(seed, 'respondents')
+        accumulator = stage(
+            'stream', cache_key('stream', population_key, WTP_MODELS, chunk_size, stream_simulation, WTPAccumulator),
+            lambda: stream_simulation(n, chunk_size, rng=respondents_rng, sampler=sampler),
+            rows=n, rng=respondents_rng
+        )
+    else:
+        say(f"🎯 Generating {n:,} synthetic respondents...")
+        say("💰 Calculating WTP distributions...")
+        respondents_rng = stage_rng(seed, 'respondents')
+        df = stage('wtp', wtp_key, lambda: calculate_wtp(stage(
+            'generation', population_key, lambda: generate_respondents(n, rng=respondents_rng, sampler=sampler),
+            rows=n, rng=respondents_rng
+        )), rows=n)
+
+    # WTP Summary Stats
+    if 'wtp' in stages:
+        say("\n" + "="*60)
+        say("WILLINGNESS-TO-PAY ANALYSIS")
+        say("="*60)
+
+        if stream:
+            wtp_summary = accumulator.wtp_summary()
+        else:
+            bootstrap_rng = stage_rng(seed, 'bootstrap')
+            wtp_summary = stage(
+                'bootstrap', cache_key('bootstrap', wtp_key, summarize_wtp, bootstrap_means, bootstrap_interval),
+                lambda: summarize_wtp(df, rng=bootstrap_rng), rows=n, rng=bootstrap_rng
+            )
+
+        wtp_df = pd.DataFrame(wtp_summary)
+        say("\n" + wtp_df.to_string(index=False))
 
     # Price Elasticity
-    print("\n" + "="*60)
-    print("PRICE ELASTICITY & OPTIMAL PRICING")
-    print("="*60)
-
-    elasticity_results = []
-    for segment in PERSONAS.keys():
-        result = calculate_price_elasticity(df, segment)
-        elasticity_results.append(result)
-        print(f"\n{PERSONAS[segment].name}:")
-        print(f"  Price Elasticity: {result['price_elasticity']:.3f}")
-        print(f"  Optimal Price (subscription): ${result['optimal_price_sub']:.0f}/mo")
+    if 'elasticity' in stages:
+        say("\n" + "="*60)
+        say("PRICE ELASTICITY & OPTIMAL PRICING")
+        say("="*60)
+
+        if stream:
+            elasticity_results = accumulator.elasticity()
+        else:
+            def compute_elasticity():
+                wtp_index = sorted_wtp(df)
+                curves = demand_curves(df, index=wtp_index)
+                return [calculate_price_elasticity(df, segment, index=wtp_index, curves=curves) for segment in PERSONAS]
+
+            elasticity_results = stage(
+                'elasticity', cache_key('elasticity', wtp_key, sorted_wtp, calculate_price_elasticity, demand_curves,
+                                        elasticity_result),
+                compute_elasticity, rows=n
+            )
+
+        for segment, result in zip(PERSONAS, elasticity_results):
+            say(f"\n{PERSONAS[segment].name}:")
+            say(f"  Price Elasticity: {result['price_elasticity']:.3f}")
+            say(f"  Optimal Price (subscription): ${result['optimal_price_sub']:.2f}/mo")
+            say(f"  Optimal Price (per outfit): ${result['optimal_prices']['per_outfit']:.2f}")
+            say(f"  Optimal Price (10-pack): ${result['optimal_prices']['bundle_10']:.2f}")
+
+    # Pricing Optimizer
+    if 'pricing' in stages and df is not None:
+        say("\n" + "="*60)
+        say("PRICING TIER OPTIMIZATION")
+        say("="*60)
+
+        pricing_rng = stage_rng(seed, 'pricing')
+        pricing = stage(
+            'pricing', cache_key('pricing', wtp_key, TIER_VALUE, OUTFITS_PER_MONTH, PRICE_GRID, RECOMMENDED_PRICES,
+                                 optimize_pricing, evaluate_price_combos),
+            lambda: optimize_pricing(df, workers=workers, rng=pricing_rng), rows=n, rng=pricing_rng
+        )
+        pricing = {key: value for key, value in pricing.items() if key != 'table'}
+        for label, report in [('Optimized ladder', pricing['best']), ('Recommended ladder', pricing['recommended'])]:
+            prices = report['prices']
+            say(f"\n{label}: ${prices['tier_1']:.2f} / ${prices['tier_2']:.2f} / ${prices['tier_3']:.2f}/mo"
+                f" + ${prices['per_outfit']:.2f}/outfit")
+            say(f"  Revenue per respondent: ${report['revenue_per_respondent']:.2f}/mo")
+            say(f"  Take rate: {report['take_rate']*100:.1f}%")
+            say(f"  Option mix: " + ', '.join(f"{o} {share*100:.1f}%" for o, share in report['option_share'].items()))
+        say(f"\n  ({pricing['n_evaluated']:,} price combinations evaluated)")
+
+    # Van Westendorp Price Sensitivity
+    if 'van_westendorp' in stages and df is not None:
+        say("\n" + "="*60)
+        say("VAN WESTENDORP PRICE SENSITIVITY (subscription)")
+        say("="*60)
+
+        vw_rng = stage_rng(seed, 'van_westendorp')
+        van_westendorp_results = stage(
+            'van_westendorp', cache_key('van_westendorp', wtp_key, VW_THRESHOLDS, VW_NOISE,
+                                        van_westendorp, van_westendorp_answers, _vw_estimate),
+            lambda: van_westendorp(df, rng=vw_rng), rows=n, rng=vw_rng
+        )
+        for result in van_westendorp_results:
+            say(f"\n{PERSONAS[result['segment']].name}:")
+            for point in VW_INTERSECTIONS:
+                say(f"  {point}: ${result[point]['price']:.2f} (95% CI: ${result[point]['ci_lower']:.2f}-${result[point]['ci_upper']:.2f})")
+            say(f"  Acceptable range: ${result['acceptable_range'][0]:.2f}-${result['acceptable_range'][1]:.2f}/mo")
 
     # Feature Prioritization
-    print("\n" + "="*60)
-    print("FEATURE PRIORITIZATION (0-10 scale)")
-    print("="*60)
-
-    feature_scores = {}
-    for segment in PERSONAS.keys():
-        feature_scores[segment] = score_features(segment)
-
-    feature_df = pd.DataFrame(feature_scores).T
-    feature_df.index = [PERSONAS[s].name for s in feature_df.index]
-    print("\n" + feature_df.to_string())
-
-    # Top 5 features per segment
-    print("\n" + "="*60)
-    print("TOP 5 FEATURES BY SEGMENT")
-    print("="*60)
-    for segment in PERSONAS.keys():
-        seg_name = PERSONAS[segment].name
-        scores = feature_scores[segment]
-        top_5 = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:5]
-        print(f"\n{seg_name}:")
-        for i, (feature, score) in enumerate(top_5, 1):
-            print(f"  {i}. {feature.replace('_', ' ').title()}: {score}/10")
+    if 'features' in stages:
+        say("\n" + "="*60)
+        say("FEATURE PRIORITIZATION (0-10 scale)")
+        say("="*60)
+
+        feature_scores = {}
+        for segment in PERSONAS.keys():
+            feature_scores[segment] = score_features(segment)
+
+        feature_df = pd.DataFrame(feature_scores).T
+        feature_df.index = [PERSONAS[s].name for s in feature_df.index]
+        say("\n" + feature_df.to_string())
+
+        # Top 5 features per segment, ranked by simulated respondents when there is a population
+        if df is not None:
+            features_rng = stage_rng(seed, 'features')
+            feature_prefs = stage(
+                'features', cache_key('features', population_key, FEATURES, FEATURE_LOADINGS, FEATURE_UTILITY_NOISE,
+                                      score_features, feature_utilities, feature_preferences, simulate_maxdiff),
+                lambda: feature_preferences(df, rng=features_rng), rows=n, rng=features_rng
+            )
+
+        say("\n" + "="*60)
+        say("TOP 5 FEATURES BY SEGMENT")
+        say("="*60)
+        for segment in PERSONAS.keys():
+            seg_name = PERSONAS[segment].name
+            scores = feature_scores[segment]
+            say(f"\n{seg_name}:")
+            if feature_prefs is None:
+                top_5 = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:5]
+                for i, (feature, score) in enumerate(top_5, 1):
+                    say(f"  {i}. {feature.replace('_', ' ').title()}: {score}/10")
+                continue
+            prefs = feature_prefs[segment]
+            top_5 = sorted(prefs, key=lambda f: (-prefs[f]['top_k_share'], prefs[f]['mean_rank']))[:5]
+            for i, feature in enumerate(top_5, 1):
+                say(f"  {i}. {feature.replace('_', ' ').title()}: {scores[feature]}/10"
+                    f" · top 5 for {prefs[feature]['top_k_share']*100:.1f}%"
+                    f" · mean rank {prefs[feature]['mean_rank']:.2f}"
+                    f" · MaxDiff {prefs[feature]['maxdiff_score']:+.2f}")
 
     # JTBD Forces Diagrams
-    print("\n" + "="*60)
-    print("JOBS-TO-BE-DONE FORCES DIAGRAMS")
-    print("="*60)
-    for segment in PERSONAS.keys():
-        forces = JTBD_FORCES[segment]
-        seg_name = PERSONAS[segment].name
-        print(f"\n{seg_name}:")
-        print(f"  📋 Job: \"{forces['job']}\"")
-        print(f"  ⬅️  Push (away from current): {', '.join(forces['push'])}")
-        print(f"  ➡️  Pull (toward solution): {', '.join(forces['pull'])}")
-        print(f"  😰 Anxiety (fears): {', '.join(forces['anxiety'])}")
-        print(f"  🔄 Habit (inertia): {', '.join(forces['habit'])}")
+    if 'jtbd' in stages:
+        say("\n" + "="*60)
+        say("JOBS-TO-BE-DONE FORCES DIAGRAMS")
+        say("="*60)
+        for segment in PERSONAS.keys():
+            forces = JTBD_FORCES[segment]
+            seg_name = PERSONAS[segment].name
+            say(f"\n{seg_name}:")
+            say(f"  📋 Job: \"{forces['job']}\"")
+            say(f"  ⬅️  Push (away from current): {', '.join(forces['push'])}")
+            say(f"  ➡️  Pull (toward solution): {', '.join(forces['pull'])}")
+            say(f"  😰 Anxiety (fears): {', '.join(forces['anxiety'])}")
+            say(f"  🔄 Habit (inertia): {', '.join(forces['habit'])}")
 
     # Acquisition Funnels
-    print("\n" + "="*60)
-    print("4-WEEK ACQUISITION FUNNELS")
-    print("="*60)
+    if 'funnels' in stages:
+        say("\n" + "="*60)
+        say("4-WEEK ACQUISITION FUNNELS")
+        say("="*60)
+
+        if funnel_results is None:
+            funnels_rng = stage_rng(seed, 'funnels')
+            funnel_results = stage('funnels', funnel_key, lambda: simulate_funnels(rng=funnels_rng, sampler=sampler),
+                                   rng=funnels_rng)
+
+        for result in funnel_results:
+            channel = result['channel']
+            seg_name = PERSONAS[result['segment']].name
+            say(f"\n{seg_name} → {channel}:")
+            say(f"  Impressions: {result['impressions']:,}")
+            say(f"  CTR: {result['ctr']['mean']*100:.2f}% (95% CI: {result['ctr']['ci_lower']*100:.2f}%-{result['ctr']['ci_upper']*100:.2f}%)")
+            say(f"  Signup CVR: {result['cvr_signup']['mean']*100:.2f}% (95% CI: {result['cvr_signup']['ci_lower']*100:.2f}%-{result['cvr_signup']['ci_upper']*100:.2f}%)")
+            say(f"  Try 1st Look: {result['try_first_look']['mean']*100:.2f}%")
+            say(f"  Share Rate: {result['share_rate']['mean']*100:.2f}%")
+            say(f"  Day-7 Retention: {result['day7_retention']['mean']*100:.2f}%")
+            say(f"  CAC Range: ${result['cac_range'][0]}-${result['cac_range'][1]}")
+            say(f"  Simulated CAC: ${result['cac']['mean']:.2f} (95% CI: ${result['cac']['ci_lower']:.2f}-${result['cac']['ci_upper']:.2f})")
+            say(f"  📊 Funnel: {result['absolute_numbers']['clicks']:,} clicks → {result['absolute_numbers']['signups']:,} signups → {result['absolute_numbers']['day7_retained']:,} D7 retained")
+
+    # Viral Diffusion
+    if 'viral' in stages:
+        say("\n" + "="*60)
+        say("VIRAL LOOP (independent cascade on synthetic follower graphs)")
+        say("="*60)
+
+        if funnel_results is None:
+            funnels_rng = stage_rng(seed, 'funnels')
+            funnel_results = stage('funnels', funnel_key, lambda: simulate_funnels(rng=funnels_rng, sampler=sampler),
+                                   rng=funnels_rng)
+        viral_rng = stage_rng(seed, 'viral')
+        viral = stage(
+            'viral', cache_key('viral', funnel_results_key, VIRAL_AUDIENCE, VIRAL_HOMOPHILY, SHARE_EXPOSURE_LIFT,
+                               VIRAL_GRAPH_NODES, VIRAL_MAX_GENERATIONS, build_social_graph, simulate_diffusion,
+                               simulate_viral_funnels),
+            lambda: simulate_viral_funnels(funnel_results, VIRAL_GRAPH_NODES, rng=viral_rng),
+            rows=VIRAL_GRAPH_NODES, rng=viral_rng
+        )
+
+        for result in viral:
+            organic, cac = result['organic_signups'], result['effective_cac']
+            say(f"\n{result['platform']} ({result['n_nodes']:,} nodes, {result['n_edges']:,} edges):")
+            say(f"  Seeds (tried first look): {result['seeds']['mean']:,.0f}")
+            say(f"  Organic signups: {organic['mean']:,.0f} (95% CI: {organic['ci_lower']:,.0f}-{organic['ci_upper']:,.0f})")
+            say(f"  Viral k-factor: {result['viral_k_factor']['mean']:.3f} over {result['generations']['mean']:.1f} generations")
+            say(f"  CAC: ${result['paid_cac']:.2f} paid → ${cac['mean']:.2f} effective"
+                f" (95% CI: ${cac['ci_lower']:.2f}-${cac['ci_upper']:.2f})")
+
+    # Cohort Retention & LTV
+    if 'cohorts' in stages:
+        say("\n" + "="*60)
+        say(f"{COHORT_MONTHS}-MONTH COHORT RETENTION & LTV")
+        say("="*60)
+
+        cohort_prices = pricing['best']['prices'] if pricing else RECOMMENDED_PRICES
+        cohorts_rng = stage_rng(seed, 'cohorts')
+        cohorts = stage(
+            'cohorts', cache_key('cohorts', seed, cohort_prices, FUNNEL_PARAMS, CHURN_SHAPE, TIER_CHURN, COHORT_MONTHS,
+                                 COHORT_SIZE, GROSS_MARGIN, MONTHLY_DISCOUNT, simulate_cohorts, survival_curve),
+            lambda: simulate_cohorts(cohort_scenarios(prices=cohort_prices), rng=cohorts_rng), rng=cohorts_rng
+        )
+
+        for segment, channels in best_tiers(cohorts).items():
+            say(f"\n{PERSONAS[segment].name}:")
+            for channel, result in channels.items():
+                payback = result['payback_months']['median']
+                say(f"  {channel}: best {result['tier']} at ${result['price']:.2f}/mo"
+                    f" · LTV ${result['ltv']['mean']:.2f} (95% CI: ${result['ltv']['ci_lower']:.2f}-${result['ltv']['ci_upper']:.2f})"
+                    f" · LTV:CAC {result['ltv_cac']['mean']:.2f}"
+                    f" · payback {'>' + str(COHORT_MONTHS) if payback is None else f'{payback:.0f}'} mo")
 
-    funnel_results = []
-    for segment in PERSONAS.keys():
-        for channel in ['TikTok', 'LinkedIn']:
-            result = model_acquisition_funnel(segment, channel)
-            funnel_results.append(result)
+    # Validation Experiments
+    if 'validation' in stages:
+        say("\n" + "="*60)
+        say("VALIDATION EXPERIMENT PLAYBOOKS")
+        say("="*60)
 
+        for segment in PERSONAS.keys():
+            exp = VALIDATION_EXPERIMENTS[segment]
             seg_name = PERSONAS[segment].name
-            print(f"\n{seg_name} → {channel}:")
-            print(f"  Impressions: {result['impressions']:,}")
-            print(f"  CTR: {result['ctr']['mean']*100:.2f}% (95% CI: {result['ctr']['ci_lower']*100:.2f}%-{result['ctr']['ci_upper']*100:.2f}%)")
-            print(f"  Signup CVR: {result['cvr_signup']['mean']*100:.2f}% (95% CI: {result['cvr_signup']['ci_lower']*100:.2f}%-{result['cvr_signup']['ci_upper']*100:.2f}%)")
-            print(f"  Try 1st Look: {result['try_first_look']['mean']*100:.2f}%")
-            print(f"  Share Rate: {result['share_rate']['mean']*100:.2f}%")
-            print(f"  Day-7 Retention: {result['day7_retention']['mean']*100:.2f}%")
-            print(f"  CAC Range: ${result['cac_range'][0]}-${result['cac_range'][1]}")
-            print(f"  📊 Funnel: {result['absolute_numbers']['clicks']:,} clicks → {result['absolute_numbers']['signups']:,} signups → {result['absolute_numbers']['day7_retained']:,} D7 retained")
-
-    # Validation Experiments
-    print("\n" + "="*60)
-    print("VALIDATION EXPERIMENT PLAYBOOKS")
-    print("="*60)
-
-    for segment in PERSONAS.keys():
-        exp = VALIDATION_EXPERIMENTS[segment]
-        seg_name = PERSONAS[segment].name
-        print(f"\n{'─'*60}")
-        print(f"🧪 {seg_name}: {exp['title']}")
-        print(f"{'─'*60}")
-        print(f"Method: {exp['method']}\n")
-        print("Steps:")
-        for step in exp['steps']:
-            print(f"  {step}")
-        print(f"\n✅ Success Threshold:")
-        for key, val in exp['success_threshold'].items():
-            print(f"  • {key.replace('_', ' ').title()}: {val}")
-        print(f"\n🛑 Stop Rule: {exp['stop_rule']}")
-        print(f"🔄 Iterate Rule: {exp['iterate_rule']}")
+            say(f"\n{'─'*60}")
+            say(f"🧪 {seg_name}: {exp['title']}")
+            say(f"{'─'*60}")
+            say(f"Method: {exp['method']}\n")
+            say("Steps:")
+            for step in exp['steps']:
+                say(f"  {step}")
+            say(f"\n✅ Success Threshold:")
+            for key, val in exp['success_threshold'].items():
+                say(f"  • {key.replace('_', ' ').title()}: {val}")
+            say(f"\n🛑 Stop Rule: {exp['stop_rule']}")
+            say(f"🔄 Iterate Rule: {exp['iterate_rule']}")
 
     # Save all results (convert numpy types to native Python)
-    output = {
+    output = {key: value for key, value in {
         'wtp_summary': wtp_summary,
         'elasticity': elasticity_results,
         'feature_scores': feature_scores,
-        'jtbd_forces': JTBD_FORCES,
-        'acquisition_funnels': funnel_results,
-        'validation_experiments': VALIDATION_EXPERIMENTS
-    }
-
-    with open('/Users/alyonayanuchek/godlovesme-ai/focus_group_results.json', 'w') as f:
-        json.dump(output, f, indent=2, default=float)
-
-    df.to_csv('/Users/alyonayanuchek/godlovesme-ai/respondents.csv', index=False)
-
-    print("\n" + "="*60)
-    print("✅ Results saved to:")
-    print("  • focus_group_results.json")
-    print("  • respondents.csv")
-    print("="*60)
+        'feature_preferences': feature_prefs,
+        'jtbd_forces': JTBD_FORCES if 'jtbd' in stages else None,
+        'acquisition_funnels': funnel_results if 'funnels' in stages else None,
+        'viral_diffusion': viral,
+        'cohorts': cohorts,
+        'pricing_optimizer': pricing,
+        'van_westendorp': van_westendorp_results,
+        'validation_experiments': VALIDATION_EXPERIMENTS if 'validation' in stages else None
+    }.items() if value is not None}
+
+    with metrics.measure('output', rows=n if df is not None else None):
+        saved = [save_results(output, output_dir)]
+        if df is not None:
+            saved.append(save_respondents(df, output_dir, respondents_format))
+            if index:
+                saved.append(RespondentIndex.build(df).save(output_dir))
+    if metrics_file:
+        saved.append(metrics.save(metrics_file, n=n, seed=seed, workers=workers, stream=stream,
+                                  chunk_size=chunk_size, cache=cache))
+
+    say("\n" + "="*60)
+    say("✅ Results saved to:")
+    for path in saved:
+        say(f"  • {path}")
+    if stage_cache:
+        say(f"♻️  Stage cache: {len(stage_cache.hits)} reused, {len(stage_cache.misses)} recomputed")
+    say("="*60)
 
     # Recommended Pricing Tiers
-    print("\n" + "="*60)
-    print("💡 RECOMMENDED PRICING TIERS")
-    print("="*60)
+    if 'tiers' in stages:
+        say("\n" + "="*60)
+        say("💡 RECOMMENDED PRICING TIERS")
+        say("="*60)
 
-    print("""
+        say("""
     TIER 1: Gen-Z Social ($12/mo or $2.99/outfit)
       • Outfit dupes finder
       • Save & share (unlimited)
@@ -606,5 +3857,63 @@ def main():
       • Target: Trial users, low-frequency shoppers
     """)
 
+    return output
+
+def cli(argv: List[str] = None) -> int:
+    """Command-line entry point; see --help"""
+    parser = argparse.ArgumentParser(description='Synthetic focus group simulation')
+    parser.add_argument('-n', '--n', type=int, default=10000, help='number of respondents')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES),
+                        help='report sections to run (default: all)')
+    parser.add_argument('--stream', action='store_true', help='never materialize the respondent frame')
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--respondents-format', choices=sorted(RESPONDENT_WRITERS), default='npy')
+    parser.add_argument('--index', action='store_true',
+                        help='also write a segment/attribute-bin respondent index for drill-down queries')
+    parser.add_argument('--cache', action='store_true', help='reuse stage results from the on-disk cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--metrics-file', help='write per-stage timing/memory metrics as JSON')
+    parser.add_argument('--profile', nargs='+', default=(), metavar='STAGE',
+                        help='dump cProfile stats for these metric stages')
+    parser.add_argument('--sampler', choices=sorted(SAMPLERS), default='random',
+                        help='uniform sampler behind respondent generation and funnel replicates')
+    parser.add_argument('--sampling-diagnostics', action='store_true',
+                        help='print achieved CI width per sampler and sample size instead of running the report')
+    parser.add_argument('--serve', action='store_true',
+                        help='keep a warm population in memory and answer HTTP queries instead of running the report')
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--respondents-dir', help='serve respondents saved in this directory instead of generating -n')
+    parser.add_argument('-q', '--quiet', action='store_true', help='skip the console report')
+    parser.add_argument('--json', action='store_true', help='print results as JSON to stdout (implies --quiet)')
+    args = parser.parse_args(argv)
+
+    if args.sampling_diagnostics:
+        print(sampling_diagnostics(seed=args.seed).to_string(index=False))
+        return 0
+
+    if args.serve:
+        df = service_population(args.n, args.seed, args.respondents_dir, args.respondents_format)
+        service = SimulationService(df, seed=args.seed)
+        ready = lambda port: print(f"🛰️  Serving {len(df):,} respondents on http://{args.host}:{port}", flush=True)
+        try:
+            asyncio.run(serve(service, args.host, args.port, ready=ready))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    output = main(n=args.n, stream=args.stream, chunk_size=args.chunk_size, seed=args.seed,
+                  workers=args.workers, output_dir=args.output_dir,
+                  respondents_format=args.respondents_format, index=args.index, cache=args.cache,
+                  cache_dir=args.cache_dir, metrics_file=args.metrics_file, profile=args.profile,
+                  stages=tuple(args.stages), quiet=args.quiet or args.json, sampler=args.sampler)
+    if args.json:
+        json.dump(output, sys.stdout, separators=(',', ':'), default=float)
+        sys.stdout.write('\n')
+    return 0
+
 if __name__ == '__main__':
-    main()
+    sys.exit(cli())
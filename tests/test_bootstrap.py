@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import focus_group_simulation as fgs
+
+
+def grouped_sample(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    groups = np.sort(rng.integers(0, 3, n))
+    values = np.column_stack([rng.normal(50, 10, n), rng.lognormal(1, 0.8, n)])
+    return values, groups
+
+
+@pytest.mark.parametrize('method', ['index', 'poisson'])
+def test_replicate_spread_matches_standard_error(method):
+    values, groups = grouped_sample()
+    boot = fgs.bootstrap_means(values, groups, 3, 2000, method=method, rng=np.random.default_rng(1))
+    for g in range(3):
+        seg = values[groups == g]
+        np.testing.assert_allclose(boot[g].mean(axis=0), seg.mean(axis=0), rtol=0.01)
+        np.testing.assert_allclose(boot[g].std(axis=0), seg.std(axis=0) / np.sqrt(len(seg)), rtol=0.1)
+
+
+def test_index_and_poisson_intervals_agree():
+    values, groups = grouped_sample()
+    intervals = {}
+    for method in ('index', 'poisson'):
+        boot = fgs.bootstrap_means(values, groups, 3, 2000, method=method, rng=np.random.default_rng(2))
+        intervals[method] = np.array(fgs.bootstrap_interval(boot, values, groups))
+    width = intervals['index'][1] - intervals['index'][0]
+    assert (np.abs(intervals['index'] - intervals['poisson']) < 0.15 * width).all()
+
+
+def test_bca_shifts_right_on_skewed_sample():
+    rng = np.random.default_rng(3)
+    values = rng.lognormal(0, 1.2, 400)
+    groups = np.zeros(len(values), dtype=np.intp)
+    boot = fgs.bootstrap_means(values, groups, 1, 4000, rng=np.random.default_rng(4))
+    pct_lo, pct_hi = fgs.bootstrap_interval(boot, values, groups, interval='percentile')
+    bca_lo, bca_hi = fgs.bootstrap_interval(boot, values, groups, interval='bca')
+    # Right skew: positive acceleration moves both BCa bounds up
+    assert (bca_lo > pct_lo).all() and (bca_hi > pct_hi).all()
+
+
+def test_bca_matches_percentile_on_symmetric_sample():
+    values, groups = grouped_sample()
+    boot = fgs.bootstrap_means(values[:, :1], groups, 3, 2000, rng=np.random.default_rng(5))
+    percentile = np.array(fgs.bootstrap_interval(boot, values[:, :1], groups, interval='percentile'))
+    bca = np.array(fgs.bootstrap_interval(boot, values[:, :1], groups, interval='bca'))
+    width = percentile[1] - percentile[0]
+    assert (np.abs(bca - percentile) < 0.1 * width).all()
+
+
+@pytest.mark.parametrize('method', ['index', 'poisson'])
+def test_same_seed_reproduces_replicates(method):
+    values, groups = grouped_sample()
+    runs = [fgs.bootstrap_means(values, groups, 3, 200, method=method, chunk_elements=4096,
+                                rng=np.random.default_rng(seed)) for seed in (7, 7, 8)]
+    np.testing.assert_array_equal(runs[0], runs[1])
+    assert not np.array_equal(runs[0], runs[2])
+
+
+def test_unknown_method_and_interval_raise():
+    values, groups = grouped_sample(100)
+    with pytest.raises(ValueError):
+        fgs.bootstrap_means(values, groups, 3, 10, method='jackknife')
+    boot = fgs.bootstrap_means(values, groups, 3, 10)
+    with pytest.raises(ValueError):
+        fgs.bootstrap_interval(boot, values, groups, interval='studentized')
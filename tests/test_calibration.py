@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import focus_group_simulation as fgs
+
+
+def observed(n=6000):
+    df = fgs.generate_respondents(n, rng=np.random.default_rng(3))
+    df['income'] = df['income'].astype(np.float64)
+    df.loc[df.index[:50], 'income'] = np.nan
+    segment = df['segment'].astype(object)
+    segment.iloc[50:80] = np.nan
+    df['segment'] = pd.Categorical(segment, categories=list(fgs.PERSONAS))
+    return df
+
+
+def test_npy_store_drops_unusable_rows(tmp_path):
+    fgs.save_respondents(observed(), str(tmp_path))
+    result = fgs.calibrate_personas(str(tmp_path), max_iter=5)
+    assert result['n_rows'] == 6000 - 80
+    assert all(np.isfinite(config.income_mean) for config in result['personas'].values())
+
+
+def test_csv_matches_npy_and_cleans_up(tmp_path, monkeypatch):
+    scratch = tmp_path / 'scratch'
+    scratch.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(scratch))
+    df = observed()
+    fgs.save_respondents(df, str(tmp_path))
+    csv_path = tmp_path / 'observed.csv'
+    df.to_csv(csv_path, index=False)
+
+    from_npy = fgs.calibrate_personas(str(tmp_path), max_iter=5)
+    from_csv = fgs.calibrate_personas(str(csv_path), max_iter=5)
+    assert from_csv['n_rows'] == from_npy['n_rows']
+    assert np.isclose(from_csv['loglik'], from_npy['loglik'])
+    assert not [name for name in os.listdir(tmp_path) if 'chunks' in name]
+    assert os.listdir(scratch) == []
+
+
+def test_header_only_csv_raises(tmp_path):
+    csv_path = tmp_path / 'empty.csv'
+    observed().iloc[:0].to_csv(csv_path, index=False)
+    with pytest.raises(ValueError, match='No usable'):
+        fgs.calibrate_personas(str(csv_path))
+
+
+def test_fully_filtered_csv_raises(tmp_path):
+    df = observed(200)
+    df['income'] = np.nan
+    csv_path = tmp_path / 'observed.csv'
+    df.to_csv(csv_path, index=False)
+    with pytest.raises(ValueError, match='No usable'):
+        fgs.calibrate_personas(str(csv_path))
+
+
+def test_labeled_file_missing_a_segment_raises(tmp_path):
+    df = observed()
+    missing = list(fgs.PERSONAS)[-1]
+    csv_path = tmp_path / 'observed.csv'
+    df[df['segment'] != missing].to_csv(csv_path, index=False)
+    with pytest.raises(ValueError, match=missing):
+        fgs.calibrate_personas(str(csv_path))
@@ -0,0 +1,26 @@
+import numpy as np
+
+import focus_group_simulation as fgs
+
+
+def test_ranks_match_a_stable_sort_with_ties_to_the_lower_index():
+    rng = np.random.default_rng(0)
+    utilities = rng.integers(0, 3, size=(500, len(fgs.FEATURES))).astype(np.float32)
+    expected = np.argsort(np.argsort(-utilities, axis=1, kind='stable'), axis=1)
+    np.testing.assert_array_equal(fgs.feature_ranks(utilities), expected)
+
+
+def test_utility_noise_is_normal_around_segment_scores():
+    df = fgs.generate_respondents(20000, rng=np.random.default_rng(1))
+    utilities = fgs.feature_utilities(df, np.random.default_rng(2))
+    groups = fgs.segment_codes(df)
+    segment = list(fgs.PERSONAS)[0]
+    base = np.array([fgs.score_features(segment)[f] for f in fgs.FEATURES])
+    attributes = np.column_stack([df['fashion_interest'], df['time_scarcity']])[groups == 0]
+    centre = [fgs.PERSONAS[segment].fashion_interest, fgs.PERSONAS[segment].time_scarcity]
+    loadings = np.array([fgs.FEATURE_LOADINGS[f] for f in fgs.FEATURES]).T
+    residual = utilities[groups == 0] - base - (attributes - centre) @ loadings
+    assert abs(residual.mean()) < 0.02
+    assert abs(residual.std() - fgs.FEATURE_UTILITY_NOISE) < 0.02
+    # Normal, not Gumbel: no skew
+    assert abs(((residual - residual.mean()) ** 3).mean() / residual.std() ** 3) < 0.05
@@ -0,0 +1,22 @@
+import numpy as np
+
+import focus_group_simulation as fgs
+
+N = 20000
+
+
+def test_parallel_output_does_not_depend_on_worker_count():
+    runs = [fgs.parallel_simulation(8000, seed=7, workers=workers, chunk_size=2000, n_shards=6)
+            for workers in (1, 2)]
+    (first, first_funnels), (second, second_funnels) = runs
+    np.testing.assert_array_equal(first.count, second.count)
+    np.testing.assert_array_equal(first.hist, second.hist)
+    np.testing.assert_array_equal(first.mean, second.mean)
+    assert first_funnels == second_funnels
+
+
+def test_parallel_shards_are_near_equal():
+    shards = fgs.respondent_shards(N, chunk_size=10 ** 6, n_shards=8)
+    sizes = [size for _, size, _ in shards]
+    assert sum(sizes) == sum(fgs.segment_sizes(N).values())
+    assert len(shards) >= 8 and max(sizes) <= 1.5 * min(sizes)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+import focus_group_simulation as fgs
+
+TIERS = list(fgs.TIER_VALUE)
+
+
+@pytest.fixture(scope='module')
+def population():
+    return fgs.calculate_wtp(fgs.generate_respondents(5000, rng=np.random.default_rng(1)))
+
+
+def test_tier_values_vary_by_respondent_and_never_decrease(population):
+    values = fgs.option_values(population)[:, :len(TIERS)]
+    assert (np.diff(values, axis=1) >= 0).all()
+    ratios = values[:, 2] / values[:, 1]
+    assert ratios.std() > 0.1
+
+
+def test_optimized_ladder_sells_every_tier(population):
+    best = fgs.optimize_pricing(population)['best']
+    prices = [best['prices'][tier] for tier in TIERS]
+    assert prices == sorted(prices)
+    assert min(best['option_share'][tier] for tier in TIERS) >= fgs.MIN_TIER_SHARE
+
+
+def test_share_constraint_only_reorders(population):
+    constrained = fgs.optimize_pricing(population)
+    free = fgs.optimize_pricing(population, min_tier_share=0)
+    assert free['best']['revenue_per_respondent'] >= constrained['best']['revenue_per_respondent']
@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+import pytest
+
+import focus_group_simulation as fgs
+
+
+@pytest.fixture(scope='module')
+def service():
+    return fgs.SimulationService(fgs.service_population(2000, seed=5), seed=5, window=0.001)
+
+
+def post(service, route, body):
+    raw = body if isinstance(body, bytes) else json.dumps(body).encode()
+    return asyncio.run(service.respond('POST', f'/{route}', raw))
+
+
+@pytest.mark.parametrize('route, body', [
+    ('tiers', {'prices': [1, 2]}),
+    ('tiers', b'{"prices": {"per_outfit": NaN}}'),
+    ('demand', b'{"prices": [10, Infinity]}'),
+    ('demand', {'prices': [10], 'segment': ['a']}),
+    ('funnels', {'segment': next(iter(fgs.PERSONAS)), 'channel': 'TikTok', 'impressions': 10 ** 19}),
+    ('funnels', b'{"segment": "x", "channel": "TikTok", "impressions": Infinity}'),
+    ('demand', b'[1, 2]'),
+])
+def test_invalid_requests_get_400(service, route, body):
+    status, payload = post(service, route, body)
+    assert status == 400
+    assert 'error' in payload
+
+
+def test_valid_requests_answer(service):
+    status, payload = post(service, 'demand', {'prices': [5, 10]})
+    assert status == 200 and len(payload['demand']) == 2
+    status, payload = post(service, 'tiers', {'prices': {'per_outfit': 4}})
+    assert status == 200 and json.dumps(payload, allow_nan=False)
+
+
+def test_failing_item_does_not_fail_its_batch(service):
+    segment = next(iter(fgs.PERSONAS))
+    good = service.validate_funnels({'segment': segment, 'channel': 'TikTok', 'impressions': 1000})
+    # Bypasses validation to reach the evaluator with an input it cannot handle
+    bad = {**good, 'impressions': 10 ** 19}
+
+    async def both():
+        batcher = service.batchers['funnels']
+        return await asyncio.gather(batcher.submit(good), batcher.submit(bad), return_exceptions=True)
+
+    good_result, bad_result = asyncio.run(both())
+    assert isinstance(bad_result, Exception)
+    assert not isinstance(good_result, Exception)
@@ -0,0 +1,50 @@
+import numpy as np
+
+import focus_group_simulation as fgs
+
+
+def run_cached(tmp_path, **kwargs):
+    return fgs.main(n=3000, output_dir=str(tmp_path / 'out'), cache=True, cache_dir=str(tmp_path / 'cache'),
+                    quiet=True, **kwargs)
+
+
+def test_key_changes_with_constant_read_by_helper(monkeypatch):
+    inputs = ('wtp', fgs.calculate_price_elasticity, fgs.demand_curves)
+    before = fgs.cache_key('elasticity', *inputs)
+    assert fgs.cache_key('elasticity', *inputs) == before
+
+    monkeypatch.setattr(fgs, 'ELASTICITY_PRICES', np.arange(5, 70, 5))
+    assert fgs.cache_key('elasticity', *inputs) != before
+
+
+def test_key_ignores_runtime_state():
+    # Functions reading the shared Generator must still hash deterministically
+    assert fgs.cache_key('x', fgs._rng, fgs.simulate_funnels) == fgs.cache_key('x', fgs._rng, fgs.simulate_funnels)
+
+
+def test_edited_constant_misses_cache(tmp_path, monkeypatch):
+    first = run_cached(tmp_path, stages=('elasticity',))
+    assert run_cached(tmp_path, stages=('elasticity',)) == first
+
+    monkeypatch.setattr(fgs, 'ELASTICITY_PRICES', np.arange(5, 70, 5))
+    second = run_cached(tmp_path, stages=('elasticity',))
+    assert len(second['elasticity'][0]['demand_curve']) == len(fgs.ELASTICITY_PRICES)
+    assert len(first['elasticity'][0]['demand_curve']) != len(fgs.ELASTICITY_PRICES)
+
+
+
+def test_edited_population_constant_misses_cache(tmp_path, monkeypatch):
+    first = run_cached(tmp_path, stages=('wtp',))
+    spread = dict(fgs.SCORE_SPREAD, price_sensitivity=(0.4, 0.3, 2.0))
+    monkeypatch.setattr(fgs, 'SCORE_SPREAD', spread)
+    second = run_cached(tmp_path, stages=('wtp',))
+    assert first['wtp_summary'] != second['wtp_summary']
+
+
+def test_viral_cache_follows_the_funnels_it_was_built_on(tmp_path, monkeypatch):
+    monkeypatch.setattr(fgs, 'VIRAL_GRAPH_NODES', 2000)
+    stages = ('wtp', 'viral')
+    run_cached(tmp_path, stages=stages)
+    cached = run_cached(tmp_path, stages=stages, workers=2, chunk_size=1000)
+    fresh = fgs.main(n=3000, output_dir=str(tmp_path / 'fresh'), quiet=True, stages=stages, workers=2, chunk_size=1000)
+    assert cached['viral_diffusion'] == fresh['viral_diffusion']
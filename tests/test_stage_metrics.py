@@ -0,0 +1,20 @@
+import focus_group_simulation as fgs
+
+
+def test_disabled_records_do_not_leak_between_stages():
+    metrics = fgs.StageMetrics()
+    with metrics.measure('first') as record:
+        record['cached'] = True
+    with metrics.measure('second') as record:
+        assert 'cached' not in record
+    assert metrics.records == []
+
+
+def test_enabled_records_label_rss_as_high_water_growth():
+    metrics = fgs.StageMetrics(enabled=True)
+    with metrics.measure('stage', rows=10):
+        pass
+    record, = metrics.records
+    assert record['stage'] == 'stage'
+    if record['peak_rss_mb'] is not None:
+        assert record['peak_rss_high_water_growth_mb'] >= 0
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+import focus_group_simulation as fgs
+
+N = 20000
+
+
+@pytest.fixture(scope='module')
+def population():
+    return fgs.calculate_wtp(fgs.generate_respondents(N, rng=fgs.stage_rng(1, 'respondents')))
+
+
+def segment_values(df, model):
+    groups = fgs.segment_codes(df)
+    return [df[model].to_numpy(dtype=np.float64)[groups == g] for g in range(len(fgs.PERSONAS))]
+
+
+def test_single_chunk_stream_matches_in_memory(population):
+    streamed = fgs.stream_simulation(N, 10 ** 6, rng=fgs.stage_rng(1, 'respondents'))
+    in_memory = fgs.WTPAccumulator(n_bootstrap=0).update(population)
+    np.testing.assert_array_equal(streamed.count, in_memory.count)
+    np.testing.assert_array_equal(streamed.hist, in_memory.hist)
+    np.testing.assert_allclose(streamed.mean, in_memory.mean)
+    assert streamed.wtp_summary() == in_memory.wtp_summary()
+    assert streamed.elasticity() == in_memory.elasticity()
+
+
+def test_chunked_stream_agrees_with_in_memory(population):
+    streamed = fgs.stream_simulation(N, 3000, rng=fgs.stage_rng(1, 'respondents'))
+    in_memory = fgs.WTPAccumulator(n_bootstrap=0).update(population)
+    np.testing.assert_array_equal(streamed.count, in_memory.count)
+    standard_error = np.sqrt(in_memory.variance() / in_memory.count[:, None])
+    assert (np.abs(streamed.mean - in_memory.mean) < 5 * standard_error).all()
+
+
+def test_merged_chunks_equal_one_pass(population):
+    whole = fgs.WTPAccumulator(n_bootstrap=0).update(population)
+    half = len(population) // 3
+    merged = fgs.WTPAccumulator(n_bootstrap=0).update(population.iloc[:half])
+    merged.merge(fgs.WTPAccumulator(n_bootstrap=0).update(population.iloc[half:]))
+    np.testing.assert_array_equal(merged.count, whole.count)
+    np.testing.assert_array_equal(merged.hist, whole.hist)
+    np.testing.assert_allclose(merged.mean, whole.mean)
+    np.testing.assert_allclose(merged.variance(), whole.variance())
+
+
+def test_quantiles_within_one_histogram_bin(population):
+    accumulator = fgs.WTPAccumulator(n_bootstrap=0).update(population)
+    for j, model in enumerate(accumulator.models):
+        for g, values in enumerate(segment_values(population, model)):
+            for q in (0.25, 0.5, 0.75):
+                assert abs(accumulator.quantile(q)[g, j] - np.quantile(values, q)) <= accumulator.step
+
+
+def test_variance_matches_numpy(population):
+    accumulator = fgs.WTPAccumulator(n_bootstrap=0).update(population)
+    for j, model in enumerate(accumulator.models):
+        expected = [np.var(values, ddof=1) for values in segment_values(population, model)]
+        np.testing.assert_allclose(accumulator.variance()[:, j], expected, rtol=1e-9)
@@ -0,0 +1,37 @@
+import numpy as np
+
+import focus_group_simulation as fgs
+
+
+def responses(n=2000, seed=4):
+    return fgs.calculate_wtp(fgs.generate_respondents(n, rng=np.random.default_rng(seed)))
+
+
+def test_outlier_answers_are_dropped_and_histogram_stays_bounded():
+    df = responses()
+    df.loc[df.index[0], 'wtp_subscription'] = 50_000
+    df.loc[df.index[1], 'wtp_bundle_10'] = np.nan
+    aggregator = fgs.SurveyAggregator(n_bootstrap=0)
+    kept = aggregator.ingest(df)
+    assert kept == len(df) - 2
+    assert aggregator.n_dropped == 2
+    assert aggregator.observed.hist.shape[2] <= fgs.SURVEY_MAX_WTP / aggregator.observed.step + 1
+
+
+def test_merge_with_different_replicate_counts_falls_back_to_normal_ci():
+    first, second = responses(seed=5), responses(seed=6)
+    merged = fgs.WTPAccumulator(n_bootstrap=100).update(first, rng=np.random.default_rng(0))
+    merged.merge(fgs.WTPAccumulator(n_bootstrap=0).update(second))
+    both = fgs.WTPAccumulator(n_bootstrap=0).update(first).merge(fgs.WTPAccumulator(n_bootstrap=0).update(second))
+    assert merged.n_bootstrap == 0
+    np.testing.assert_allclose(merged.confidence_interval(), both.confidence_interval())
+
+
+def test_prior_blended_ci_reflects_prior_weight():
+    aggregator = fgs.SurveyAggregator(n_bootstrap=200)
+    aggregator.ingest(responses(20000), source='simulated')
+    blended = aggregator.blended(prior_weight=50)
+    np.testing.assert_allclose(blended.count, 50)
+    lower, upper = blended.confidence_interval()
+    sd = np.sqrt(aggregator.simulated.variance())
+    np.testing.assert_allclose(upper - lower, 2 * 1.959964 * sd / np.sqrt(50), rtol=0.02)
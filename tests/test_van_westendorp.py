@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+import focus_group_simulation as fgs
+
+
+@pytest.fixture(scope='module')
+def population():
+    return fgs.calculate_wtp(fgs.generate_respondents(5000, rng=np.random.default_rng(8)))
+
+
+def test_curves_derive_answers_from_wtp_like_the_estimates(population):
+    segment = next(iter(fgs.PERSONAS))
+    derived = fgs.van_westendorp_curves(population, segment, rng=np.random.default_rng(1))
+    answered = fgs.van_westendorp_responses(population.copy(), rng=np.random.default_rng(1))
+    explicit = fgs.van_westendorp_curves(answered, segment)
+    for name, values in explicit.items():
+        np.testing.assert_allclose(derived[name], values, rtol=1e-6)
+
+
+def test_missing_answers_and_wtp_raise_clear_error(population):
+    with pytest.raises(ValueError, match='wtp_subscription'):
+        fgs.van_westendorp_curves(population.drop(columns='wtp_subscription'), next(iter(fgs.PERSONAS)))